@@ -587,6 +587,8 @@ function App() {
   
   // FIX 2: Real history ref that persists across renders (not dependent on async state updates)
   const conversationHistoryRef = useRef([])
+  // Backend conversation id: lets it summarize older turns once per call
+  const conversationIdRef = useRef(null)
   // FIX 3: Track current audio to stop it when needed
   const activeAudioRef = useRef(null)
   // Store all active Web Audio API sources so we can stop them
@@ -665,6 +667,7 @@ function App() {
     setResponse(null)
     setConversationHistory([])
     conversationHistoryRef.current = []  // FIX 2: Reset ref too
+    conversationIdRef.current = null
     setMatchedSchemes([])
     setCallState(CALL_STATES.IDLE)
     setInputEnabled(false)
@@ -946,6 +949,7 @@ function App() {
     setCallState(CALL_STATES.CONNECTING)
     setConversationHistory([])
     conversationHistoryRef.current = []  // FIX 2: Initialize ref
+    conversationIdRef.current = null
     setTranscript('')
     setResponse(null)
     
@@ -1053,6 +1057,7 @@ function App() {
     
     // FIX 2: Clear history refs on conversation end
     conversationHistoryRef.current = []
+    conversationIdRef.current = null
     setConversationHistory([])
     
     // FIX 4: Clear voice memory tracking for next conversation
@@ -1326,8 +1331,10 @@ function App() {
         message: finalMessage,
         farmer_profile: farmerProfile,
         conversation_history: historyToSend,
-        language: selectedLanguage
+        language: selectedLanguage,
+        conversation_id: conversationIdRef.current
       })
+      conversationIdRef.current = chatRes.data.conversation_id || conversationIdRef.current
 
       console.log('CHAT RESULT:', JSON.stringify(chatRes.data))
       console.log('[VM DEBUG] voice_memory_clip from backend:', chatRes.data.voice_memory_clip)
@@ -1541,8 +1548,10 @@ function App() {
         message: userMessage,
         farmer_profile: farmerProfile,
         conversation_history: historyToSend,
-        language: selectedLanguage
+        language: selectedLanguage,
+        conversation_id: conversationIdRef.current
       })
+      conversationIdRef.current = chatRes.data.conversation_id || conversationIdRef.current
 
       console.log('CHAT RESULT:', JSON.stringify(chatRes.data))
       console.log('[VM DEBUG] voice_memory_clip from backend:', chatRes.data.voice_memory_clip)
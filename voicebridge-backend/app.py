@@ -2,14 +2,14 @@
 VoiceBridge AI — Flask Application Entry Point
 Registers all blueprints. No business logic here.
 """
+import json
 import logging
-import os
 import base64
 import uuid
-import requests
+from collections import deque
 from pathlib import Path
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 
 # Load .env before everything else
@@ -33,30 +33,51 @@ CORS(app, resources={r"/api/*": {"origins": "*"}})
 from routes.call_routes import call_bp
 app.register_blueprint(call_bp)
 
-# ── Serve local audio files (mock mode) ──────────────────
-from flask import send_from_directory
-import os
+# ── Serve audio through the local disk tier ──────────────
+from flask import send_file
 
 @app.route('/audio/<path:filename>')
 def serve_audio(filename):
-    """Serve local Voice Memory clips in mock mode."""
-    return send_from_directory(
-        os.path.join(_BASE_DIR, 'data', 'voice_memory'),
-        filename
-    )
+    """
+    Voice Memory clips and cached TTS audio via the local disk tier.
+    Mock: origin is data/voice_memory/. AWS: the audio bucket (tts-cache/, voice_memory/).
+    """
+    from services.audio_disk_cache import disk_audio, fetch_origin
+    found = disk_audio.get(filename)
+    if found is not None:
+        path, content_type = found
+        return send_file(path, mimetype=content_type, conditional=True, max_age=86400)
+    fetched = fetch_origin(filename)
+    if fetched is None:
+        return jsonify({'success': False, 'error': 'Audio not found'}), 404
+    audio, content_type = fetched
+    disk_audio.put(filename, audio, content_type)
+    return Response(audio, mimetype=content_type, headers={'Cache-Control': 'public, max-age=86400'})
 
 # ── API Routes ────────────────────────────────────────────
 
 @app.route('/api/health', methods=['GET'])
 def health():
+    from services.ai_service import cache_stats
+    from services.audio_disk_cache import disk_audio
     return jsonify({
         'status': 'ok',
         'mock_mode': USE_MOCK,
         'version': '1.0.0',
-        'service': 'VoiceBridge AI — Sahaya'
+        'service': 'VoiceBridge AI — Sahaya',
+        'caches': {**cache_stats(), 'audio_disk': disk_audio.stats()}
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of in-process metrics (LLM latency, tokens, caches)."""
+    import services.ai_service  # noqa: F401 — registers the LLM metrics
+    import services.audio_disk_cache  # noqa: F401 — registers the audio disk tier metrics
+    from services.metrics import REGISTRY
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/api/schemes', methods=['GET'])
 def get_schemes():
     try:
@@ -107,6 +128,34 @@ def sum_benefit(schemes):
     return total
 
 
+# ── Chat helpers ──────────────────────────────────────────
+
+# Language support with instructions
+LANG_INSTRUCTIONS = {
+    'hi-IN': 'Please respond ONLY in Hindi (Devanagari script).',
+    'ta-IN': 'Please respond ONLY in Tamil script.',
+    'kn-IN': 'Please respond ONLY in Kannada script.',
+    'te-IN': 'Please respond ONLY in Telugu script.',
+    'ml-IN': 'Please respond ONLY in Malayalam script.'
+}
+
+
+# Schemes with a voice memory clip, highest priority first
+CLIP_SCHEME_PRIORITY = ('PM_KISAN', 'KCC', 'PMFBY')
+
+
+def _detect_scheme(msg):
+    """
+    Top scheme mentioned in msg (misheard names included), its voice memory
+    clip if it has one, and the match confidence (1.0 exact, 0.0 none).
+    """
+    from services.scheme_service import detect_schemes
+    matched, confidence = detect_schemes(msg)
+    # A scheme with a voice memory clip wins, in the original priority order
+    clip = next((sid for sid in CLIP_SCHEME_PRIORITY if sid in matched), None)
+    return ([clip] if clip else matched[:1]), clip, confidence
+
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     try:
@@ -120,49 +169,7 @@ def chat():
         if message == '__warmup__':
             return jsonify({'success': True, 'warmup': True}), 200
         
-        # Helper: Multi-language KCC detection with speech-to-text variations
-        def detect_kcc_in_message(msg_lower):
-            """
-            Detect KCC in multiple languages including speech transcription variations.
-            Malayalam speech-to-text may produce: കെ സി പറ്റി, കെ സി പറയൂ, etc.
-            """
-            # Easy English/Hindi keywords
-            if any(k in msg_lower for k in ['kcc', 'kisan credit', 'credit card', 'kisan card', '4%', '4 percent', 'सीसीसी', 'केसीसी', 'si si si', 'see see see', 'kisan lon', 'kisan loan', '4 pratishat', 'केसी', 'kscc']):
-                return True
-            
-            # Malayalam: detect common substrings in KCC variations (കെ സി സി, കെ സി പറ്റി, കെ സി പറയൂ)
-            # Common pattern: 'കെ' + 'സ' in same word
-            if 'കെ' in msg_lower and 'സ' in msg_lower:
-                parts = msg_lower.split()
-                for part in parts:
-                    if 'കെ' in part and 'സ' in part:
-                        return True
-            
-            return False
-        
-        # Inline scheme detection — does not depend on any service function
-        def detect_scheme(msg):
-            m = msg.lower()
-            # PM_KISAN — Hindi + Malayalam + Tamil keywords
-            if any(k in m for k in ['pm kisan','pmkisan','pm-kisan','kisan samman','6000','kisaan','पीएम किसान','पी एम किसान','pihem kisan','piem kisan','പി എം കിസാൻ','പിഎം കിസാൻ','കിസാൻ സമ്മാൻ','pm kisan','கிசான்','பிஎம் கிசான்','கிசான் சம்மான்','₹6000','rupees 6000','pm-kisan']):
-                return ['PM_KISAN'], 'PM_KISAN'
-            # KCC — use helper function for Malayalam speech variations
-            if detect_kcc_in_message(m):
-                return ['KCC'], 'KCC'
-            # PMFBY — Hindi + Malayalam + Tamil keywords  
-            if any(k in m for k in ['pmfby','fasal bima','crop insurance','bima yojana','fasal insurance','फसल बीमा','piem ef bi','fasal bima yojana','ഫസൽ ബീമ','വിള ഇൻഷുറൻസ്','പിഎംഎഫ്ബിവൈ','பயிர് காப்பீடு','பிஎம்எஃப்பिઓય','crop bima','bima scheme','फसल','silk','பயிர்','விளை']):
-                return ['PMFBY'], 'PMFBY'
-            if any(k in m for k in ['mgnrega','mnrega','manrega','nrega','100 days','job card','rozgar']):
-                return ['MGNREGS'], None
-            if any(k in m for k in ['ayushman','pmjay','health insurance','5 lakh health']):
-                return ['AYUSHMAN_BHARAT'], None
-            if any(k in m for k in ['pm awas','awas yojana','pucca house','ghar yojana']):
-                return ['PM_AWAS_GRAMIN'], None
-            if any(k in m for k in ['soil health','soil card','mitti','soil test']):
-                return ['SOIL_HEALTH_CARD'], None
-            return [], None
-
-        matched_schemes, voice_memory_clip = detect_scheme(message)
+        matched_schemes, voice_memory_clip, scheme_confidence = _detect_scheme(message)
         
         # CRITICAL: Do NOT fallback to history for scheme detection
         # Only use current message detection to avoid stale schemes
@@ -170,23 +177,22 @@ def chat():
         fp = data.get('farmer_profile', {})
         history = data.get('conversation_history', [])
         
-        # Language support with instructions
-        LANG_INSTRUCTIONS = {
-            'hi-IN': 'Please respond ONLY in Hindi (Devanagari script).',
-            'ta-IN': 'Please respond ONLY in Tamil script.',
-            'kn-IN': 'Please respond ONLY in Kannada script.',
-            'te-IN': 'Please respond ONLY in Telugu script.',
-            'ml-IN': 'Please respond ONLY in Malayalam script.'
-        }
         language = data.get('language', 'hi-IN')
         lang_instruction = LANG_INSTRUCTIONS.get(language, LANG_INSTRUCTIONS['hi-IN'])
         
         from models.farmer import FarmerProfile
-        from services.ai_service import generate_response
+        from services.turn_orchestrator import run_chat_turn
         import uuid
         
         farmer = FarmerProfile.from_dict(fp)
-        result = generate_response(message, matched_schemes, farmer, history, lang_instruction)
+        # Clients echo conversation_id back so older turns are summarized once per call
+        conversation_id = data.get('conversation_id') or uuid.uuid4().hex
+
+        # Scheme fetches and the voice memory presign run alongside Bedrock;
+        # TTS starts as soon as the reply text exists. Late stages degrade, not fail.
+        result = run_chat_turn(message, matched_schemes, farmer, history, lang_instruction,
+                               language, conversation_id,
+                               tts_segments=bool(data.get('tts_segments', False)))
         response_text = result.get('response_text', '')
         
         # Use voice_memory_clip from AI response only
@@ -200,31 +206,11 @@ def chat():
         # We trust the frontend's deduplication instead of trying to track in backend
         # Backend should NOT try to filter voice_memory_clip based on history
         
-        # Generate TTS audio for Sahaya's response
-        tts_audio_url = None
-        voice_memory_url = None
-        
-        # First, try to get pre-recorded voice memory clip
-        if final_voice_clip:
-            from services.voice_memory_service import get_clip
-            clip_result = get_clip(final_voice_clip, language)
-            if clip_result.get('success'):
-                voice_memory_url = clip_result.get('audio_url')
-        
-        # ALWAYS generate TTS for the response (for intro/context)
-        # Voice memory is separate and plays after TTS
-        try:
-            from services.tts_service import synthesize_speech
-            tts_result = synthesize_speech(response_text)
-            if tts_result.get('success'):
-                tts_audio_url = tts_result.get('audio_url')
-        except Exception as tts_err:
-            logger.warning(f"TTS failed (non-fatal): {tts_err}")
-        
         # For responses with voice memory, return BOTH:
         # - audio_url: Polly TTS for the intro/context
         # - voice_memory_clip: Pre-recorded farmer story to play after
-        final_audio_url = tts_audio_url  # Always return TTS if available
+        final_audio_url = result.get('audio_url')  # Always return TTS if available
+        logger.info(f"[TURN TIMINGS] {result.get('timings_ms')}")
         
         # CRITICAL: is_goodbye must ALWAYS be present so frontend can end call
         is_goodbye_detected = result.get('is_goodbye', False)
@@ -236,11 +222,15 @@ def chat():
             'success': True,
             'response_text': response_text,
             'matched_schemes': matched_schemes,
+            'scheme_confidence': round(scheme_confidence, 3),
             'voice_memory_clip': final_voice_clip,
+            'voice_memory_url': result.get('voice_memory_url'),
             'audio_url': final_audio_url,
             'audio_type': 'tts' if final_audio_url else 'none',
+            'audio_segments': result.get('audio_segments'),
             'is_goodbye': bool(is_goodbye_detected),  # CRITICAL: Force boolean for frontend
-            'conversation_id': uuid.uuid4().hex
+            'needs_confirmation': bool(result.get('needs_confirmation', False)),
+            'conversation_id': conversation_id
         }
         
         logger.info(f"[RESPONSE JSON] is_goodbye={response_body.get('is_goodbye')}")
@@ -250,6 +240,91 @@ def chat():
         return jsonify({'success': False, 'error': str(e), 'code': 'SERVICE_ERROR'}), 500
 
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    Server-Sent-Events variant of /api/chat.
+    Emits one 'sentence' event per complete sentence (with its own TTS audio_url)
+    while Bedrock is still generating, then a final 'done' event with the same
+    fields /api/chat returns. Sentences are synthesized in parallel and sent in
+    order, each as soon as its audio (and every earlier one) is ready. Needs a
+    host that does not buffer responses.
+    """
+    data = request.get_json() or {}
+    message = (data.get('message') or '').strip()
+    if not message:
+        return jsonify({'success': False, 'error': 'Message is required',
+                       'code': 'INVALID_INPUT'}), 400
+
+    matched_schemes, _, _ = _detect_scheme(message)
+    fp = data.get('farmer_profile', {})
+    history = data.get('conversation_history', [])
+    language = data.get('language', 'hi-IN')
+    lang_instruction = LANG_INSTRUCTIONS.get(language, LANG_INSTRUCTIONS['hi-IN'])
+    with_audio = bool(data.get('tts', True))
+
+    from models.farmer import FarmerProfile
+    from services.ai_service import generate_response_stream
+    from services.tts_service import segment_result, submit_segment
+
+    farmer = FarmerProfile.from_dict(fp)
+    conversation_id = data.get('conversation_id') or uuid.uuid4().hex
+
+    # (index, text, TTS future) of sentences not sent yet, in reply order
+    pending = deque()
+
+    def ready_sentences(wait: bool):
+        """Sentence events for the finished head of pending (all of it if wait)."""
+        while pending and (wait or pending[0][2].done()):
+            index, text, future = pending.popleft()
+            segment = segment_result(index, text, future)
+            yield _sse('sentence', {'index': index, 'text': text, 'audio_url': segment['audio_url']})
+
+    def events():
+        try:
+            for event in generate_response_stream(message, matched_schemes, farmer,
+                                                  history, lang_instruction, conversation_id):
+                if event['event'] == 'sentence':
+                    if with_audio:
+                        pending.append((event['index'], event['text'], submit_segment(event['text'])))
+                        yield from ready_sentences(wait=False)
+                    else:
+                        yield _sse('sentence', {'index': event['index'], 'text': event['text'],
+                                                'audio_url': None})
+                else:
+                    yield from ready_sentences(wait=True)
+                    is_goodbye_detected = event.get('is_goodbye', False)
+                    logger.info(f"[GOODBYE RESPONSE] Detected: {is_goodbye_detected} | Message: {message[:50]}...")
+                    yield _sse('done', {
+                        'success': event.get('success', False),
+                        'response_text': event.get('response_text', ''),
+                        'matched_schemes': matched_schemes,
+                        'voice_memory_clip': event.get('voice_memory_clip'),
+                        'is_goodbye': bool(is_goodbye_detected),
+                        'needs_confirmation': bool(event.get('needs_confirmation', False)),
+                        'conversation_id': conversation_id
+                    })
+            yield from ready_sentences(wait=True)
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield _sse('error', {'success': False, 'error': str(e), 'code': 'SERVICE_ERROR'})
+        finally:
+            # Client went away or the stream failed: drop sentences not started yet
+            for _, _, future in pending:
+                future.cancel()
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def _sse(event: str, payload: dict) -> str:
+    """Format one Server-Sent-Events frame."""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
 @app.route('/api/speech-to-text', methods=['POST'])
 def speech_to_text():
     try:
@@ -292,21 +367,55 @@ def text_to_speech():
         if not text:
             return jsonify({'success': False, 'error': 'Text is required',
                            'code': 'INVALID_INPUT'}), 400
-        from services.tts_service import synthesize_speech
-        result = synthesize_speech(text)
+        from services.tts_service import synthesize_segments, synthesize_speech
+        # segmented: one clip per sentence, synthesized in parallel (ordered playlist)
+        result = synthesize_segments(text) if data.get('segmented') else synthesize_speech(text)
         return jsonify(result)
     except Exception as e:
         logger.error(f"TTS error: {e}")
         return jsonify({'success': False, 'error': str(e), 'code': 'SERVICE_ERROR'}), 500
 
 
+@app.route('/api/text-to-speech/stream', methods=['GET', 'POST'])
+def text_to_speech_stream():
+    """
+    Streams the audio bytes themselves (chunked transfer) as the TTS provider
+    produces them, instead of an S3 URL. hi-IN is Polly MP3, other languages
+    Sarvam WAV. GET takes text/language query params so it can be an <audio> src.
+    Needs a host that does not buffer responses.
+    """
+    data = request.args if request.method == 'GET' else (request.get_json() or {})
+    text = (data.get('text') or '').strip()
+    language = (data.get('language') or 'hi-IN').strip()
+    if '-' in language:
+        parts = language.split('-')
+        language = parts[0].lower() + '-' + parts[1].upper()
+    if not text:
+        return jsonify({'success': False, 'error': 'Text is required',
+                       'code': 'INVALID_INPUT'}), 400
+
+    from services.audio_transcoder import negotiate
+    from services.tts_service import stream_speech
+    fmt = negotiate(data.get('format'), request.headers.get('Accept'))
+    result = stream_speech(text, language, fmt)
+    if not result.get('success'):
+        logger.error(f"TTS stream error: {result.get('error')}")
+        # Mock mode without a mock_response.mp3 has nothing to stream
+        status = 404 if result.get('mock') else 500
+        return jsonify({'success': False, 'error': result.get('error'), 'code': 'SERVICE_ERROR'}), status
+
+    return Response(
+        stream_with_context(result['chunks']),
+        mimetype=result['content_type'],
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no',
+                 'X-TTS-Cache': 'hit' if result['cached'] else 'miss'}
+    )
+
+
 @app.route('/api/sarvam-tts', methods=['POST'])
 def sarvam_tts():
     """Regional language TTS via Sarvam AI Bulbul v3."""
     try:
-        import boto3
-        from config.settings import SARVAM_API_KEY, SARVAM_API_URL, AWS_REGION, S3_AUDIO_BUCKET, USE_MOCK
-        
         data = request.get_json() or {}
         text = (data.get('text') or '').strip()
         language = (data.get('language') or '').strip()
@@ -320,82 +429,12 @@ def sarvam_tts():
         if not language:
             return jsonify({'success': False, 'error': 'Language is required'}), 400
         
-        # Mock mode for testing without Sarvam API
-        if USE_MOCK:
-            return jsonify({
-                'success': True,
-                'audio_url': 'https://mock-sarvam-audio.s3.amazonaws.com/mock-audio.wav',
-                'language': language
-            })
-        
-        # Speaker mapping: language → Sarvam speaker ID
-        speaker_map = {
-            'ta-IN': 'anushka',
-            'kn-IN': 'anushka',
-            'te-IN': 'anushka',
-            'ml-IN': 'manisha',
-            'hi-IN': 'anushka'
-        }
-        
-        speaker_id = speaker_map.get(language, 'meera')
-        logger.info(f"Sarvam TTS: lang={language} speaker={speaker_id} text_len={len(text)}")
-        
-        # Call Sarvam API
-        headers = {'api-subscription-key': SARVAM_API_KEY}
-        payload = {
-            'inputs': [text],
-            'target_language_code': language,
-            'speaker': 'manisha',
-            'model': 'bulbul:v2',
-            'pace': 0.78,
-            'pitch': 0,
-            'loudness': 1.5,
-            'enable_preprocessing': True
-        }
-        
-        response = requests.post(SARVAM_API_URL, json=payload, headers=headers, timeout=30)
-        if response.status_code != 200:
-            logger.error(f"Sarvam API error: {response.status_code} - {response.text}")
-            return jsonify({
-                'success': False,
-                'error': f'Sarvam API returned {response.status_code}'
-            }), 500
-        
-        result = response.json()
-        audios = result.get('audios') or []
-        if not audios:
-            logger.error(f"Sarvam API no audio in response: {result}")
-            return jsonify({'success': False, 'error': 'No audio from Sarvam'}), 500
-        
-        # Decode base64 audio and upload to S3
-        audio_base64 = result['audios'][0]
-        audio_bytes = base64.b64decode(audio_base64)
-        
-        # Generate S3 key
-        s3_key = f"sarvam-audio/{uuid.uuid4()}.wav"
-        
-        # Upload to S3
-        s3_client = boto3.client('s3', region_name=AWS_REGION)
-        s3_client.put_object(
-            Bucket=S3_AUDIO_BUCKET,
-            Key=s3_key,
-            Body=audio_bytes,
-            ContentType='audio/wav'
-        )
-        
-        # Generate presigned URL (1 hour expiry)
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_AUDIO_BUCKET, 'Key': s3_key},
-            ExpiresIn=3600
-        )
-        
-        return jsonify({
-            'success': True,
-            'audio_url': presigned_url,
-            'language': language,
-            'speaker': speaker_id
-        })
+        from services.audio_transcoder import negotiate
+        from services.tts_service import synthesize_regional
+        # Compressed for slow links: format param, else Accept header, else SARVAM_AUDIO_FORMAT
+        fmt = negotiate(data.get('format') or request.args.get('format'), request.headers.get('Accept'))
+        result = synthesize_regional(text, language, fmt)
+        return jsonify(result), (200 if result.get('success') else 500)
         
     except Exception as e:
         logger.error(f"Sarvam TTS error: {e}")
@@ -405,8 +444,8 @@ def sarvam_tts():
 @app.route('/api/voice-memory/<scheme_id>', methods=['GET'])
 def voice_memory(scheme_id):
     try:
-        import boto3
-        from config.settings import AWS_REGION, S3_AUDIO_BUCKET
+        from services.aws_clients import get_client
+        from config.settings import S3_AUDIO_BUCKET
         
         # Language from query param, default Hindi
         language = request.args.get('language', 'hi-IN')
@@ -483,9 +522,9 @@ def voice_memory(scheme_id):
         if not clip_info:
             return jsonify({'success': False, 'error': 'No clip for this scheme'})
         
-        # Generate presigned URL
-        s3_client = boto3.client('s3', region_name=AWS_REGION)
-        presigned_url = s3_client.generate_presigned_url(
+        # Through the local disk tier when AUDIO_BASE_URL is set, else presigned S3
+        from services.audio_disk_cache import audio_url
+        url = audio_url(clip_info['key']) or get_client('s3').generate_presigned_url(
             'get_object',
             Params={'Bucket': S3_AUDIO_BUCKET, 'Key': clip_info['key']},
             ExpiresIn=3600
@@ -493,7 +532,7 @@ def voice_memory(scheme_id):
         
         return jsonify({
             'success': True,
-            'audio_url': presigned_url,
+            'audio_url': url,
             'farmer_name': clip_info['farmer_name'],
             'district': clip_info['district'],
             'scheme': clip_info['scheme'],
@@ -519,7 +558,7 @@ def send_sms():
             return jsonify({'success': False, 'error': 'scheme_ids must be a list',
                            'code': 'INVALID_INPUT'}), 400
         from services.sms_service import send_checklist
-        result = send_checklist(phone, scheme_ids)
+        result = send_checklist(phone, scheme_ids, data.get('language', 'hi-IN'))
         return jsonify(result)
     except Exception as e:
         logger.error(f"SMS error: {e}")
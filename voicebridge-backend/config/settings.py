@@ -25,21 +25,110 @@ AWS_REGION = os.getenv('AWS_REGION', 'ap-southeast-1')
 AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID', '')
 AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY', '')
 
+# ── AWS Client Pool ───────────────────────────────────
+# Shared by every boto3 client (see services/aws_clients.py)
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '25'))
+AWS_MAX_ATTEMPTS = int(os.getenv('AWS_MAX_ATTEMPTS', '4'))
+AWS_CONNECT_TIMEOUT = float(os.getenv('AWS_CONNECT_TIMEOUT', '3'))
+AWS_READ_TIMEOUT = float(os.getenv('AWS_READ_TIMEOUT', '60'))
+
 # ── Amazon Bedrock ────────────────────────────────────
 BEDROCK_MODEL_ID = os.getenv(
     'BEDROCK_MODEL_ID',
     'anthropic.claude-3-haiku-20240307-v1:0'
 )
+# Prompt caching for the static Sahaya persona: 'auto' | 'true' | 'false'
+# 'auto' enables it only for models that support cache_control on Bedrock
+BEDROCK_PROMPT_CACHING = os.getenv('BEDROCK_PROMPT_CACHING', 'auto').strip().lower()
+# Max rendered system prompts kept in memory (services/prompt_builder.py)
+PROMPT_CACHE_SIZE = int(os.getenv('PROMPT_CACHE_SIZE', '256'))
+# Replies to repeated questions are reused instead of calling Bedrock again
+# (services/response_cache.py). Keyed by language, schemes, stage and question.
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True').strip().lower() in ('true', '1', 'yes')
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '3600'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '512'))
+# Conversation history sent to Bedrock (services/history_manager.py): the last
+# HISTORY_MAX_TURNS exchanges verbatim, older ones summarized, all within the budget
+HISTORY_MAX_TURNS = int(os.getenv('HISTORY_MAX_TURNS', '6'))
+HISTORY_TOKEN_BUDGET = int(os.getenv('HISTORY_TOKEN_BUDGET', '1500'))
+
+# ── Turn Orchestration ────────────────────────────────
+# Shared thread pool for per-turn I/O (services/turn_orchestrator.py)
+# and per-stage deadlines in seconds
+TURN_MAX_WORKERS = int(os.getenv('TURN_MAX_WORKERS', '16'))
+TURN_SCHEME_TIMEOUT = float(os.getenv('TURN_SCHEME_TIMEOUT', '2'))
+TURN_CLIP_TIMEOUT = float(os.getenv('TURN_CLIP_TIMEOUT', '2'))
+TURN_TTS_TIMEOUT = float(os.getenv('TURN_TTS_TIMEOUT', '8'))
+
+# ── Campaign Intro Pre-generation ─────────────────────
+# services/intro_batch.py: concurrent Bedrock intros behind a token bucket
+INTRO_BATCH_WORKERS = int(os.getenv('INTRO_BATCH_WORKERS', '8'))
+INTRO_BATCH_RATE_PER_SECOND = float(os.getenv('INTRO_BATCH_RATE_PER_SECOND', '5'))
+INTRO_BATCH_BURST = int(os.getenv('INTRO_BATCH_BURST', '10'))
+INTRO_STORE_PREFIX = os.getenv('INTRO_STORE_PREFIX', 'call-intros/')
+# Seconds a "not batched" lookup is remembered, and a finished job's status is kept
+INTRO_MISS_TTL_SECONDS = float(os.getenv('INTRO_MISS_TTL_SECONDS', '300'))
+INTRO_JOB_TTL_SECONDS = float(os.getenv('INTRO_JOB_TTL_SECONDS', '3600'))
+# 'threads' runs a batch on this process's pool (long-running host or CLI);
+# 'lambda' runs it as a chain of Zappa async invocations of INTRO_TASK_CHUNK
+# items each, which must finish well inside the Lambda timeout
+INTRO_BATCH_RUNNER = os.getenv('INTRO_BATCH_RUNNER', 'lambda' if os.getenv('AWS_LAMBDA_FUNCTION_NAME') else 'threads')
+INTRO_TASK_CHUNK = int(os.getenv('INTRO_TASK_CHUNK', '100'))
 
 # ── Amazon DynamoDB ───────────────────────────────────
 DYNAMODB_TABLE_NAME = os.getenv('DYNAMODB_TABLE_NAME', 'welfare_schemes')
+# Seconds between scheme catalog freshness checks (file mtime / version item)
+SCHEME_CATALOG_CHECK_SECONDS = float(os.getenv('SCHEME_CATALOG_CHECK_SECONDS', '2' if USE_MOCK else '60'))
+# Fuzzy scheme matching for misheard names: accept without re-asking at or
+# above this confidence; only the first FUZZY_MAX_WORDS words are searched
+# (16 keeps a cold match of the full catalog under 1 ms)
+SCHEME_FUZZY_MIN_CONFIDENCE = float(os.getenv('SCHEME_FUZZY_MIN_CONFIDENCE', '0.85'))
+FUZZY_MAX_WORDS = int(os.getenv('FUZZY_MAX_WORDS', '16'))
+# Schemes in Sahaya's prompt per turn: the ones the farmer named, topped up
+# with the best BM25 matches for the message and profile (services/scheme_retrieval.py)
+SCHEME_PROMPT_TOP_K = int(os.getenv('SCHEME_PROMPT_TOP_K', '3'))
+# Parallel scan segments and BatchGetItem UnprocessedKeys retries
+DYNAMODB_SCAN_SEGMENTS = int(os.getenv('DYNAMODB_SCAN_SEGMENTS', '4'))
+DYNAMODB_BATCH_GET_RETRIES = int(os.getenv('DYNAMODB_BATCH_GET_RETRIES', '5'))
+# Precompiled catalog shipped in the deployment package (scripts/build_catalog_bundle.py).
+# Loaded on first use and checked against the live source; empty disables it.
+SCHEME_BUNDLE_PATH = os.getenv('SCHEME_BUNDLE_PATH', str(_BASE_DIR / 'data' / 'catalog.bundle'))
 
 # ── Amazon S3 ─────────────────────────────────────────
 S3_AUDIO_BUCKET = os.getenv('S3_AUDIO_BUCKET', 'voicebridge-audio-yuga')
 S3_ASSETS_BUCKET = os.getenv('S3_ASSETS_BUCKET', 'voicebridge-assets-yuga')
 
+# ── TTS Audio Cache ───────────────────────────────────
+# Synthesized speech is stored once per distinct utterance (services/audio_cache.py)
+TTS_CACHE_ENABLED = os.getenv('TTS_CACHE_ENABLED', 'True').strip().lower() in ('true', '1', 'yes')
+TTS_CACHE_PREFIX = os.getenv('TTS_CACHE_PREFIX', 'tts-cache/')
+TTS_CACHE_INDEX_SIZE = int(os.getenv('TTS_CACHE_INDEX_SIZE', '50000'))
+TTS_URL_EXPIRY_SECONDS = int(os.getenv('TTS_URL_EXPIRY_SECONDS', '3600'))
+# Concurrent per-sentence Polly/Sarvam requests for segmented TTS (whole process)
+TTS_SEGMENT_WORKERS = int(os.getenv('TTS_SEGMENT_WORKERS', '4'))
+
+# ── Local Audio Disk Tier ─────────────────────────────
+# Byte-bounded LRU of audio files in front of S3 (services/audio_disk_cache.py).
+# /tmp is the only writable disk on Lambda and survives while the container is warm.
+AUDIO_DISK_CACHE_DIR = os.getenv('AUDIO_DISK_CACHE_DIR', '/tmp/voicebridge-audio')
+AUDIO_DISK_CACHE_MB = int(os.getenv('AUDIO_DISK_CACHE_MB', '256'))
+# Public base URL of this API (the API Gateway stage on Lambda). When set, AWS
+# mode hands out <AUDIO_BASE_URL>/audio/<key> for voice memory clips and cached
+# TTS, so they are served through the disk tier; empty: presigned S3 URLs
+AUDIO_BASE_URL = os.getenv('AUDIO_BASE_URL', '').rstrip('/')
+
+# ── Regional Audio Encoding ───────────────────────────
+# Sarvam returns 16-bit PCM WAV; speech-tuned mono MP3/Opus is ~10x smaller
+# (services/audio_transcoder.py). Default format when the client does not ask
+# for one: mp3 | opus | wav. Needs ffmpeg (on Lambda, a layer such as
+# /opt/bin/ffmpeg); without it WAV is served.
+SARVAM_AUDIO_FORMAT = os.getenv('SARVAM_AUDIO_FORMAT', 'mp3').strip().lower()
+AUDIO_FFMPEG_PATH = os.getenv('AUDIO_FFMPEG_PATH', '')
+
 # ── Amazon SNS ────────────────────────────────────────
 SNS_SENDER_ID = os.getenv('SNS_SENDER_ID', 'Sahaya')
+# Checklist SMS are packed into at most this many segments (billed per segment)
+SMS_MAX_SEGMENTS = int(os.getenv('SMS_MAX_SEGMENTS', '3'))
 
 # ── Amazon Connect ────────────────────────────────────
 CONNECT_INSTANCE_ID = os.getenv('CONNECT_INSTANCE_ID', '')
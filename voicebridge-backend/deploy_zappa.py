@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Deploy script that loads .env credentials before calling zappa."""
 
+import json
 import os
 import sys
 import subprocess
@@ -26,6 +27,30 @@ os.environ['AWS_ACCESS_KEY_ID'] = ak or ''
 os.environ['AWS_SECRET_ACCESS_KEY'] = sk or ''
 os.environ['AWS_DEFAULT_REGION'] = 'ap-southeast-1'
 
+# Compile the scheme catalog into the package so cold starts skip the DynamoDB scan.
+# A missing or stale bundle only costs speed: the app falls back to the table.
+print('\nBuilding catalog bundle from DynamoDB...')
+bundle = subprocess.run([sys.executable, 'scripts/build_catalog_bundle.py', '--from-dynamodb'],
+                        cwd=Path.cwd())
+if bundle.returncode != 0:
+    print('Warning: catalog bundle build failed; deploying without a fresh bundle')
+
+# Regional TTS needs ffmpeg from a Lambda layer; without it every Sarvam clip is
+# served as WAV, ~10x the bytes on a 2G/3G link.
+stage = json.loads(Path('zappa_settings.json').read_text())['dev']
+ffmpeg_path = stage.get('environment_variables', {}).get('AUDIO_FFMPEG_PATH')
+if not stage.get('layers') or not ffmpeg_path:
+    print('\n' + '!' * 72)
+    print('ERROR: no ffmpeg on the Lambda; regional TTS would be served as WAV.')
+    print('Publish an ffmpeg layer (binary at /opt/bin/ffmpeg), then add to the dev stage')
+    print('of zappa_settings.json:')
+    print('    "layers": ["arn:aws:lambda:ap-southeast-1:<account>:layer:ffmpeg:<version>"]')
+    print('    "AUDIO_FFMPEG_PATH": "/opt/bin/ffmpeg" (under environment_variables)')
+    print('Rerun with --allow-wav to deploy without it.')
+    print('!' * 72 + '\n')
+    if '--allow-wav' not in sys.argv[1:]:
+        sys.exit(1)
+
 # Run zappa update
 print('\nStarting zappa update dev...\n')
 result = subprocess.run(['zappa', 'update', 'dev'], cwd=Path.cwd())
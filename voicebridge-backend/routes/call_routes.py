@@ -42,110 +42,42 @@ def _twiml(xml: str):
 
 
 def _get_scheme(scheme_id: str) -> dict:
-    """Get scheme details from DynamoDB via scheme_service. Falls back to verified data."""
-    try:
-        from services.scheme_service import get_scheme_by_id
-        s = get_scheme_by_id(scheme_id)
-        if s:
-            return {
-                'name_hi': s.get('name_hi', ''),
-                'benefit': s.get('benefit', ''),
-                'documents': s.get('documents', [])[:3],
-                'apply_at': s.get('apply_at', 'nazdiki CSC kendra')
-            }
-    except Exception as e:
-        logger.error(f"Scheme fetch failed for {scheme_id}: {e}")
-
-    # Verified fallback — amounts from official government sources
-    FALLBACK = {
-        'PM_KISAN': {
-            'name_hi': 'पीएम किसान सम्मान निधि',
-            'benefit': '6,000 rupaye pratisaal, teen kisht mein seedha bank mein',
-            'documents': ['Aadhaar card', 'Zameen ke kagaz (Khatauni)', 'Bank passbook'],
-            'apply_at': 'pmkisan.gov.in ya nazdiki CSC kendra'
-        },
-        'KCC': {
-            'name_hi': 'किसान क्रेडिट कार्ड',
-            'benefit': '3 lakh rupaye tak ka loan, sirf 4 pratishat byaaj par saal mein',
-            'documents': ['Aadhaar card', 'Zameen ke kagaz', 'Bank passbook', 'Passport photo'],
-            'apply_at': 'nazdiki bank shaakha mein'
-        },
-        'PMFBY': {
-            'name_hi': 'प्रधानमंत्री फसल बीमा योजना',
-            'benefit': 'Fasal kharab hone par poora muavza, sirf 2 pratishat premium',
-            'documents': ['Aadhaar card', 'Zameen ke kagaz', 'Bank passbook', 'Baayi fasal ki jaankari'],
-            'apply_at': 'nazdiki bank ya bima company mein'
-        },
-        'AYUSHMAN_BHARAT': {
-            'name_hi': 'आयुष्मान भारत',
-            'benefit': '5 lakh rupaye tak ka muft ilaaj har saal parivar ke liye',
-            'documents': ['Aadhaar card', 'Ration card'],
-            'apply_at': 'nazdiki sarkari aspatal ya CSC kendra'
-        },
-        'MGNREGS': {
-            'name_hi': 'मनरेगा',
-            'benefit': '100 din ka guaranteed kaam, 220 se 357 rupaye rozana state ke hisaab se',
-            'documents': ['Aadhaar card', 'Bank passbook'],
-            'apply_at': 'gram panchayat office'
-        }
-    }
-    return FALLBACK.get(scheme_id, FALLBACK['PM_KISAN'])
+    """Scheme details from the precomputed IVR plan (catalog, else verified fallback)."""
+    from services.ivr_plan import get_plan
+    return get_plan().scheme(scheme_id)
 
 
 def _get_voice_memory_url(scheme_id: str) -> str:
     """Public S3 URL for Voice Memory clip. Twilio fetches directly."""
-    _load()
-    bucket = os.getenv('S3_AUDIO_BUCKET', 'voicebridge-audio-yuga')
-    region = os.getenv('AWS_REGION', 'ap-southeast-1')
-    clip_map = {
-        'PM_KISAN': 'voice_memory_PM_KISAN.mp3',
-        'KCC': 'voice_memory_KCC.mp3',
-        'PMFBY': 'voice_memory_PMFBY.mp3',
-    }
-    filename = clip_map.get(scheme_id, 'voice_memory_PM_KISAN.mp3')
-    return f"https://{bucket}.s3.{region}.amazonaws.com/{filename}"
+    return _get_scheme(scheme_id)['voice_memory_url']
 
 
 def _get_ai_intro(farmer_name: str, scheme_id: str, land: float, has_kcc: bool) -> str:
-    """Bedrock AI personalised intro — short, warm, accurate. Falls back to template."""
+    """
+    Personalised intro — short, warm, accurate. Pre-generated campaign intros
+    are looked up first; otherwise Bedrock is called live. Falls back to template.
+    """
     scheme = _get_scheme(scheme_id)
     try:
-        from models.farmer import FarmerProfile
-        from services.ai_service import generate_response
-        farmer = FarmerProfile.from_dict({
-            'name': farmer_name, 'land_acres': land,
-            'state': 'Karnataka', 'has_kcc': has_kcc,
-            'has_bank_account': True
-        })
-        result = generate_response(
-            f"{farmer_name} ji ko {scheme['name_hi']} ke baare mein 2 vaakya mein batao. Sirf Hindi mein.",
-            [scheme_id], farmer, []
-        )
-        text = result.get('response_text', '')
-        if text and len(text) > 20:
-            parts = text.split('।')
-            return ('। '.join(parts[:2]) + '।')[:280]
+        from services.intro_batch import get_intro, generate_intro, save_intro, intro_key
+        text = get_intro(farmer_name, scheme_id, land, has_kcc)
+        if text:
+            return text
+        text = generate_intro(farmer_name, scheme_id, land, has_kcc)
+        if text:
+            # Later stages and previews of the same call reuse it
+            save_intro(intro_key(farmer_name, scheme_id, land, has_kcc), text)
+            return text
     except Exception as e:
         logger.error(f"Bedrock intro failed: {e}")
-    return (
-        f"{farmer_name} ji, {scheme['name_hi']} mein "
-        f"aapko {scheme['benefit']} milega. "
-        f"Yeh yojana aapke liye bilkul sahi hai."
-    )
+    return f"{farmer_name}{scheme['intro_tail']}"
 
 
 def _get_matched_schemes(land: float, has_kcc: bool) -> list:
-    """DynamoDB eligibility check via scheme_service."""
+    """Eligible schemes for the IVR answers, precomputed per DTMF path."""
     try:
-        from models.farmer import FarmerProfile
-        from services.scheme_service import check_eligibility
-        farmer = FarmerProfile.from_dict({
-            'name': 'Kisan', 'land_acres': land,
-            'state': 'Karnataka', 'has_kcc': has_kcc,
-            'has_bank_account': True, 'age': 40
-        })
-        eligible = check_eligibility(farmer)
-        return [s['scheme_id'] for s in eligible[:2]]
+        from services.ivr_plan import get_plan
+        return get_plan().matched(land, has_kcc)
     except Exception as e:
         logger.error(f"Eligibility check failed: {e}")
     return ['PM_KISAN', 'PMFBY']
@@ -218,8 +150,8 @@ def stage2_land():
     digit = request.form.get('Digits', '2').strip()
     farmer_name = request.args.get('farmer', 'Kisan bhai')
     schemes_param = request.args.get('schemes', 'PM_KISAN')
-    land_map = {'1': 1.0, '2': 3.0, '3': 7.0}
-    land = land_map.get(digit, 2.0)
+    from services.ivr_plan import LAND_ANSWERS, DEFAULT_LAND
+    land = LAND_ANSWERS.get(digit, DEFAULT_LAND)
     base = _base_url()
 
     xml = f"""<?xml version="1.0" encoding="UTF-8"?>
@@ -315,8 +247,7 @@ def stage4_docs():
         return _twiml(xml)
 
     scheme = _get_scheme(primary)
-    docs = scheme['documents']
-    docs_speech = ' '.join([f"Number {i+1}: {d}." for i, d in enumerate(docs)])
+    docs_speech = scheme['docs_speech']
 
     xml = f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
@@ -415,6 +346,43 @@ def ping():
     return _twiml(xml)
 
 
+# ─────────────────────────────────────────────────────────────
+# CAMPAIGN: PRE-GENERATE INTROS
+# Stage 3 then only looks the intro up instead of calling Bedrock live.
+# ─────────────────────────────────────────────────────────────
+
+@call_bp.route('/api/call/intros/batch', methods=['POST'])
+def intros_batch():
+    """
+    Queue intro generation for a campaign.
+    Body: {"farmers": [{"name", "land_acres", "has_kcc", "scheme_ids"?}],
+           "scheme_ids": [...] (optional, default: each farmer's top eligible scheme),
+           "overwrite": false}
+    Returns 202 with a job to poll at GET /api/call/intros/batch/<job_id>.
+    Runs as chained Lambda tasks or on this process's pool (INTRO_BATCH_RUNNER);
+    scripts/generate_intros.py is the campaign-runner equivalent.
+    """
+    data = request.get_json() or {}
+    farmers = data.get('farmers') or []
+    if not isinstance(farmers, list) or not farmers:
+        return jsonify({'success': False, 'error': 'farmers list is required',
+                        'code': 'INVALID_INPUT'}), 400
+
+    from services.intro_batch import normalize_items, start_batch
+    items = normalize_items(farmers, data.get('scheme_ids'), _get_matched_schemes)
+    job = start_batch(items, overwrite=bool(data.get('overwrite', False)))
+    return jsonify({'success': True, 'job': job}), 202
+
+
+@call_bp.route('/api/call/intros/batch/<job_id>', methods=['GET'])
+def intros_batch_status(job_id):
+    from services.intro_batch import get_job
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Unknown job', 'code': 'NOT_FOUND'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
 @call_bp.route('/api/call/preview', methods=['GET'])
 def preview():
     """Preview call script for testing. GET /api/call/preview?scheme=PM_KISAN&name=Ramesh"""
@@ -0,0 +1,61 @@
+"""
+Cold-start benchmark: first catalog use in a fresh interpreter, with and
+without the deploy-time catalog bundle (mock mode, data/schemes.json).
+Each run is a new process; the time covers the first keyword match,
+eligibility check and SMS text, i.e. loading plus compiling the catalog.
+On Lambda the bundle also replaces the DynamoDB scan, which is not measured
+here.
+
+Usage:
+    python scripts/bench_cold_start.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+t0 = time.perf_counter()
+from models.farmer import FarmerProfile
+from services import scheme_service as s
+t1 = time.perf_counter()
+s.match_schemes_to_message("kisan credit card chahiye")
+s.check_eligibility(FarmerProfile.from_dict({"name": "R", "land_acres": 2, "state": "Karnataka",
+                                             "has_kcc": False, "has_bank_account": True}))
+s.format_scheme_for_sms(["KCC", "PM_KISAN"])
+t2 = time.perf_counter()
+print(json.dumps({"imports": t1 - t0, "first_use": t2 - t1, "bundle": s.catalog.from_bundle}))
+"""
+
+
+def run(bundle_path: str) -> dict:
+    env = dict(os.environ, USE_MOCK="True", SCHEME_BUNDLE_PATH=bundle_path, PYTHONDONTWRITEBYTECODE="1")
+    out = subprocess.run([sys.executable, "-c", PROBE, str(ROOT)], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = str(Path(tmp) / "catalog.bundle")
+        subprocess.run([sys.executable, str(ROOT / "scripts" / "build_catalog_bundle.py"), "--out", bundle],
+                       cwd=ROOT, check=True, capture_output=True)
+        for label, path in (("no bundle", ""), ("bundle", bundle)):
+            samples = [run(path) for _ in range(runs)]
+            assert all(s["bundle"] == bool(path) for s in samples)
+            first_use = statistics.median(s["first_use"] for s in samples) * 1000
+            imports = statistics.median(s["imports"] for s in samples) * 1000
+            print(f"{label:>10}: first catalog use {first_use:7.2f} ms   imports {imports:7.2f} ms   (median of {runs})")
+
+
+if __name__ == "__main__":
+    main()
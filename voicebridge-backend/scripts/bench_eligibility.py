@@ -0,0 +1,57 @@
+"""
+Benchmark: eligibility for a district-sized farmer registry.
+Compares calling check_eligibility once per FarmerProfile with evaluating
+the compiled catalog rules over columnar arrays.
+
+Usage:
+    python scripts/bench_eligibility.py [farmers]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from models.farmer import FarmerProfile
+from services.eligibility_engine import FarmerTable
+from services.scheme_service import check_eligibility, check_eligibility_bulk
+
+SCALAR_SAMPLE = 20000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(42)
+    columns = {
+        "land_acres": rng.choice([0.5, 1, 2, 4, 8], size=n),
+        "has_kcc": rng.random(n) < 0.4,
+        "has_bank_account": rng.random(n) < 0.85,
+        "annual_income": rng.integers(0, 300000, size=n).astype(float),
+        "age": rng.integers(18, 75, size=n).astype(float),
+    }
+    table = FarmerTable(columns, ids=np.arange(n))
+
+    started = time.perf_counter()
+    result = check_eligibility_bulk(table)
+    bulk = time.perf_counter() - started
+
+    sample = [FarmerProfile(land_acres=float(columns["land_acres"][i]), has_kcc=bool(columns["has_kcc"][i]),
+                            has_bank_account=bool(columns["has_bank_account"][i]),
+                            annual_income=float(columns["annual_income"][i]), age=int(columns["age"][i]))
+              for i in range(min(n, SCALAR_SAMPLE))]
+    started = time.perf_counter()
+    for farmer in sample:
+        check_eligibility(farmer)
+    scalar = (time.perf_counter() - started) / len(sample) * n
+
+    print(f"{n:,} farmers x {len(result.scheme_ids)} schemes")
+    print(f"  per-farmer check_eligibility: {scalar:8.2f} s (extrapolated from {len(sample):,})")
+    print(f"  bulk NumPy evaluation:        {bulk:8.2f} s")
+    print(f"  eligible per scheme: {result.counts()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark: goodbye detection cost per call.
+Runs the tests/test_goodbye_detection.py corpus through the original
+keyword-by-keyword scan and through the compiled automaton.
+
+Usage:
+    python scripts/bench_goodbye_detection.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from services.goodbye_detector import GOODBYE_KEYWORDS, detect_goodbye
+from test_goodbye_detection import all_cases, _naive_is_goodbye
+
+ITERATIONS = 200
+
+
+def main():
+    cases = all_cases()
+    # Long turns are where per-keyword scans hurt most
+    long_message = "मुझे PM-KISAN के बारे में और जानकारी चाहिए, मेरे पास दो एकड़ जमीन है " * 5
+    cases_long = cases + [(long_message, "")] * len(cases)
+
+    keywords = sum(len(k) for groups in GOODBYE_KEYWORDS.values() for k in groups.values())
+    print(f"Keywords: {keywords} | corpus: {len(cases)} messages\n")
+
+    for label, corpus in (("corpus", cases), ("corpus + long turns", cases_long)):
+        for message, response in corpus:
+            assert detect_goodbye(message, response)["is_goodbye"] == _naive_is_goodbye(message, response)
+        calls = len(corpus) * ITERATIONS
+        naive = timeit.timeit(lambda: [_naive_is_goodbye(m, r) for m, r in corpus], number=ITERATIONS)
+        compiled = timeit.timeit(lambda: [detect_goodbye(m, r) for m, r in corpus], number=ITERATIONS)
+        print(f"{label:>20}: naive {naive / calls * 1e6:7.1f} us/call | "
+              f"automaton {compiled / calls * 1e6:7.1f} us/call | "
+              f"speedup {naive / compiled:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: per-turn system prompt build cost.
+Compares .replace()-based rendering (the original approach) with the cached
+prompt builder. The static persona block is a constant and costs nothing per turn.
+
+Usage:
+    python scripts/bench_prompt_builder.py
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.farmer import FarmerProfile
+from services.ai_service import SAHAYA_STATIC_PROMPT, SAHAYA_DYNAMIC_PROMPT
+from services.prompt_builder import SystemPromptBuilder, _json_default
+
+SCHEMES_PATH = Path(__file__).resolve().parent.parent / "data" / "schemes.json"
+ITERATIONS = 2000
+
+
+def legacy_build(scheme_data, farmer, lang_instruction):
+    """The pre-builder implementation of _build_bedrock_messages' prompt step."""
+    scheme_data_str = json.dumps(scheme_data, ensure_ascii=False, indent=2, default=_json_default)
+    farmer_profile_str = json.dumps(farmer.to_dict(), ensure_ascii=False, indent=2)
+    system = SAHAYA_DYNAMIC_PROMPT.replace("{scheme_data}", scheme_data_str)
+    system = system.replace("{farmer_profile}", farmer_profile_str)
+    system = system.replace("{name}", farmer.name)
+    return f"LANGUAGE INSTRUCTION (HIGHEST PRIORITY):\n{lang_instruction}\n\n{system}"
+
+
+def main():
+    with open(SCHEMES_PATH, encoding="utf-8") as f:
+        schemes = json.load(f)
+    farmer = FarmerProfile.from_dict({
+        "name": "Ramesh Kumar", "land_acres": 2, "state": "Karnataka",
+        "has_kcc": False, "has_bank_account": True, "age": 38
+    })
+    lang = "Please respond ONLY in Hindi (Devanagari script)."
+    builder = SystemPromptBuilder(SAHAYA_STATIC_PROMPT, SAHAYA_DYNAMIC_PROMPT)
+    print(f"Static (cacheable) prefix: {len(SAHAYA_STATIC_PROMPT)} chars\n")
+
+    for label, payload in (("1 scheme", schemes[:1]), ("3 schemes", schemes[:3]), ("10 schemes", schemes)):
+        assert builder.build(payload, farmer.to_dict(), lang) == legacy_build(payload, farmer, lang)
+        legacy = timeit.timeit(lambda: legacy_build(payload, farmer, lang), number=ITERATIONS)
+        cached = timeit.timeit(lambda: builder.build(payload, farmer.to_dict(), lang), number=ITERATIONS)
+        builder.clear()
+        cold = timeit.timeit(lambda: (builder.clear(), builder.build(payload, farmer.to_dict(), lang)),
+                             number=ITERATIONS)
+        print(f"{label:>10}: legacy {legacy / ITERATIONS * 1e6:8.1f} us/turn | "
+              f"cold {cold / ITERATIONS * 1e6:8.1f} us/turn | "
+              f"cached {cached / ITERATIONS * 1e6:8.1f} us/turn | "
+              f"saving {(legacy - cached) / ITERATIONS * 1e6:8.1f} us/turn")
+
+    print(f"\nPrompt cache: {builder.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: scheme detection cost per transcript.
+Compares a linear any(k in message) scan per scheme over the same alias
+and catalog keyword lists with the compiled keyword index, on a
+multilingual corpus: every alias inside a sentence, plus the goodbye test
+transcripts (which mention no scheme).
+
+Usage:
+    python scripts/bench_scheme_index.py
+"""
+
+import sys
+import timeit
+import unicodedata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from services.scheme_index import SCHEME_ALIASES, SchemeKeywordIndex
+from services.scheme_service import catalog
+from test_goodbye_detection import all_cases
+
+ITERATIONS = 50
+
+
+def linear_tables(schemes):
+    tables = {}
+    for scheme_id, by_language in SCHEME_ALIASES.items():
+        tables.setdefault(scheme_id, []).extend(k for keywords in by_language.values() for k in keywords)
+    for scheme in schemes:
+        tables.setdefault(scheme["scheme_id"], []).extend(scheme.get("keywords") or [])
+    return list(tables.items())
+
+
+def linear_match(message, tables):
+    text = unicodedata.normalize("NFC", message).lower()
+    return [scheme_id for scheme_id, keywords in tables if any(k in text for k in keywords)]
+
+
+def main():
+    schemes = catalog.all()
+    aliases = [k for by_language in SCHEME_ALIASES.values() for keywords in by_language.values() for k in keywords]
+    corpus = [f"namaste, mujhe {alias} ke baare mein jaankari chahiye" for alias in aliases]
+    corpus += [message for message, _ in all_cases()]
+    long_turns = [" ".join(corpus[i:i + 8]) for i in range(0, len(corpus), 8)]
+
+    tables = linear_tables(schemes)
+    index = SchemeKeywordIndex(schemes)
+    keywords = sum(len(k) for _, k in tables)
+    print(f"Keywords: {keywords} | corpus: {len(corpus)} transcripts\n")
+
+    for label, messages in (("transcripts", corpus), ("long turns", long_turns)):
+        calls = len(messages) * ITERATIONS
+        linear = timeit.timeit(lambda: [linear_match(m, tables) for m in messages], number=ITERATIONS)
+        compiled = timeit.timeit(lambda: [index.match_ids(m) for m in messages], number=ITERATIONS)
+        print(f"{label:>12}: linear {linear / calls * 1e6:7.1f} us/call | "
+              f"index {compiled / calls * 1e6:7.1f} us/call | "
+              f"speedup {linear / compiled:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: BM25 scheme retrieval per message, and the size of the
+SCHEME DATA block it produces versus sending every scheme in full.
+
+Usage:
+    python scripts/bench_scheme_retrieval.py
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from models.farmer import FarmerProfile
+from services.scheme_service import catalog, get_schemes_by_ids, prompt_schemes
+from services.scheme_store import PROMPT_FIELDS
+
+ITERATIONS = 5000
+MESSAGES = (
+    "namaste",
+    "mujhe kheti ke liye loan chahiye",
+    "fasal kharab ho gayi, bima ka paisa kaise milega?",
+    "ghar banane ke liye sarkar se madad milti hai kya aur ration card bhi chahiye",
+)
+
+
+def main():
+    farmer = FarmerProfile(name="Ramesh", land_acres=2, has_kcc=False, has_bank_account=True, age=35)
+    retriever = catalog.retriever()
+    everything = get_schemes_by_ids([s["scheme_id"] for s in catalog.all()], PROMPT_FIELDS)
+    full_chars = len(json.dumps(everything, ensure_ascii=False, indent=2))
+    print(f"{len(retriever)} schemes; all of them in the prompt: {full_chars} chars\n")
+
+    for message in MESSAGES:
+        search = timeit.timeit(lambda: retriever.search(message, 3), number=ITERATIONS) / ITERATIONS * 1e6
+        payload = timeit.timeit(lambda: prompt_schemes(message, [], farmer), number=ITERATIONS) / ITERATIONS * 1e6
+        data = prompt_schemes(message, [], farmer)
+        chars = len(json.dumps(data, ensure_ascii=False, indent=2))
+        print(f"{message[:40]:>40}: search {search:6.1f} us | prompt_schemes {payload:6.1f} us | "
+              f"{[s['scheme_id'] for s in data]} {chars} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: serializing the full 10-scheme payload for Bedrock.
+Compares scheme items as DynamoDB returns them (Decimal numbers, lists),
+encoded through a Decimal default= hook, with the catalog's normalized
+records (scheme_store.normalize_item), which need no hook. Both give the
+same JSON text.
+
+Usage:
+    python scripts/bench_scheme_serialization.py
+"""
+
+import json
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from models.farmer import FarmerProfile
+from services.ai_service import SAHAYA_STATIC_PROMPT, SAHAYA_DYNAMIC_PROMPT
+from services.prompt_builder import SystemPromptBuilder, _json_default
+from services.scheme_service import SCHEMES_PATH
+from services.scheme_store import PROMPT_FIELDS, normalize_item
+
+ITERATIONS = 2000
+
+
+def main():
+    text = SCHEMES_PATH.read_text(encoding="utf-8")
+    # What boto3 hands back: every number is a Decimal
+    raw = [{f: s[f] for f in PROMPT_FIELDS if f in s}
+           for s in json.loads(text, parse_float=Decimal, parse_int=Decimal)]
+    normalized = [normalize_item(s) for s in raw]
+
+    calls = 0
+
+    def counting_default(obj):
+        nonlocal calls
+        calls += 1
+        return _json_default(obj)
+
+    assert json.dumps(raw, ensure_ascii=False, indent=2, default=counting_default) == \
+        json.dumps(normalized, ensure_ascii=False, indent=2)
+    print(f"{len(raw)} schemes, {calls} Decimal values per dump go through default=\n")
+
+    farmer = FarmerProfile.from_dict({
+        "name": "Ramesh Kumar", "land_acres": 2, "state": "Karnataka",
+        "has_kcc": False, "has_bank_account": True, "age": 38
+    }).to_dict()
+    lang = "Please respond ONLY in Hindi (Devanagari script)."
+    builder = SystemPromptBuilder(SAHAYA_STATIC_PROMPT, SAHAYA_DYNAMIC_PROMPT)
+
+    cases = (
+        ("compact dumps", lambda data: json.dumps(data, ensure_ascii=False, default=_json_default)),
+        ("indent=2 dumps", lambda data: json.dumps(data, ensure_ascii=False, indent=2, default=_json_default)),
+        ("cold prompt build", lambda data: (builder.clear(), builder.build(data, farmer, lang))),
+    )
+    for label, fn in cases:
+        before = timeit.timeit(lambda: fn(raw), number=ITERATIONS) / ITERATIONS * 1e6
+        after = timeit.timeit(lambda: fn(normalized), number=ITERATIONS) / ITERATIONS * 1e6
+        print(f"{label:>18}: Decimal items {before:8.1f} us | normalized {after:8.1f} us | "
+              f"{before / after:4.1f}x")
+
+    load = timeit.timeit(lambda: [normalize_item(s) for s in raw], number=ITERATIONS) / ITERATIONS * 1e6
+    print(f"\nOne-off normalization at catalog load: {load:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
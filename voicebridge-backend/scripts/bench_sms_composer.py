@@ -0,0 +1,54 @@
+"""
+Benchmark: checklist SMS cost in segments and compose time.
+Compares the old 320-character Hindi text (UCS-2, cut mid-word) with the
+segment-aware composer, over every combination of 1-3 catalog schemes.
+
+Usage:
+    python scripts/bench_sms_composer.py
+"""
+
+import itertools
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from services.scheme_service import SAHAYA_NATIVE_NAME, catalog, compose_scheme_sms, _sms_cache
+from services.sms_composer import sms_segments
+
+
+def legacy_sms(scheme_ids):
+    """The pre-composer format_scheme_for_sms, before its 320-character cut."""
+    lines = [f"**VoiceBridge - {SAHAYA_NATIVE_NAME}**"]
+    for scheme in (catalog.get(sid) for sid in scheme_ids[:3]):
+        lines.append(f"\n{scheme.get('name_hi', '')}:")
+        lines.extend(f"{i}. {doc}" for i, doc in enumerate(scheme.get("documents", [])[:3], 1))
+    lines.append("\n✓ Sahaya helpline: 1800-123-SAHAYA")
+    return "".join(lines)
+
+
+def main():
+    ids = [scheme["scheme_id"] for scheme in catalog.all()]
+    combos = [list(c) for n in (1, 2, 3) for c in itertools.combinations(ids, n)]
+    # The old code sent at most 320 characters
+    old = [sms_segments(legacy_sms(c)[:320])[1] for c in combos]
+    new = [compose_scheme_sms(c) for c in combos]
+    print(f"{len(combos)} scheme combinations")
+    print(f"  legacy:   {sum(old)} segments ({sum(old) / len(combos):.2f} per SMS), "
+          f"{sum(len(legacy_sms(c)) > 320 for c in combos)} truncated")
+    print(f"  composer: {sum(s.segments for s in new)} segments "
+          f"({sum(s.segments for s in new) / len(combos):.2f} per SMS), "
+          f"{sum(not s.complete for s in new)} shortened, "
+          f"{sum(s.encoding == 'GSM-7' for s in new)} GSM-7")
+
+    sample = ["PM_KISAN", "KCC", "PMFBY"]
+    runs = 200
+    cold = timeit.timeit(lambda: (_sms_cache.clear(), compose_scheme_sms(sample)), number=runs) / runs * 1e6
+    warm = timeit.timeit(lambda: compose_scheme_sms(sample), number=runs * 50) / (runs * 50) * 1e6
+    print(f"\ncompose 3 schemes: cold {cold:.0f} us, memoized {warm:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compiles the scheme catalog into data/catalog.bundle for the deployment
+package: schemes, eligibility rules, keyword index and SMS blocks, so a cold
+Lambda skips the DynamoDB scan and all compilation (see
+services/catalog_bundle.py). Run by deploy_zappa.py before every deploy.
+
+Sources:
+  (default)         data/schemes.json — for mock mode
+  --export FILE     DynamoDB export: JSON lines of {"Item": {...typed...}}
+                    as written by export-table-to-point-in-time, or a plain
+                    JSON list of items
+  --from-dynamodb   live scan of DYNAMODB_TABLE_NAME (needs AWS credentials)
+
+DynamoDB bundles carry the CATALOG_META_ID item's version; Lambda installs
+them at once and reloads from the table if that version has changed.
+
+Usage:
+    python scripts/build_catalog_bundle.py [--export FILE | --from-dynamodb] [--out PATH]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config.settings import SCHEME_BUNDLE_PATH
+from services.catalog_bundle import file_sha1
+from services.scheme_service import CATALOG_META_ID, SCHEMES_PATH, build_bundle
+from services.scheme_store import normalize_item, normalize_value
+
+
+def _read_export(path: Path) -> list[dict]:
+    text = path.read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        return json.loads(text)
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    items = []
+    for line in text.splitlines():
+        if line.strip():
+            typed = json.loads(line).get("Item", {})
+            items.append({k: deserializer.deserialize(v) for k, v in typed.items()})
+    return items
+
+
+def _scan_table() -> list[dict]:
+    from services.scheme_store import scan_all
+    return scan_all()
+
+
+def _split_meta(items: list[dict]) -> tuple[list[dict], object]:
+    meta = next((i for i in items if i.get("scheme_id") == CATALOG_META_ID), None)
+    schemes = [normalize_item(i) for i in items if i.get("scheme_id") != CATALOG_META_ID]
+    return schemes, normalize_value(meta.get("version")) if meta else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--export", type=Path, help="DynamoDB export file")
+    source.add_argument("--from-dynamodb", action="store_true", help="scan the live table")
+    parser.add_argument("--out", type=Path, default=Path(SCHEME_BUNDLE_PATH))
+    args = parser.parse_args()
+
+    if args.export or args.from_dynamodb:
+        schemes, version = _split_meta(_read_export(args.export) if args.export else _scan_table())
+        if version is None:
+            print(f"Warning: no {CATALOG_META_ID} item; the bundle will be reloaded on every cold start")
+        kind = "dynamodb"
+    else:
+        schemes = json.loads(SCHEMES_PATH.read_text(encoding="utf-8"))
+        version = file_sha1(SCHEMES_PATH)
+        kind = "json"
+
+    size = build_bundle(args.out, schemes, kind, version)
+    print(f"Wrote {args.out} ({len(schemes)} schemes, {kind} version {version}, {size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Pre-generates a campaign's call intros in this process, for the campaign
+runner to call before dialling (the same work as POST /api/call/intros/batch,
+without needing a long-running web host). Intros go to the usual store (S3 in
+AWS mode), where the Lambda webhooks look them up.
+
+Input: a JSON list of farmers, as in the endpoint's "farmers" field:
+    [{"name": "Ramesh Kumar", "land_acres": 2, "has_kcc": false, "scheme_ids": ["KCC"]}]
+Farmers without scheme_ids get --scheme, else their top eligible scheme.
+
+Usage:
+    python scripts/generate_intros.py farmers.json [--scheme KCC ...] [--overwrite]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# This process does the work and waits for it
+os.environ["INTRO_BATCH_RUNNER"] = "threads"
+
+from services.intro_batch import normalize_items, start_batch, wait_for_job
+
+
+def _matched_schemes(land: float, has_kcc: bool) -> list:
+    from services.ivr_plan import get_plan
+    return get_plan().matched(land, has_kcc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("farmers", type=Path, help="JSON list of farmer profiles")
+    parser.add_argument("--scheme", action="append", dest="scheme_ids", help="scheme id (repeatable)")
+    parser.add_argument("--overwrite", action="store_true", help="regenerate intros already stored")
+    args = parser.parse_args()
+
+    farmers = json.loads(args.farmers.read_text(encoding="utf-8"))
+    items = normalize_items(farmers, args.scheme_ids, _matched_schemes)
+    job = wait_for_job(start_batch(items, overwrite=args.overwrite)["job_id"])
+    print(f"Job {job['job_id']}: {job['generated']} generated, {job['skipped']} skipped, "
+          f"{job['failed']} failed of {job['total']}")
+    sys.exit(1 if job["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
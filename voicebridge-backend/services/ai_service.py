@@ -4,23 +4,25 @@ Generates Sahaya's Hindi responses using Bedrock (AWS) or mock data (development
 """
 
 import json
+import logging
 import re
-import unicodedata
-from decimal import Decimal
-from config.settings import USE_MOCK, AWS_REGION, BEDROCK_MODEL_ID
-from services.scheme_service import get_scheme_by_id
+import time
+from config.settings import (
+    USE_MOCK, BEDROCK_MODEL_ID, BEDROCK_PROMPT_CACHING, PROMPT_CACHE_SIZE,
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES,
+    HISTORY_MAX_TURNS, HISTORY_TOKEN_BUDGET,
+)
+from services.scheme_service import match_schemes_to_message, prompt_schemes
+from services.sentence_splitter import SentenceAccumulator, split_sentences
+from services.prompt_builder import SystemPromptBuilder
+from services.goodbye_detector import detect_goodbye
+from services.response_cache import ResponseCache
+from services.history_manager import HistoryManager
+from services.metrics import REGISTRY, TOKEN_BUCKETS
+from services.aws_clients import get_client
 from models.farmer import FarmerProfile
 
-if not USE_MOCK:
-    import boto3
-
-
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle Decimal objects from DynamoDB."""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj) if '.' in str(obj) else int(obj)
-        return super().default(obj)
+logger = logging.getLogger(__name__)
 
 
 # Farmer success stories from Voice Memory Network — multilingual
@@ -52,11 +54,15 @@ FARMER_STORIES = {
 }
 
 
-SAHAYA_SYSTEM_PROMPT = """You are Sahaya, an expert Hindi-speaking AI welfare navigator for Indian farmers. You have deep knowledge of all government schemes and speak like a trusted village elder who genuinely cares.
+# Static persona and rules — identical for every farmer and every turn, so it is
+# sent first and marked for Bedrock prompt caching. Per-call data goes in
+# SAHAYA_DYNAMIC_PROMPT. {name} below is a literal placeholder; the dynamic block
+# tells the model which name to use.
+SAHAYA_STATIC_PROMPT = """You are Sahaya, an expert Hindi-speaking AI welfare navigator for Indian farmers. You have deep knowledge of all government schemes and speak like a trusted village elder who genuinely cares.
 
-You have access to this farmer's profile: {farmer_profile}
+You have access to this farmer's profile (FARMER PROFILE at the end of these instructions).
 Use their name, land size, and state to personalize EVERY response.
-Relevant scheme data: {scheme_data}
+Relevant scheme data is under SCHEME DATA at the end of these instructions.
 
 ═══════════════════════════════
 GOODBYE DETECTION (CRITICAL)
@@ -223,10 +229,51 @@ If farmer asks if this is real or expresses suspicion:
 "Main Sahaya hoon — ek AI sahayak. Main aapka koi bhi personal 
 data nahi maangti. Koi OTP, password ya Aadhaar number kabhi mat 
 dena kisi ko bhi. Yeh service bilkul free hai."
+"""
 
+# Per-call block appended after the static prompt. Small, so it stays cheap uncached.
+SAHAYA_DYNAMIC_PROMPT = """═══════════════════════════════
+THIS FARMER
+═══════════════════════════════
+FARMER NAME (use it wherever the examples above show the name placeholder): {name}
 FARMER PROFILE: {farmer_profile}
-SCHEME DATA: {scheme_data}
-CONVERSATION HISTORY: {conversation_history}"""
+SCHEME DATA: {scheme_data}"""
+
+# Template is split once; rendered prompts are cached per language/schemes/profile
+_system_prompt_builder = SystemPromptBuilder(SAHAYA_STATIC_PROMPT, SAHAYA_DYNAMIC_PROMPT, PROMPT_CACHE_SIZE)
+
+# Replies to repeated questions, stored with the farmer name as a placeholder
+_response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS)
+
+# Recent turns verbatim, older ones folded into a per-conversation summary
+_history_manager = HistoryManager(HISTORY_MAX_TURNS, HISTORY_TOKEN_BUDGET)
+
+# ── Metrics (exposed at /api/metrics) ──
+_LLM_LABELS = ("language", "model", "scheme", "mode")
+_llm_requests = REGISTRY.counter(
+    "voicebridge_llm_requests_total",
+    "Sahaya replies by outcome (success, cached, error, throttled)", _LLM_LABELS + ("outcome",))
+_llm_latency = REGISTRY.histogram(
+    "voicebridge_llm_request_duration_seconds", "Wall clock of a Sahaya reply", _LLM_LABELS)
+_llm_ttft = REGISTRY.histogram(
+    "voicebridge_llm_time_to_first_token_seconds", "Streamed replies: time until the first text delta",
+    _LLM_LABELS)
+_llm_tokens = REGISTRY.counter(
+    "voicebridge_llm_tokens_total", "Bedrock tokens (input, output, cache_read, cache_write)",
+    _LLM_LABELS + ("type",))
+_llm_turn_tokens = REGISTRY.histogram(
+    "voicebridge_llm_turn_tokens", "Bedrock input/output tokens per turn", _LLM_LABELS + ("type",),
+    buckets=TOKEN_BUCKETS)
+_llm_errors = REGISTRY.counter(
+    "voicebridge_llm_errors_total", "Failed Sahaya replies by error type", _LLM_LABELS + ("error",))
+
+_LANGUAGE_RE = re.compile(r"ONLY in (\w+)", re.IGNORECASE)
+_THROTTLE_CODES = ("ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException")
+
+# Model families that support Bedrock prompt caching (cache_control blocks)
+_PROMPT_CACHING_MODELS = (
+    "claude-3-5-haiku", "claude-3-7-sonnet", "claude-sonnet-4", "claude-opus-4", "claude-haiku-4",
+)
 
 
 MOCK_RESPONSES = {
@@ -318,13 +365,9 @@ def get_voice_memory_clip(matched_schemes: list[str], message_text: str) -> str
                 return scheme
     
     # Fallback: check message text for keywords
-    message_lower = message_text.lower()
-    if any(k in message_lower for k in ['pm kisan', 'pm-kisan', 'kisan samman', 'pmkisan']):
-        return 'PM_KISAN'
-    if any(k in message_lower for k in ['kcc', 'kisan credit', 'credit card']):
-        return 'KCC'
-    if any(k in message_lower for k in ['pmfby', 'fasal bima', 'crop insurance', 'bima']):
-        return 'PMFBY'
+    for scheme in match_schemes_to_message(message_text):
+        if scheme in clip_schemes:
+            return scheme
     
     return None
 
@@ -351,27 +394,18 @@ def _build_bedrock_messages(
     scheme_data: list[dict],
     farmer: FarmerProfile,
     matched_scheme: str = None,
-    lang_instruction: str = None
+    lang_instruction: str = None,
+    conversation_id: str = None
 ) -> list[dict]:
     """
     Builds messages array for Bedrock Claude API.
-    Injects scheme data and farmer profile into system prompt.
+    Returns (messages, dynamic_system_block). The dynamic block carries scheme data,
+    farmer profile, language instruction and the summary of older turns; it is sent
+    after SAHAYA_STATIC_PROMPT.
     Injects farmer story if matched scheme is PM_KISAN, KCC, or PMFBY.
     """
-    # Inject data into system prompt - use custom encoder for Decimal objects
-    scheme_data_str = json.dumps(scheme_data, ensure_ascii=False, indent=2, cls=DecimalEncoder)
-    farmer_profile_str = json.dumps(farmer.to_dict(), ensure_ascii=False, indent=2)
-    
-    system_with_data = SAHAYA_SYSTEM_PROMPT.replace("{scheme_data}", scheme_data_str)
-    system_with_data = system_with_data.replace("{farmer_profile}", farmer_profile_str)
-    
-    # Replace {name} placeholder with farmer's actual name
-    farmer_name = farmer.name if hasattr(farmer, 'name') else 'Kisan bhai'
-    system_with_data = system_with_data.replace("{name}", farmer_name)
-    
-    # Prepend language instruction if provided
-    if lang_instruction:
-        system_with_data = f"LANGUAGE INSTRUCTION (HIGHEST PRIORITY):\n{lang_instruction}\n\n{system_with_data}"
+    # Render from the pre-split template; identical inputs hit the prompt cache
+    system_with_data = _system_prompt_builder.build(scheme_data, farmer.to_dict(), lang_instruction)
     
     # Inject farmer story if matched scheme has one
     if matched_scheme and matched_scheme in FARMER_STORIES:
@@ -385,15 +419,18 @@ def _build_bedrock_messages(
         system_with_data = system_with_data.replace("{district}", story['district'])
         system_with_data += farmer_story_context
     
+    # The web client's history already ends with this message; don't send it twice
+    if history and history[-1].get("role", "user") == "user" \
+            and str(history[-1].get("content", "")).strip() == message.strip():
+        history = history[:-1]
+
+    # Keep recent turns verbatim; older ones arrive as a summary
+    recent, summary = _history_manager.window(history, conversation_id)
+    if summary:
+        system_with_data += f"\n\nEARLIER IN THIS CALL (summary, do not repeat):\n{summary}"
+
     # Build messages array
-    messages = []
-    
-    # Add conversation history
-    for item in (history or []):
-        messages.append({
-            "role": item.get("role", "user"),
-            "content": item.get("content", "")
-        })
+    messages = list(recent)
     
     # Add current message
     messages.append({
@@ -407,237 +444,415 @@ def _build_bedrock_messages(
 def _detect_goodbye_intent(message: str, response_text: str) -> dict:
     """
     Detect if user is trying to end the conversation and whether confirmation is needed.
-    
+
     Returns dict with:
     - is_goodbye: bool - True if user wants to end call (strong or ambiguous)
     - needs_confirmation: bool - True if goodbye is ambiguous and needs user confirmation
-    
-    Strong goodbye: Clear intent like "bye", "call खत्म", "കോൾ അവസാനിപ്പിക്കും"
-    Ambiguous goodbye: Phrases like "i don't have anything to ask" that might need confirmation
-    
-    Uses Unicode NFC normalization for consistent matching across regional scripts.
+    plus strength / languages / matched from services.goodbye_detector.
     """
-    msg_lower = message.lower()
-    resp_lower = response_text.lower()
-    
-    # Normalize input strings to NFC (handles Unicode variations in regional scripts)
-    message_norm = unicodedata.normalize('NFC', message)
-    response_norm = unicodedata.normalize('NFC', response_text)
-    msg_lower = message_norm.lower()
-    resp_lower = response_norm.lower()
-    
-    # Goodbye keywords in ALL supported languages with multiple variations
-    goodbye_keywords = [
-        # ============ ENGLISH ============
-        'bye', 'goodbye', 'done', 'enough', 'stop', 'thanks', 'thank you', 
-        'ok bye', 'bye now', 'see you', 'take care', 'that\'s all', 'that\'s it',
-        'gotta go', 'need to go', 'have to go', 'see ya', 'catch you later',
-        'end call', 'finish', 'complete', 'thanks bye', 'this is enough',
-        'i don\'t have anything to ask', 'i dont have anything to ask anymore',
-        'i don\'t want to know anymore', 'i dont want to know anymore', 'nothing more to ask',
-        
-        # ============ HINDI (हिंदी) ============
-        'बाय', 'अलविदा', 'जाना है', 'खत्म', 'खत्म करो', 'कॉल खत्म',
-        'धन्यवाद', 'सुक्रिया', 'खुदा हाफिज', 'फिर मिलेंगे',
-        'कॉल अंत करो', 'कॉल बंद करो', 'बंद करो', 'बंद कर',
-        'जाता हूं', 'जाती हूं', 'जाऊँ', 'जाते हैं', 'जाते हो',
-        'अलग करो', 'विदा', 'नमस्ते', 'अच्छा बाय', 'यह काफी है',
-        'मुझे और कुछ नहीं पूछना', 'मुझे और जानना नहीं है', 'पर्याप्त है',
-        
-        # ============ TAMIL (தமிழ்) ============
-        'பை', 'வணக்கம்', 'நன்றி', 'போய்விடு', 'போனேன்', 'போகிறேன்',
-        'பேச முடிந்தவ', 'பேசலாம்', 'முடிந்தது', 'வாழ்க',
-        'என்ற கோல் முடிக்க', 'கோல் முடிக்கவும்', 'அவசியம் செல்ல',
-        'அழைப்பு முடி', 'செல்கிறேன்', 'நன்றி சொல்', 'மீண்டு பார்ப்போம்',
-        'இது போதும்', 'எனக்கு கேட்க ஒன்றுமில்லை', 'இனி தெரிந்து கொள்ள வேண்டாம்', 'நன்றாய் வாழ்க',
-        
-        # ============ KANNADA (ಕನ್ನಡ) ============
-        'ವಿದಾ', 'ಹೌದು', 'ಸರಿ', 'ಧನ್ಯವಾದ', 'ಶುಕ್ರಿಯೆ', 'ನಮಸ್ಕಾರ',
-        'ಹೋಗು', 'ಹೋಗಬೇಕು', 'ಹೋಗುತ್ತೀನಿ', 'ಕರೆ ಮುಗಿಸು',
-        'ಕರೆ ಮುಗಿಸಿ', 'ಸಾಕು', 'ಮುಗಿಸು', 'ಮುಗಿದು',
-        'ನಿಲ್ಲಿಸು', 'ನಿಲ್ಲಬೇಕು', 'ಸರಿ ವಿದಾ', 'ಹಾಗಾದರೆ ಬಾಯ್',
-        'ಇದು ಸಾಕು', 'ನನಗೆ ಪ್ರಶ್ನೆಗಳು ಇಲ್ಲ', 'ನಾನು ಹೆಚ್ಚು ತಿಳಿಯಲು ಬಯಸುತ್ತೇನೆ ಇಲ್ಲ',
-        
-        # ============ TELUGU (తెలుగు) ============
-        'బై', 'సరిగ్గా', 'ఆ విధంగా', 'ధన్యవాదాలు', 'దయచేసి', 'నమస్కారం',
-        'వెళ్ళవలసిన', 'పోకూ', 'నా వెళ్ళాలి', 'కాల్‌ ముగించండి',
-        'కాల్ ముగిసిన', 'సరిపడింది', 'ఆపండి', 'విరమిస్తుంది',
-        'ఆపుకోండి', 'చాలు', 'ఖతమ్', 'థాంక్ యూ బై',
-        'ఇది సరిపోతుంది', 'నాకు ఏ ప్రశ్నలు లేవు', 'నేను ఇకపై తెలుసుకోవడానికి కోరుకోను',
-        
-        # ============ MALAYALAM (മലയാളം) ============
-        'കോൾ അവസാനിപ്പിക്കാം', 'കോൾ അവസാനിപ്പിക്കും', 'കോൾ അവസാനം', 'കോൾ കം കരോ', 'കോൾ കഴിയ്ക്കാം', 'നിർത്തൽ', 'ഓകെ', 'പോകാം',
-        'പോണം', 'പോകുന്നു', 'പോകണം', 'പോയ്', 'പോയ്‌', 'ജാ', 'വാഴ്ക', 'നന്ദി', 'നന്ദി പറയുന്നു',
-        'നിലയ്ക്കാം', 'നില്‍ക്കാം', 'നിന്നുപോകാം', 'നിൽപ്പിച്ചോ', 'നിൽപ്പിക്കാം', 'സാധിച്ചു',
-        'സാരമായി തീരുന്നു', 'കഴിഞ്ഞു', 'കഴിയുന്നു', 'തീരണ്ടെ', 'തീരുമ്പോൾ', 'കെട്ടിപ്പോകാം', 'അവ്സാനിപ്പിക്കാം',
-        'ഇത് മതി', 'എനിക്കൊരു ചോദ്യവും ഇല്ല', 'എനിക്കൂടെ കൂടുതൽ അറിയാൻ താത്പര്യമില്ല'
-    ]
-    
-    # Check if any goodbye keyword is in the message (BETTER: handle non-ASCII properly)
-    for kw in goodbye_keywords:
-        try:
-            # Normalize keyword to NFC for comparison
-            kw_norm = unicodedata.normalize('NFC', kw)
-            # For Hindi/regional scripts: exact match WITHOUT lowercasing
-            if ord(kw[0]) > 127:  # Non-ASCII
-                if kw_norm in message_norm:
-                    # [GOODBYE] Matched Hindi/regional '{kw}' in message
-                    return True
-            # For English: case-insensitive
-            elif kw.lower() in msg_lower:
-                # [GOODBYE] Matched English '{kw}' in message
-                return True
-        except Exception:
-            pass
-    
-    # Check if AI response indicates goodbye (phrases like "take care", "all the best", etc.)
-    goodbye_response_phrases = [
-        'धन्यवाद', 'take care', 'all the best', 'வாழ்க', 'നന്ദി', 'good luck',
-        'ಧನ್ಯವಾದ', 'థాంకు', 'thanks', 'farewell', 'કોલ/call शેষ'
-    ]
-    
-    # More aggressive detection: if user says goodbye word AND any "end" signal from AI
-    for phrase in goodbye_response_phrases:
-        if phrase.lower() in resp_lower and any(
-            kw.lower() in msg_lower for kw in ['thanks', 'bye', 'done', 'धन्यवाद', 'നന്ദി', 'thank', 'okay', 'ok']
-        ):
-            return True
-    
-    # If message includes multiple confirmed goodbye words, it's definitely goodbye
-    strong_goodbye_words = ['bye', 'बाय', 'போகிறேന्', 'വാഴ്ക', 'कॉल खत्म', 'अलविदा', 'കോൾ അവസാനം', 'കോൾ അവസാനിപ്പിക്കും', 'കഴിഞ്ഞു']
-    strong_goodbye_count = 0
-    for word in strong_goodbye_words:
-        word_norm = unicodedata.normalize('NFC', word)
-        if word_norm in message_norm or word.lower() in msg_lower:
-            strong_goodbye_count += 1
-    
-    if strong_goodbye_count >= 2:
-        return True
-    
-    return False
+    return detect_goodbye(message, response_text)
 
 
-def generate_response(
+def _prompt_caching_enabled() -> bool:
+    """BEDROCK_PROMPT_CACHING: 'true', 'false', or 'auto' (on for models that support it)."""
+    if BEDROCK_PROMPT_CACHING == "auto":
+        return any(family in BEDROCK_MODEL_ID for family in _PROMPT_CACHING_MODELS)
+    return BEDROCK_PROMPT_CACHING in ("true", "1", "yes")
+
+
+def _system_blocks(dynamic_system: str) -> list[dict]:
+    """
+    System prompt as content blocks: the static Sahaya persona first (marked as a
+    cache checkpoint when prompt caching is on), then the small per-farmer block.
+    """
+    static_block = {"type": "text", "text": SAHAYA_STATIC_PROMPT}
+    if _prompt_caching_enabled():
+        static_block["cache_control"] = {"type": "ephemeral"}
+    return [static_block, {"type": "text", "text": dynamic_system}]
+
+
+def _extract_usage(usage: dict | None) -> dict:
+    """Normalizes Bedrock 'usage', including prompt-cache read/write token counts."""
+    usage = usage or {}
+    return {
+        "input_tokens": int(usage.get("input_tokens", 0) or 0),
+        "output_tokens": int(usage.get("output_tokens", 0) or 0),
+        "cache_read_input_tokens": int(usage.get("cache_read_input_tokens", 0) or 0),
+        "cache_creation_input_tokens": int(usage.get("cache_creation_input_tokens", 0) or 0),
+    }
+
+
+def _log_usage(usage: dict):
+    logger.info(
+        f"[BEDROCK USAGE] in={usage['input_tokens']} out={usage['output_tokens']} "
+        f"cache_read={usage['cache_read_input_tokens']} cache_write={usage['cache_creation_input_tokens']}"
+    )
+
+
+def _prepare_bedrock_request(
+    message: str,
+    scheme_ids: list[str],
+    farmer: FarmerProfile,
+    conversation_history: list[dict] = None,
+    lang_instruction: str = None,
+    conversation_id: str = None,
+    scheme_data: list[dict] = None
+) -> dict:
+    """
+    Builds the Claude Messages API request body for Bedrock.
+    Shared by generate_response and generate_response_stream.
+    scheme_data may be prefetched by the caller; otherwise it is the named
+    schemes plus the top retrieved ones for this message and farmer.
+    """
+    # Only the relevant schemes go into the prompt, however big the catalog is
+    if scheme_data is None:
+        scheme_data = prompt_schemes(message, scheme_ids, farmer)
+
+    # Use first matched scheme for farmer story context (if available)
+    primary_scheme = scheme_ids[0] if scheme_ids else None
+
+    # Build messages with primary scheme context
+    messages, dynamic_system = _build_bedrock_messages(
+        message,
+        conversation_history or [],
+        scheme_data,
+        farmer,
+        primary_scheme,
+        lang_instruction,
+        conversation_id
+    )
+
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 512,
+        "temperature": 0.7,
+        "system": _system_blocks(dynamic_system),
+        "messages": messages
+    }
+
+
+def _response_cache_key(
     message: str,
     scheme_ids: list[str],
     farmer: FarmerProfile,
     conversation_history: list[dict] = None,
     lang_instruction: str = None
+) -> tuple | None:
+    """
+    Response cache key for this turn, or None when caching is off.
+    A follow-up ("haan", "aur batao") means whatever Sahaya just asked, so it
+    is keyed on a fingerprint of her last reply; only a turn with no reply
+    before it stands on its own. The facets are every profile field the
+    prompt shows Bedrock except the name (templated) and phone number.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    last_reply = next((turn.get("content") for turn in reversed(conversation_history or [])
+                       if turn.get("role") == "assistant"), None)
+    context = "opening" if last_reply is None else _response_cache.context_fingerprint(last_reply, farmer.name)
+    facets = (" ".join(farmer.state.split()).lower(), farmer.land_acres, farmer.age, farmer.annual_income,
+              farmer.has_kcc, farmer.has_bank_account)
+    return _response_cache.make_key(message, lang_instruction, scheme_ids, context, facets)
+
+
+def _metric_labels(scheme_ids: list[str], lang_instruction: str, mode: str) -> dict:
+    """Metric tags: language (from the language instruction), model, primary scheme, sync/stream."""
+    match = _LANGUAGE_RE.search(lang_instruction or "")
+    return {
+        "language": match.group(1).lower() if match else "default",
+        "model": "mock" if USE_MOCK else BEDROCK_MODEL_ID,
+        "scheme": scheme_ids[0] if scheme_ids else "none",
+        "mode": mode,
+    }
+
+
+def _is_throttle(error: Exception) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code", "")
+    return code in _THROTTLE_CODES or any(c in str(error) for c in _THROTTLE_CODES)
+
+
+def _record_reply(labels: dict, started: float, usage: dict = None, outcome: str = "success",
+                  first_token_at: float = None):
+    _llm_requests.inc(outcome=outcome, **labels)
+    _llm_latency.observe(time.monotonic() - started, **labels)
+    if first_token_at is not None:
+        _llm_ttft.observe(first_token_at - started, **labels)
+    if usage:
+        _llm_turn_tokens.observe(usage["input_tokens"], type="input", **labels)
+        _llm_turn_tokens.observe(usage["output_tokens"], type="output", **labels)
+        for kind, field in (("input", "input_tokens"), ("output", "output_tokens"),
+                            ("cache_read", "cache_read_input_tokens"),
+                            ("cache_write", "cache_creation_input_tokens")):
+            if usage[field]:
+                _llm_tokens.inc(usage[field], type=kind, **labels)
+
+
+def _record_error(labels: dict, started: float, error: Exception):
+    outcome = "throttled" if _is_throttle(error) else "error"
+    _llm_requests.inc(outcome=outcome, **labels)
+    _llm_latency.observe(time.monotonic() - started, **labels)
+    _llm_errors.inc(error=type(error).__name__, **labels)
+
+
+def _cache_metric_lines() -> list[str]:
+    """Response/prompt/history cache counters, read at scrape time."""
+    caches = {}
+    for cache, values in cache_stats().items():
+        if "size" in values:
+            caches[cache] = values
+        else:  # the prompt builder reports two LRUs
+            caches.update({f"{cache}_{part}": v for part, v in values.items()})
+
+    lines = []
+    for metric, kind, field in (("voicebridge_cache_entries", "gauge", "size"),
+                                ("voicebridge_cache_hits_total", "counter", "hits"),
+                                ("voicebridge_cache_misses_total", "counter", "misses"),
+                                ("voicebridge_cache_evictions_total", "counter", "evictions")):
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(f'{metric}{{cache="{name}"}} {values[field]}' for name, values in caches.items())
+    return lines
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the response, system prompt and history summary caches."""
+    return {
+        "responses": _response_cache.stats(),
+        "prompts": _system_prompt_builder.stats(),
+        "history_summaries": _history_manager.stats(),
+    }
+
+
+REGISTRY.register_collector(_cache_metric_lines)
+
+
+def _finalize_response(message: str, scheme_ids: list[str], raw_response: str, mock: bool) -> dict:
+    """
+    Turns raw model (or mock) text into the response dict returned to routes.
+    Strips voice memory tags and applies goodbye detection.
+    """
+    # Extract clean text (remove tags if any)
+    clean_text, _ = _extract_voice_memory_tag(raw_response)
+    # Detect if user is saying goodbye FIRST
+    goodbye_result = _detect_goodbye_intent(message, clean_text)
+    is_goodbye = goodbye_result["is_goodbye"]
+    needs_confirmation = goodbye_result["needs_confirmation"]
+
+    # CRITICAL: Do NOT return voice clip if this is a goodbye message
+    if is_goodbye:
+        voice_clip = None
+        # Also clear matched_schemes so frontend doesn't fetch voice memory
+        final_schemes = []
+    else:
+        # Only get voice memory for scheme discussions (not goodbye)
+        voice_clip = get_voice_memory_clip(scheme_ids, message)
+        final_schemes = scheme_ids
+
+    return {
+        "success": True,
+        "response_text": clean_text,
+        "voice_memory_clip": voice_clip,
+        "matched_schemes": final_schemes,
+        "raw_response": raw_response,
+        "is_goodbye": is_goodbye,
+        "needs_confirmation": needs_confirmation,
+        "mock": mock
+    }
+
+
+def _error_response(scheme_ids: list[str], error: Exception) -> dict:
+    """On error, return mock confused response."""
+    return {
+        "success": False,
+        "response_text": MOCK_RESPONSES["confused"],
+        "voice_memory_clip": None,
+        "matched_schemes": scheme_ids,
+        "is_goodbye": False,
+        "error": str(error),
+        "mock": True
+    }
+
+
+def generate_response(
+    message: str,
+    scheme_ids: list[str],
+    farmer: FarmerProfile,
+    conversation_history: list[dict] = None,
+    lang_instruction: str = None,
+    conversation_id: str = None,
+    scheme_data: list[dict] = None
 ) -> dict:
     """
     Main function. Generates Sahaya's response.
     Returns dict with response_text, voice_memory_clip, matched_schemes, raw_response.
     Automatically selects farmer story for the first matched scheme if available.
+    conversation_id (optional) lets the summary of older turns be reused across the call.
+    scheme_data (optional) is the already-fetched data for scheme_ids.
     """
+    started = time.monotonic()
+    labels = _metric_labels(scheme_ids, lang_instruction, "sync")
     try:
         if USE_MOCK:
             # Mock path
             raw_response = _select_mock_response(message, scheme_ids)
-            clean_text, _ = _extract_voice_memory_tag(raw_response)
-            goodbye_result = _detect_goodbye_intent(message, clean_text)
-            is_goodbye = goodbye_result["is_goodbye"]
-            needs_confirmation = goodbye_result["needs_confirmation"]
-            
-            # CRITICAL: Do NOT return voice clip if this is a goodbye message
-            if is_goodbye:
-                voice_clip = None
-                # Also clear matched_schemes so frontend doesn't fetch voice memory
-                final_schemes = []
-            else:
-                voice_clip = get_voice_memory_clip(scheme_ids, message)
-                final_schemes = scheme_ids
-            
-            return {
-                "success": True,
-                "response_text": clean_text,
-                "voice_memory_clip": voice_clip,
-                "matched_schemes": final_schemes,
-                "raw_response": raw_response,
-                "is_goodbye": is_goodbye,
-                "needs_confirmation": needs_confirmation,
-                "mock": True
-            }
-        
+            result = _finalize_response(message, scheme_ids, raw_response, mock=True)
+            _record_reply(labels, started)
+            return result
+
         else:
+            # Repeated question: reuse the stored reply, no Bedrock call
+            cache_key = _response_cache_key(
+                message, scheme_ids, farmer, conversation_history, lang_instruction
+            )
+            cached = _response_cache.get(cache_key, farmer.name) if cache_key else None
+            if cached is not None:
+                result = _finalize_response(message, scheme_ids, cached, mock=False)
+                result["cached"] = True
+                _record_reply(labels, started, outcome="cached")
+                return result
+
             # AWS path - call Bedrock
-            client = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-            
-            # Get full scheme data for context
-            scheme_data = []
-            for scheme_id in scheme_ids:
-                scheme = get_scheme_by_id(scheme_id)
-                if scheme:
-                    scheme_data.append(scheme)
-            
-            # Use first matched scheme for farmer story context (if available)
-            primary_scheme = scheme_ids[0] if scheme_ids else None
-            
-            # Build messages with primary scheme context
-            messages, system_final = _build_bedrock_messages(
-                message,
-                conversation_history or [],
-                scheme_data,
-                farmer,
-                primary_scheme,
-                lang_instruction
+            client = get_client("bedrock-runtime")
+            request_body = _prepare_bedrock_request(
+                message, scheme_ids, farmer, conversation_history, lang_instruction,
+                conversation_id, scheme_data
             )
-            
-            # Call Bedrock with correct Claude Messages API format
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 512,
-                "temperature": 0.7,
-                "system": system_final,
-                "messages": messages
-            }
-            
+
             response = client.invoke_model(
                 modelId=BEDROCK_MODEL_ID,
-                body=json.dumps(request_body, cls=DecimalEncoder),
+                body=json.dumps(request_body),
                 contentType="application/json",
                 accept="application/json"
             )
-            
+
             # Parse response
             response_body = json.loads(response["body"].read())
             raw_response = response_body["content"][0]["text"]
-            
-            # Extract clean text (remove tags if any)
-            clean_text, _ = _extract_voice_memory_tag(raw_response)
-            # Detect if user is saying goodbye FIRST
-            goodbye_result = _detect_goodbye_intent(message, clean_text)
-            is_goodbye = goodbye_result["is_goodbye"]
-            needs_confirmation = goodbye_result["needs_confirmation"]
-            
-            # CRITICAL: Do NOT return voice clip if this is a goodbye message
-            if is_goodbye:
-                voice_clip = None
-                # Also clear matched_schemes so frontend doesn't fetch voice memory
-                final_schemes = []
-            else:
-                # Only get voice memory for scheme discussions (not goodbye)
-                voice_clip = get_voice_memory_clip(scheme_ids, message)
-                final_schemes = scheme_ids
-            
-            return {
-                "success": True,
-                "response_text": clean_text,
-                "voice_memory_clip": voice_clip,
-                "matched_schemes": final_schemes,
-                "raw_response": raw_response,
-                "is_goodbye": is_goodbye,
-                "needs_confirmation": needs_confirmation,
-                "mock": False
-            }
-    
+            result = _finalize_response(message, scheme_ids, raw_response, mock=False)
+            result["usage"] = _extract_usage(response_body.get("usage"))
+            _log_usage(result["usage"])
+            if cache_key:
+                _response_cache.put(cache_key, raw_response, farmer.name)
+            _record_reply(labels, started, result["usage"])
+            return result
+
+    except Exception as e:
+        _record_error(labels, started, e)
+        return _error_response(scheme_ids, e)
+
+
+def _sentence_event(index: int, sentence: str) -> dict | None:
+    """Builds a streamed sentence event. Returns None if nothing speakable is left."""
+    text, _ = _extract_voice_memory_tag(sentence)
+    if not text:
+        return None
+    return {"event": "sentence", "index": index, "text": text}
+
+
+def _replay_sentences(text: str):
+    """Sentence events for a reply that is already complete (mock or cached)."""
+    index = 0
+    for sentence in split_sentences(text):
+        event = _sentence_event(index, sentence)
+        if event:
+            yield event
+            index += 1
+
+
+def generate_response_stream(
+    message: str,
+    scheme_ids: list[str],
+    farmer: FarmerProfile,
+    conversation_history: list[dict] = None,
+    lang_instruction: str = None,
+    conversation_id: str = None,
+    scheme_data: list[dict] = None
+):
+    """
+    Streaming variant of generate_response built on the Bedrock response stream.
+    Yields {"event": "sentence", "index", "text"} as soon as each sentence is complete
+    (split on '।', '.', '?'), then a single {"event": "done", ...} carrying the same
+    fields generate_response returns.
+    """
+    index = 0
+    started = time.monotonic()
+    labels = _metric_labels(scheme_ids, lang_instruction, "stream")
+    try:
+        if USE_MOCK:
+            raw_response = _select_mock_response(message, scheme_ids)
+            yield from _replay_sentences(raw_response)
+            result = _finalize_response(message, scheme_ids, raw_response, mock=True)
+            _record_reply(labels, started)
+            yield {"event": "done", **result}
+            return
+
+        cache_key = _response_cache_key(
+            message, scheme_ids, farmer, conversation_history, lang_instruction
+        )
+        cached = _response_cache.get(cache_key, farmer.name) if cache_key else None
+        if cached is not None:
+            yield from _replay_sentences(cached)
+            result = _finalize_response(message, scheme_ids, cached, mock=False)
+            _record_reply(labels, started, outcome="cached")
+            yield {"event": "done", **result, "cached": True}
+            return
+
+        client = get_client("bedrock-runtime")
+        request_body = _prepare_bedrock_request(
+            message, scheme_ids, farmer, conversation_history, lang_instruction,
+            conversation_id, scheme_data
+        )
+
+        response = client.invoke_model_with_response_stream(
+            modelId=BEDROCK_MODEL_ID,
+            body=json.dumps(request_body),
+            contentType="application/json",
+            accept="application/json"
+        )
+
+        accumulator = SentenceAccumulator()
+        parts = []
+        usage = {}
+        first_token_at = None
+        for stream_event in response["body"]:
+            chunk = stream_event.get("chunk")
+            if not chunk:
+                continue
+            payload = json.loads(chunk["bytes"])
+            event_type = payload.get("type")
+            if event_type == "message_start":
+                # Input and prompt-cache token counts arrive up front
+                usage.update(payload.get("message", {}).get("usage", {}))
+                continue
+            if event_type == "message_delta":
+                usage.update(payload.get("usage", {}))
+                continue
+            if event_type != "content_block_delta":
+                continue
+            delta = payload.get("delta", {}).get("text", "")
+            if delta and first_token_at is None:
+                first_token_at = time.monotonic()
+            parts.append(delta)
+            for sentence in accumulator.feed(delta):
+                event = _sentence_event(index, sentence)
+                if event:
+                    yield event
+                    index += 1
+
+        for sentence in accumulator.flush():
+            event = _sentence_event(index, sentence)
+            if event:
+                yield event
+                index += 1
+
+        raw_response = "".join(parts)
+        result = _finalize_response(message, scheme_ids, raw_response, mock=False)
+        result["usage"] = _extract_usage(usage)
+        _log_usage(result["usage"])
+        if cache_key:
+            _response_cache.put(cache_key, raw_response, farmer.name)
+        _record_reply(labels, started, result["usage"], first_token_at=first_token_at)
+        yield {"event": "done", **result}
+
     except Exception as e:
-        # On error, return mock confused response
-        return {
-            "success": False,
-            "response_text": MOCK_RESPONSES["confused"],
-            "voice_memory_clip": None,
-            "matched_schemes": scheme_ids,
-            "is_goodbye": False,
-            "error": str(e),
-            "mock": True
-        }
+        _record_error(labels, started, e)
+        yield {"event": "done", **_error_response(scheme_ids, e)}
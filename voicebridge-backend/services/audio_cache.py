@@ -0,0 +1,215 @@
+"""
+VoiceBridge AI — TTS Audio Cache
+Content-addressed store for synthesized speech. Greetings, menus, document
+lists and goodbyes repeat thousands of times a day; each distinct utterance
+is synthesized and uploaded once, then served from S3.
+
+  key:   sha256 of (provider, normalized text, format, voice/engine/language...)
+  S3:    <TTS_CACHE_PREFIX><provider>/<key>.<format>
+  index: in-process set of keys known to be in S3, filled from one listing of
+         the prefix (in the background, on first use) and from our own
+         uploads, so a hit needs no HEAD request. Presigned URLs are reused
+         until shortly before they expire.
+
+Concurrent requests for the same missing key synthesize it once. With
+AUDIO_BASE_URL set, URLs point at /audio/<key> instead of S3 and new audio is
+also written to the local disk tier (services/audio_disk_cache.py), where the
+client's first request finds it; streamed hits fill the tier as they are read.
+"""
+
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Iterator
+from config.settings import (
+    S3_AUDIO_BUCKET,
+    TTS_CACHE_ENABLED,
+    TTS_CACHE_PREFIX,
+    TTS_CACHE_INDEX_SIZE,
+    TTS_URL_EXPIRY_SECONDS,
+)
+from services.audio_disk_cache import audio_url, disk_audio, iter_file
+from services.aws_clients import get_client
+from services.lru_cache import LRUCache
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Presigned URLs are handed out with at least this much validity left
+_URL_MARGIN_SECONDS = 300
+
+_requests = REGISTRY.counter(
+    "voicebridge_tts_cache_requests_total",
+    "TTS audio cache lookups by provider and outcome (hit, miss, error).",
+    ("provider", "outcome"),
+)
+
+
+def normalize_text(text: str) -> str:
+    """NFC, whitespace collapsed. Case is kept: engines read 'KCC' and 'kcc' differently."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def audio_key(provider: str, text: str, fmt: str, **params) -> str:
+    """Content address of one utterance: every input that changes the audio is in the hash."""
+    fields = [provider, normalize_text(text), fmt] + [f"{k}={params[k]}" for k in sorted(params)]
+    return hashlib.sha256("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+def tee(chunks: Iterator[bytes], on_complete) -> Iterator[bytes]:
+    """Yields chunks unchanged; on_complete(all bytes) runs only if the stream was read to the end."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    on_complete(b"".join(parts))
+
+
+class AudioCache:
+    """S3-backed TTS cache with an in-process index of known objects."""
+
+    def __init__(self, bucket: str = S3_AUDIO_BUCKET, prefix: str = TTS_CACHE_PREFIX,
+                 max_keys: int = TTS_CACHE_INDEX_SIZE, url_expiry: int = TTS_URL_EXPIRY_SECONDS):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_keys = max_keys
+        self.url_expiry = url_expiry
+        self._known = LRUCache(maxsize=max_keys)
+        self._urls = LRUCache(maxsize=max_keys, ttl_seconds=max(1, url_expiry - _URL_MARGIN_SECONDS))
+        self._inflight: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.index_loader = None
+
+    def object_key(self, provider: str, key: str, fmt: str) -> str:
+        return f"{self.prefix}{provider}/{key}.{fmt}"
+
+    # ── Index ──
+
+    def _ensure_index(self):
+        """Lists the prefix once per process, in the background."""
+        if self.index_loader is not None:
+            return
+        with self._lock:
+            if self.index_loader is None:
+                self.index_loader = threading.Thread(target=self._load_index, name="tts-cache-index",
+                                                     daemon=True)
+                self.index_loader.start()
+
+    def _load_index(self):
+        try:
+            paginator = get_client("s3").get_paginator("list_objects_v2")
+            count = 0
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+                for obj in page.get("Contents", []):
+                    self._known.set(obj["Key"], True)
+                    count += 1
+                    if count >= self.max_keys:
+                        return
+            logger.info(f"[TTS CACHE] Indexed {count} cached utterances")
+        except Exception as e:
+            logger.warning(f"[TTS CACHE] Index listing failed (cache still fills from uploads): {e}")
+
+    def known(self, object_key: str) -> bool:
+        return self._known.get(object_key) is not None
+
+    # ── Lookup / store ──
+
+    def _presign(self, object_key: str) -> str:
+        return self._urls.get_or_create(object_key, lambda: get_client("s3").generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": object_key}, ExpiresIn=self.url_expiry
+        ))
+
+    def _url(self, object_key: str) -> str:
+        """/audio/<key> through the disk tier when AUDIO_BASE_URL is set, else presigned S3."""
+        return audio_url(object_key) or self._presign(object_key)
+
+    def fetch(self, provider: str, key: str, fmt: str, synthesize, content_type: str) -> tuple[str, bool]:
+        """
+        URL of the cached utterance, synthesizing and uploading it on a miss.
+        synthesize() returns the audio bytes. Returns (url, hit).
+        """
+        object_key = self.object_key(provider, key, fmt)
+        if not TTS_CACHE_ENABLED:
+            return self._upload(object_key, synthesize(), content_type), False
+        self._ensure_index()
+        if self.known(object_key):
+            _requests.inc(provider=provider, outcome="hit")
+            return self._url(object_key), True
+
+        with self._lock:
+            inflight = self._inflight.setdefault(object_key, threading.Lock())
+        with inflight:
+            try:
+                # Someone else may have uploaded it while we waited
+                if self.known(object_key):
+                    _requests.inc(provider=provider, outcome="hit")
+                    return self._url(object_key), True
+                try:
+                    audio = synthesize()
+                except Exception:
+                    _requests.inc(provider=provider, outcome="error")
+                    raise
+                _requests.inc(provider=provider, outcome="miss")
+                return self._upload(object_key, audio, content_type), False
+            finally:
+                with self._lock:
+                    self._inflight.pop(object_key, None)
+
+    def cached_url(self, provider: str, key: str, fmt: str) -> str | None:
+        """URL of the utterance if it is already cached, else None. Never synthesizes."""
+        if not TTS_CACHE_ENABLED:
+            return None
+        object_key = self.object_key(provider, key, fmt)
+        self._ensure_index()
+        if not self.known(object_key):
+            return None
+        _requests.inc(provider=provider, outcome="hit")
+        return self._url(object_key)
+
+    def _upload(self, object_key: str, audio: bytes, content_type: str) -> str:
+        get_client("s3").put_object(Bucket=self.bucket, Key=object_key, Body=audio, ContentType=content_type)
+        self._known.set(object_key, True)
+        url = audio_url(object_key)
+        if url is None:
+            return self._presign(object_key)
+        # The client fetches it from this host next
+        disk_audio.put(object_key, audio, content_type)
+        return url
+
+    # ── Streaming ──
+
+    def open(self, provider: str, key: str, fmt: str, chunk_size: int = 4096) -> Iterator[bytes] | None:
+        """
+        Byte chunks of a cached utterance, from the local disk tier or else S3
+        (copied to disk once fully read). None on a miss.
+        """
+        if not TTS_CACHE_ENABLED:
+            return None
+        object_key = self.object_key(provider, key, fmt)
+        found = disk_audio.get(object_key)
+        if found is not None:
+            _requests.inc(provider=provider, outcome="hit")
+            return iter_file(found[0], chunk_size)
+        self._ensure_index()
+        if not self.known(object_key):
+            _requests.inc(provider=provider, outcome="miss")
+            return None
+        obj = get_client("s3").get_object(Bucket=self.bucket, Key=object_key)
+        _requests.inc(provider=provider, outcome="hit")
+        return tee(obj["Body"].iter_chunks(chunk_size),
+                   lambda audio: disk_audio.put(object_key, audio, obj.get("ContentType")))
+
+    def store(self, provider: str, key: str, fmt: str, audio: bytes, content_type: str):
+        """Stores audio produced outside fetch() (e.g. streamed straight to a client)."""
+        if TTS_CACHE_ENABLED:
+            object_key = self.object_key(provider, key, fmt)
+            if not self.known(object_key):
+                self._upload(object_key, audio, content_type)
+
+    def stats(self) -> dict:
+        return {"known": len(self._known), "urls": self._urls.stats()}
+
+
+# Process-wide cache used by tts_service
+tts_cache = AudioCache()
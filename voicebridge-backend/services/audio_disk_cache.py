@@ -0,0 +1,252 @@
+"""
+VoiceBridge AI — Local Audio Disk Tier
+Byte-bounded LRU of audio files on local disk, in front of S3 (or, in mock
+mode, data/voice_memory/). On a warm Lambda (/tmp) or a long-running Flask
+host, repeated requests for the same TTS output or Voice Memory clip are
+served from disk instead of going back to the origin.
+
+  files:   <dir>/<sha1(key)><ext>, written to a temp file and renamed into place
+  sidecar: <dir>/index.json, {key: [file, size, content_type, last_used]},
+           rewritten atomically after every store/eviction so a restarted
+           process keeps its warm files
+  evicts:  least recently used first, until the total size fits max_bytes
+
+/audio/<key> reads through it. In AWS mode voice memory clips and cached TTS
+are handed out as /audio/<key> URLs when AUDIO_BASE_URL is set (audio_url);
+without it clients get presigned S3 URLs and only streamed TTS cache hits use
+this tier.
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator
+from urllib.parse import quote
+from config.settings import (
+    USE_MOCK,
+    S3_AUDIO_BUCKET,
+    AUDIO_DISK_CACHE_DIR,
+    AUDIO_DISK_CACHE_MB,
+    AUDIO_BASE_URL,
+    TTS_CACHE_PREFIX,
+)
+from services.aws_clients import get_client
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+MOCK_AUDIO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "voice_memory")
+# S3 prefixes the audio route may read through (never the whole bucket)
+SERVABLE_PREFIXES = (TTS_CACHE_PREFIX, "voice_memory/")
+
+_requests = REGISTRY.counter(
+    "voicebridge_audio_disk_requests_total",
+    "Local audio disk tier lookups by outcome (hit, miss).",
+    ("outcome",),
+)
+_bytes_saved = REGISTRY.counter(
+    "voicebridge_audio_disk_bytes_saved_total",
+    "Audio bytes served from local disk instead of the origin.",
+)
+
+
+# mimetypes calls .mpeg video; every file here is audio
+_AUDIO_TYPES = {".mp3": "audio/mpeg", ".mpeg": "audio/mpeg", ".wav": "audio/wav", ".ogg": "audio/ogg",
+                ".opus": "audio/ogg"}
+
+
+def content_type_for(key: str) -> str:
+    """MIME type from the key's extension; Voice Memory clips end in .mp3.mpeg."""
+    known = _AUDIO_TYPES.get(os.path.splitext(key)[1].lower())
+    return known or mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+def iter_file(path: str, chunk_size: int = 4096) -> Iterator[bytes]:
+    """
+    Chunks of a file. It is opened right away, so it stays readable if the
+    tier evicts it while it is being streamed.
+    """
+    f = open(path, "rb")
+
+    def chunks():
+        with f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+    return chunks()
+
+
+def audio_url(key: str) -> str | None:
+    """Public URL serving key through /audio/<key> (and this tier); None without AUDIO_BASE_URL."""
+    return f"{AUDIO_BASE_URL}/audio/{quote(key)}" if AUDIO_BASE_URL else None
+
+
+def fetch_origin(key: str) -> tuple[bytes, str] | None:
+    """
+    (bytes, content type) of key from the origin: data/voice_memory/ in mock
+    mode, else the audio bucket under SERVABLE_PREFIXES. None when absent.
+    """
+    if USE_MOCK:
+        path = os.path.normpath(os.path.join(MOCK_AUDIO_DIR, key))
+        if not path.startswith(MOCK_AUDIO_DIR + os.sep) or not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read(), content_type_for(key)
+    if ".." in key.split("/") or not key.startswith(SERVABLE_PREFIXES):
+        return None
+    try:
+        obj = get_client("s3").get_object(Bucket=S3_AUDIO_BUCKET, Key=key)
+    except Exception as e:
+        logger.info(f"[AUDIO DISK] Origin miss for {key}: {e}")
+        return None
+    return obj["Body"].read(), obj.get("ContentType") or content_type_for(key)
+
+
+class DiskAudioCache:
+    """Size-bounded LRU of files under one directory. Thread-safe."""
+
+    def __init__(self, directory: str = AUDIO_DISK_CACHE_DIR, max_bytes: int = AUDIO_DISK_CACHE_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        # key -> [file name, size, content_type, last_used], least recent first
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.max_bytes > 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # ── Sidecar index ──
+
+    def _load(self):
+        """Reads the sidecar once, keeping only entries whose file is still there."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(INDEX_FILE), encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, (name, size, content_type, last_used) in sorted(stored.items(), key=lambda item: item[1][3]):
+            if os.path.exists(self._path(name)):
+                self._entries[key] = [name, size, content_type, last_used]
+                self._bytes += size
+        self._evict()
+
+    def _save(self):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(dict(self._entries), f, separators=(",", ":"))
+            os.replace(tmp, self._path(INDEX_FILE))
+        except OSError as e:
+            logger.warning(f"[AUDIO DISK] Could not write index: {e}")
+
+    def _evict(self) -> bool:
+        evicted = False
+        while self._bytes > self.max_bytes and self._entries:
+            _, (name, size, _, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            evicted = True
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+        return evicted
+
+    # ── Lookup / store ──
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        """(file path, content type) when key is on disk, refreshing its recency."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is not None and not os.path.exists(self._path(entry[0])):
+                # Removed behind our back (another worker evicted it, /tmp cleaned)
+                del self._entries[key]
+                self._bytes -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                _requests.inc(outcome="miss")
+                return None
+            entry[3] = time.time()
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_saved += entry[1]
+        _requests.inc(outcome="hit")
+        _bytes_saved.inc(entry[1])
+        return self._path(entry[0]), entry[2]
+
+    def put(self, key: str, data: bytes, content_type: str = None) -> str | None:
+        """Stores data under key and returns its path (None when it cannot be kept)."""
+        if not self.enabled or len(data) > self.max_bytes:
+            return None
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + os.path.splitext(key)[1]
+        content_type = content_type or content_type_for(key)
+        with self._lock:
+            self._load()
+            try:
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self._path(name))
+            except OSError as e:
+                logger.warning(f"[AUDIO DISK] Could not store {key}: {e}")
+                return None
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = [name, len(data), content_type, time.time()]
+            self._bytes += len(data)
+            self._evict()
+            self._save()
+            return self._path(name)
+
+    def clear(self):
+        with self._lock:
+            self._load()
+            for name, *_ in self._entries.values():
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._bytes = 0
+            self._save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "evictions": self.evictions,
+            }
+
+
+# Process-wide tier used by serve_audio and the TTS cache
+disk_audio = DiskAudioCache()
@@ -0,0 +1,174 @@
+"""
+VoiceBridge AI — Audio Transcoder
+Compresses Sarvam's PCM WAV for farmers on 2G/3G links: mono, low-bitrate
+MP3 or Opus tuned for speech, encoded by ffmpeg. A 22.05 kHz 16-bit WAV is
+~44 KB per second of speech; 32 kbit/s MP3 is 4 KB and 24 kbit/s Opus 3 KB.
+
+  transcode():        whole clip in, encoded bytes out (for the S3 cache)
+  stream_transcode(): streaming encoder; encoded chunks are yielded while
+                      ffmpeg is still reading its input
+
+ffmpeg runs as a subprocess, so encoding never holds the GIL, and each
+utterance is encoded once, off the request thread (the result is what the
+TTS cache stores). On Lambda, ffmpeg comes from a layer at AUDIO_FFMPEG_PATH.
+
+negotiate() picks the format: an explicit format parameter wins, then the
+Accept header, then SARVAM_AUDIO_FORMAT. Without ffmpeg everything is WAV.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from typing import Iterator
+from config.settings import SARVAM_AUDIO_FORMAT, AUDIO_FFMPEG_PATH
+
+logger = logging.getLogger(__name__)
+
+# Output format -> (content type, ffmpeg output options). Input is always WAV.
+FORMATS = {
+    "mp3": ("audio/mpeg", ["-ac", "1", "-ar", "22050", "-codec:a", "libmp3lame", "-b:a", "32k", "-f", "mp3"]),
+    # Opus only takes 8/12/16/24/48 kHz; "voip" tunes the encoder for speech
+    "opus": ("audio/ogg", ["-ac", "1", "-ar", "24000", "-codec:a", "libopus", "-b:a", "24k",
+                           "-application", "voip", "-f", "ogg"]),
+    "wav": ("audio/wav", None),
+}
+# Accept header media types we can serve
+_ACCEPT_TYPES = {
+    "audio/ogg": "opus", "audio/opus": "opus",
+    "audio/mpeg": "mp3", "audio/mp3": "mp3",
+    "audio/wav": "wav", "audio/x-wav": "wav", "audio/wave": "wav",
+}
+_TRANSCODE_TIMEOUT_SECONDS = 20
+_CHUNK_BYTES = 4096
+
+_ffmpeg = None
+
+
+class TranscodeError(RuntimeError):
+    """ffmpeg is missing or failed; callers fall back to WAV."""
+
+
+def ffmpeg_path() -> str | None:
+    """AUDIO_FFMPEG_PATH, else ffmpeg on PATH. Looked up once per process."""
+    global _ffmpeg
+    if _ffmpeg is None:
+        _ffmpeg = AUDIO_FFMPEG_PATH or shutil.which("ffmpeg") or ""
+        if _ffmpeg and not os.access(_ffmpeg, os.X_OK):
+            logger.error(f"[TRANSCODE] AUDIO_FFMPEG_PATH {_ffmpeg} is not an executable (ffmpeg layer missing?)")
+            _ffmpeg = ""
+        if not _ffmpeg:
+            logger.warning("[TRANSCODE] ffmpeg not found; regional audio is served as WAV")
+    return _ffmpeg or None
+
+
+def available(fmt: str) -> bool:
+    return fmt == "wav" or (fmt in FORMATS and ffmpeg_path() is not None)
+
+
+def content_type(fmt: str) -> str:
+    return FORMATS[fmt][0]
+
+
+def _parse_accept(accept: str) -> list[str]:
+    """Media types from an Accept header, highest q first (ties keep header order)."""
+    ranked = []
+    for position, item in enumerate((accept or "").split(",")):
+        media, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media and quality > 0:
+            ranked.append((-quality, position, media.lower()))
+    return [media for _, _, media in sorted(ranked)]
+
+
+def negotiate(requested: str = None, accept: str = None) -> str:
+    """
+    Output format for a request. requested is an explicit format parameter
+    (mp3 | opus | wav); accept is the Accept header, of which only audio
+    types are considered. Anything we cannot encode falls back to WAV.
+    """
+    if requested:
+        requested = requested.strip().lower()
+        if requested in FORMATS:
+            return requested if available(requested) else "wav"
+    default = SARVAM_AUDIO_FORMAT if SARVAM_AUDIO_FORMAT in FORMATS else "mp3"
+    for media in _parse_accept(accept):
+        fmt = default if media in ("audio/*", "*/*") else _ACCEPT_TYPES.get(media)
+        if fmt and available(fmt):
+            return fmt
+    return default if available(default) else "wav"
+
+
+def _command(fmt: str) -> list[str]:
+    path = ffmpeg_path()
+    if path is None or fmt not in FORMATS:
+        raise TranscodeError(f"Cannot encode {fmt}")
+    return [path, "-hide_banner", "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+            *FORMATS[fmt][1], "pipe:1"]
+
+
+def transcode(wav: bytes, fmt: str) -> bytes:
+    """WAV bytes encoded as fmt. Raises TranscodeError."""
+    if fmt == "wav":
+        return wav
+    try:
+        done = subprocess.run(_command(fmt), input=wav, capture_output=True,
+                              timeout=_TRANSCODE_TIMEOUT_SECONDS, check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        raise TranscodeError(f"ffmpeg {fmt} failed: {e} {stderr.decode(errors='replace')[:200]}") from e
+    if not done.stdout:
+        raise TranscodeError(f"ffmpeg produced no {fmt} output")
+    return done.stdout
+
+
+def stream_transcode(chunks: Iterator[bytes], fmt: str) -> Iterator[bytes]:
+    """
+    Streaming encoder: WAV chunks in, encoded chunks out as ffmpeg produces
+    them. Input is fed from a helper thread. The process is started right
+    away, so a missing ffmpeg raises TranscodeError here, not mid-stream.
+    """
+    if fmt == "wav":
+        return iter(chunks)
+    try:
+        process = subprocess.Popen(_command(fmt), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL)
+    except OSError as e:
+        raise TranscodeError(f"ffmpeg {fmt} failed to start: {e}") from e
+
+    def feed():
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except (OSError, ValueError):
+            pass  # ffmpeg exited (killed on client disconnect, or failed)
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def encoded():
+        feeder = threading.Thread(target=feed, name="transcode-feed", daemon=True)
+        feeder.start()
+        try:
+            while chunk := os.read(process.stdout.fileno(), _CHUNK_BYTES):
+                yield chunk
+            if process.wait(timeout=_TRANSCODE_TIMEOUT_SECONDS) != 0:
+                # Raising keeps a truncated stream out of the cache
+                raise TranscodeError(f"ffmpeg {fmt} exited with {process.returncode} mid-stream")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            feeder.join(timeout=1)
+
+    return encoded()
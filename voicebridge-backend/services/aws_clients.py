@@ -0,0 +1,84 @@
+"""
+VoiceBridge AI — Shared AWS Clients
+One boto3 client per (service, region) per process, created lazily on first use.
+Every service imports clients from here instead of calling boto3.client() per request.
+
+Clients share a tuned connection pool (keep-alive, so warm Lambdas reuse TLS
+connections) and use botocore's adaptive retry mode to back off on throttling.
+"""
+
+import threading
+from config.settings import (
+    AWS_REGION,
+    AWS_MAX_POOL_CONNECTIONS,
+    AWS_MAX_ATTEMPTS,
+    AWS_CONNECT_TIMEOUT,
+    AWS_READ_TIMEOUT,
+)
+
+_lock = threading.Lock()
+_clients: dict[tuple[str, str], object] = {}
+
+# boto3 resources are NOT thread-safe, so each thread keeps its own
+_local = threading.local()
+
+
+def _client_config():
+    """botocore Config shared by every client and resource."""
+    from botocore.config import Config
+    return Config(
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        retries={"mode": "adaptive", "max_attempts": AWS_MAX_ATTEMPTS},
+        tcp_keepalive=True,
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+    )
+
+
+def get_client(service_name: str, region_name: str = None):
+    """
+    Returns the process-wide boto3 client for a service.
+    Safe to call from any thread; boto3 clients are thread-safe once created.
+    """
+    key = (service_name, region_name or AWS_REGION)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        # Another thread may have created it while we waited
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+            client = boto3.session.Session().client(
+                service_name, region_name=key[1], config=_client_config()
+            )
+            _clients[key] = client
+    return client
+
+
+def get_resource(service_name: str, region_name: str = None):
+    """
+    Returns a boto3 resource (e.g. dynamodb) cached per thread.
+    Resources reuse the same pool/retry configuration as clients.
+    """
+    key = (service_name, region_name or AWS_REGION)
+    resources = getattr(_local, "resources", None)
+    if resources is None:
+        resources = _local.resources = {}
+
+    resource = resources.get(key)
+    if resource is None:
+        import boto3
+        resource = boto3.session.Session().resource(
+            service_name, region_name=key[1], config=_client_config()
+        )
+        resources[key] = resource
+    return resource
+
+
+def reset_clients():
+    """Drops cached clients and this thread's resources (tests, credential rotation)."""
+    with _lock:
+        _clients.clear()
+    _local.resources = {}
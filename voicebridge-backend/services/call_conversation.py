@@ -131,11 +131,18 @@ def get_ai_scheme_explanation(farmer_name, scheme_id,
     """
     Get Bedrock AI explanation of scheme for this specific farmer.
     Short, personalised, in Hindi. Under 50 words.
+    Uses the pre-generated campaign intro when there is one.
     Falls back to template if Bedrock fails.
     """
     scheme = get_scheme_details_for_call(scheme_id)
     
     try:
+        # Campaign intros are pre-generated; use one if this farmer was batched
+        from services.intro_batch import get_intro
+        pregenerated = get_intro(farmer_name, scheme_id, land_acres, has_kcc)
+        if pregenerated:
+            return pregenerated
+
         from models.farmer import FarmerProfile
         from services.ai_service import generate_response
         
@@ -0,0 +1,64 @@
+"""
+VoiceBridge AI — Catalog Bundle
+Deploy-time snapshot of the compiled scheme catalog: the schemes, their
+eligibility rules, the keyword index automaton and the SMS blocks, written
+with marshal so a cold Lambda can load it without boto3, a DynamoDB scan or
+recompiling anything. Built by scripts/build_catalog_bundle.py.
+
+The bundle records where it came from ('json' + file SHA-1, or 'dynamodb' +
+the catalog meta version) so the catalog can check it against the live
+source and fall back to a normal load when it is stale.
+"""
+
+import hashlib
+import logging
+import marshal
+import time
+from pathlib import Path
+from services.scheme_store import normalize_item, normalize_value
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 2
+
+
+def file_sha1(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def write_bundle(path, *, source: str, version, schemes: list[dict], rules: list[tuple],
+                 index_state: tuple, sms: dict) -> int:
+    """Writes the bundle atomically. Returns its size in bytes."""
+    data = marshal.dumps({
+        "format": BUNDLE_FORMAT,
+        "source": source,
+        "version": normalize_value(version),
+        "built_at": time.time(),
+        "schemes": [normalize_item(scheme) for scheme in schemes],
+        "rules": rules,
+        "index": index_state,
+        "sms": sms,
+    })
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return len(data)
+
+
+def read_bundle(path) -> dict | None:
+    """The bundle at path, or None if it is missing, unreadable or another format."""
+    try:
+        # loads(read()) rather than load(f): load() reads a file object piecewise
+        with open(path, "rb") as f:
+            bundle = marshal.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[CATALOG] Ignoring unreadable bundle {path}: {e}")
+        return None
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT:
+        logger.warning(f"[CATALOG] Ignoring bundle {path}: unsupported format")
+        return None
+    return bundle
@@ -0,0 +1,250 @@
+"""
+VoiceBridge AI — Eligibility Engine
+Declarative eligibility rules compiled from the structured fields in
+schemes.json (min_land_acres, requires_kcc, requires_bank_account,
+income_limit), evaluated either for one FarmerProfile or for whole farmer
+registries at once with NumPy boolean masks over columnar arrays.
+
+Failed rules are kept as a bitmask per (farmer, scheme), so the engine can
+say why a farmer is not eligible without storing strings per row.
+
+NumPy (and pyarrow, for Parquet) are imported lazily: the single-farmer path
+used by the API and call flow does not need them.
+"""
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+
+# Failure bits
+FAIL_LAND = 1
+FAIL_KCC = 2
+FAIL_BANK = 4
+FAIL_INCOME = 8
+
+REASON_CODES = {
+    FAIL_LAND: "land_below_minimum",
+    FAIL_KCC: "no_kcc",
+    FAIL_BANK: "no_bank_account",
+    FAIL_INCOME: "income_above_limit",
+}
+
+# Farmer columns the rules read, with FarmerProfile's defaults for missing values
+COLUMN_DEFAULTS = {
+    "land_acres": 0.0,
+    "has_kcc": False,
+    "has_bank_account": True,
+    "annual_income": 0.0,
+    "age": 0,
+}
+_BOOL_COLUMNS = ("has_kcc", "has_bank_account")
+_TRUE_STRINGS = ("true", "1", "yes", "y")
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def describe_failures(bits: int) -> list[str]:
+    """Reason codes for a failure bitmask, e.g. 5 -> ['land_below_minimum', 'no_bank_account']."""
+    return [code for bit, code in REASON_CODES.items() if bits & bit]
+
+
+@dataclass(frozen=True)
+class SchemeRule:
+    """Eligibility requirements of one scheme. 0 means no minimum/limit."""
+    scheme_id: str
+    min_land_acres: float = 0.0
+    requires_kcc: bool = False
+    requires_bank_account: bool = False
+    income_limit: float = 0.0
+
+    @classmethod
+    def from_scheme(cls, scheme: dict) -> "SchemeRule":
+        """Compiles a schemes.json / DynamoDB item (numbers may be Decimal)."""
+        return cls(
+            scheme_id=scheme["scheme_id"],
+            min_land_acres=float(scheme.get("min_land_acres") or 0),
+            requires_kcc=_truthy(scheme.get("requires_kcc", False)),
+            requires_bank_account=_truthy(scheme.get("requires_bank_account", False)),
+            income_limit=float(scheme.get("income_limit") or 0),
+        )
+
+    @property
+    def requirements(self) -> tuple:
+        return (self.min_land_acres, self.requires_kcc, self.requires_bank_account, self.income_limit)
+
+    def failures(self, farmer) -> int:
+        """Failure bitmask for one FarmerProfile (0 = eligible)."""
+        bits = 0
+        if self.min_land_acres and farmer.land_acres < self.min_land_acres:
+            bits |= FAIL_LAND
+        if self.requires_kcc and not farmer.has_kcc:
+            bits |= FAIL_KCC
+        if self.requires_bank_account and not farmer.has_bank_account:
+            bits |= FAIL_BANK
+        if self.income_limit and farmer.annual_income > self.income_limit:
+            bits |= FAIL_INCOME
+        return bits
+
+
+def compile_rules(schemes: list[dict]) -> list[SchemeRule]:
+    return [SchemeRule.from_scheme(scheme) for scheme in schemes]
+
+
+class FarmerTable:
+    """
+    Columnar farmer registry: one NumPy array per column in COLUMN_DEFAULTS,
+    plus an optional ids array (phone number, registry id, ...) for output.
+    """
+
+    def __init__(self, columns: dict, ids=None):
+        import numpy as np
+
+        lengths = {len(values) for values in columns.values()}
+        if ids is not None:
+            lengths.add(len(ids))
+        if len(lengths) > 1:
+            raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+        size = lengths.pop() if lengths else 0
+
+        self.columns = {}
+        for name, default in COLUMN_DEFAULTS.items():
+            values = columns.get(name)
+            dtype = bool if name in _BOOL_COLUMNS else np.float64
+            if values is None:
+                self.columns[name] = np.full(size, default, dtype=dtype)
+            else:
+                self.columns[name] = np.asarray(values, dtype=dtype)
+        self.ids = None if ids is None else np.asarray(ids)
+
+    def __len__(self) -> int:
+        return len(self.columns["land_acres"])
+
+    @classmethod
+    def from_records(cls, records: list[dict], id_field: str = None) -> "FarmerTable":
+        """From FarmerProfile-style dicts (API payloads, DynamoDB items)."""
+        columns = {}
+        for name, default in COLUMN_DEFAULTS.items():
+            if name in _BOOL_COLUMNS:
+                columns[name] = [_truthy(r.get(name, default)) for r in records]
+            else:
+                columns[name] = [float(r.get(name) or default) for r in records]
+        ids = [r.get(id_field) for r in records] if id_field else None
+        return cls(columns, ids)
+
+    @classmethod
+    def from_csv(cls, path, id_field: str = None) -> "FarmerTable":
+        """
+        From a CSV registry export with a header row. Unknown columns are
+        ignored; empty cells take FarmerProfile's defaults. Booleans accept
+        true/1/yes/y (any case).
+        """
+        import numpy as np
+
+        with open(Path(path), newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader, [])]
+            rows = list(reader)
+        index = {name: i for i, name in enumerate(header)}
+
+        def column(name):
+            i = index[name]
+            return np.array([row[i].strip() if i < len(row) else "" for row in rows], dtype=str)
+
+        columns = {}
+        for name, default in COLUMN_DEFAULTS.items():
+            if name not in index:
+                continue
+            raw = column(name)
+            empty = raw == ""
+            if name in _BOOL_COLUMNS:
+                values = np.isin(np.char.lower(raw), _TRUE_STRINGS)
+                columns[name] = np.where(empty, default, values)
+            else:
+                columns[name] = np.where(empty, str(default), raw).astype(np.float64)
+        ids = column(id_field) if id_field and id_field in index else None
+        if not columns and ids is None:
+            columns = {"land_acres": np.zeros(len(rows))}
+        return cls(columns, ids)
+
+    @classmethod
+    def from_parquet(cls, path, id_field: str = None) -> "FarmerTable":
+        """From a Parquet file (or dataset directory). Needs pyarrow."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet registries needs pyarrow (pip install pyarrow).")
+        names = [name for name in (*COLUMN_DEFAULTS, id_field) if name]
+        available = set(pq.read_schema(path).names)
+        table = pq.read_table(path, columns=[name for name in names if name in available])
+        columns = {name: table.column(name).to_numpy(zero_copy_only=False)
+                   for name in COLUMN_DEFAULTS if name in available}
+        ids = table.column(id_field).to_numpy(zero_copy_only=False) if id_field in available else None
+        return cls(columns, ids)
+
+
+class EligibilityResult:
+    """
+    eligible: (farmers x schemes) bool matrix
+    failures: (farmers x schemes) uint8 failure bitmasks (0 where eligible)
+    """
+
+    def __init__(self, scheme_ids: list[str], failures, ids=None):
+        self.scheme_ids = list(scheme_ids)
+        self.failures = failures
+        self.eligible = failures == 0
+        self.ids = ids
+        self._column = {scheme_id: j for j, scheme_id in enumerate(self.scheme_ids)}
+
+    def counts(self) -> dict[str, int]:
+        """Eligible farmers per scheme."""
+        totals = self.eligible.sum(axis=0)
+        return {scheme_id: int(totals[j]) for j, scheme_id in enumerate(self.scheme_ids)}
+
+    def targets(self, scheme_id: str):
+        """Row indices of farmers eligible for scheme_id (ids instead, when the table has them)."""
+        import numpy as np
+
+        rows = np.flatnonzero(self.eligible[:, self._column[scheme_id]])
+        return rows if self.ids is None else self.ids[rows]
+
+    def reasons(self, row: int, scheme_id: str) -> list[str]:
+        """Why farmer `row` is not eligible for scheme_id ([] when eligible)."""
+        return describe_failures(int(self.failures[row, self._column[scheme_id]]))
+
+    def failure_counts(self, scheme_id: str) -> dict[str, int]:
+        """How many farmers fail each requirement of scheme_id."""
+        column = self.failures[:, self._column[scheme_id]]
+        return {code: int(((column & bit) != 0).sum()) for bit, code in REASON_CODES.items()}
+
+
+def evaluate(table: FarmerTable, rules: list[SchemeRule]) -> EligibilityResult:
+    """
+    Evaluates every rule for every farmer in table. Schemes with identical
+    requirements share one computed column.
+    """
+    import numpy as np
+
+    cols = table.columns
+    failures = np.zeros((len(table), len(rules)), dtype=np.uint8)
+    computed = {}
+    for j, rule in enumerate(rules):
+        key = rule.requirements
+        if key not in computed:
+            bits = np.zeros(len(table), dtype=np.uint8)
+            if rule.min_land_acres:
+                bits |= (cols["land_acres"] < rule.min_land_acres).astype(np.uint8) * FAIL_LAND
+            if rule.requires_kcc:
+                bits |= (~cols["has_kcc"]).astype(np.uint8) * FAIL_KCC
+            if rule.requires_bank_account:
+                bits |= (~cols["has_bank_account"]).astype(np.uint8) * FAIL_BANK
+            if rule.income_limit:
+                bits |= (cols["annual_income"] > rule.income_limit).astype(np.uint8) * FAIL_INCOME
+            computed[key] = j
+            failures[:, j] = bits
+        else:
+            failures[:, j] = failures[:, computed[key]]
+    return EligibilityResult([rule.scheme_id for rule in rules], failures, table.ids)
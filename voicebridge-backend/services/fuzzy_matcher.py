@@ -0,0 +1,286 @@
+"""
+VoiceBridge AI — Fuzzy Scheme Matcher
+Resolves misheard scheme names in noisy speech-to-text transcripts
+("pihem kisan", "piem ef bi", "केसीसी", split Malayalam "കെ സി സി").
+
+Every alias is reduced to a phonetic key shared by all supported scripts:
+  1. Indic letters are romanized from their Unicode names (the Devanagari,
+     Tamil, Telugu, Kannada and Malayalam blocks share one layout)
+  2. Acronyms are spelled out as they are spoken ("kcc" -> "ke si si")
+  3. Sounds STT confuses are merged (b/p, g/k, d/t, aspirates, sibilants),
+     doubled letters collapse and vowels are dropped
+so "pm kisan", "pihem kisan" and "पी एम किसान" share the key "pmksn".
+Near keys score 1 - edits / length, allowing 1 edit below 6 letters and 2
+from 6 up; anything further apart does not match. Fuzzy confidence is capped
+at MAX_CONFIDENCE, below an exact keyword hit.
+
+Short keys collide with everyday words ("kisan", "kisaan" and "kasne" are all
+"ksn" once vowels go), so keys under five letters are left to the exact
+keyword index. A spelled acronym ("kay see see") is the exception: it
+only matches a run of one-letter words, one per letter.
+
+Keys are indexed by character bigrams. A message is matched window by
+window (1-3 consecutive words), each window only against aliases sharing
+enough bigrams with it to be within the allowed edits, and scored by a banded
+edit distance between keys. A window never spans more words than the alias
+is spoken with, so two common words are not read as a one-word alias. Work
+per message is bounded by FUZZY_MAX_WORDS and the candidates per window;
+at the default 16 words a cold match of the full catalog takes well under
+1 ms.
+"""
+
+import heapq
+import re
+import unicodedata
+from dataclasses import dataclass
+from services.lru_cache import LRUCache
+
+# Windows of up to this many words are matched (aliases are 1-3 words)
+_MAX_WINDOW = 3
+# Aliases and windows with shorter keys are left to the exact keyword index
+_MIN_KEY = 5
+# A sound-alike is never as certain as an exact keyword hit
+MAX_CONFIDENCE = 0.95
+
+_INDIC_BLOCKS = {
+    "DEVANAGARI": 0x0900, "TAMIL": 0x0B80, "TELUGU": 0x0C00, "KANNADA": 0x0C80, "MALAYALAM": 0x0D00,
+}
+_VOWEL_LETTERS = {"A", "AA", "I", "II", "U", "UU", "E", "EE", "AI", "O", "OO", "AU",
+                  "VOCALIC R", "VOCALIC RR", "VOCALIC L", "VOCALIC LL", "SHORT E", "SHORT O"}
+_SIGNS = {"ANUSVARA": "m", "CANDRABINDU": "n", "VISARGA": "h"}
+# Indic CA/CHA are 'ch' sounds, not the Latin hard c
+_STEMS = {"c": "ch", "ch": "chh"}
+
+# How letters are read out when an acronym is spelled
+_LETTER_NAMES = {
+    "b": "bi", "c": "si", "d": "di", "f": "ef", "g": "ji", "h": "ech", "j": "je", "k": "ke",
+    "l": "el", "m": "em", "n": "en", "p": "pi", "q": "kyu", "r": "ar", "s": "es", "t": "ti",
+    "v": "vi", "w": "dablyu", "x": "eks", "y": "vai", "z": "jed",
+}
+_ACRONYM = re.compile(r"^[bcdfghjklmnpqrstvwxz][bcdfghjklmnpqrstvwxyz]{1,4}$")
+_DIGRAPHS = (("ph", "f"), ("sh", "s"), ("ch", "s"), ("kh", "k"), ("gh", "k"), ("th", "t"),
+             ("dh", "t"), ("bh", "p"), ("jh", "j"), ("ck", "k"))
+_MERGE = str.maketrans({"b": "p", "g": "k", "d": "t", "q": "k", "z": "j", "w": "v", "x": "ks", "h": ""})
+_SOFT_C = re.compile(r"c(?=[eiy])")
+_VOWELS = re.compile(r"[aeiouy]+")
+_DOUBLES = re.compile(r"(.)\1+")
+
+
+def _build_romanization() -> tuple[dict, set, set]:
+    """char -> Latin for each Indic block, plus the consonant and dependent-mark sets."""
+    table, consonants, marks = {}, set(), set()
+    for script, base in _INDIC_BLOCKS.items():
+        for offset in range(0x80):
+            char = chr(base + offset)
+            name = unicodedata.name(char, "")
+            if not name.startswith(script + " "):
+                continue
+            name = name[len(script) + 1:]
+            if name.startswith("LETTER "):
+                letter = name[len("LETTER "):]
+                if letter.startswith("CHILLU "):
+                    table[char] = letter[len("CHILLU "):].lower()
+                elif letter in _VOWEL_LETTERS:
+                    table[char] = letter.replace("VOCALIC ", "").replace("SHORT ", "").lower()
+                else:
+                    # Consonant stem; the inherent 'a' is added unless a mark follows
+                    stem = letter[:-1].lower() if letter.endswith("A") else letter.lower()
+                    table[char] = _STEMS.get(stem, stem)
+                    consonants.add(char)
+            elif name.startswith("VOWEL SIGN "):
+                sign = name[len("VOWEL SIGN "):]
+                table[char] = sign.replace("VOCALIC ", "").replace("SHORT ", "").lower()
+                marks.add(char)
+            elif name.startswith("SIGN "):
+                sign = name[len("SIGN "):]
+                table[char] = _SIGNS.get(sign, "")
+                if sign in ("VIRAMA", "NUKTA"):
+                    marks.add(char)
+            elif name.startswith("AU LENGTH MARK") or name.startswith("AI LENGTH MARK"):
+                table[char] = ""
+                marks.add(char)
+    return table, consonants, marks
+
+
+_ROMAN, _CONSONANTS, _MARKS = _build_romanization()
+
+
+def romanize(text: str) -> str:
+    """Indic letters to rough Latin ('किसान' -> 'kisaan'); other characters unchanged."""
+    out = []
+    for i, char in enumerate(text):
+        latin = _ROMAN.get(char)
+        if latin is None:
+            out.append(char)
+            continue
+        out.append(latin)
+        if char in _CONSONANTS and (i + 1 == len(text) or text[i + 1] not in _MARKS):
+            out.append("a")
+    return "".join(out)
+
+
+def _word_key(word: str) -> str:
+    if _ACRONYM.match(word):
+        word = "".join(_LETTER_NAMES[c] for c in word)
+    for digraph, sound in _DIGRAPHS:
+        word = word.replace(digraph, sound)
+    word = _SOFT_C.sub("s", word).replace("c", "k").translate(_MERGE)
+    word = _DOUBLES.sub(r"\1", word)
+    return _VOWELS.sub("", word)
+
+
+def _words(text: str) -> list[str]:
+    text = romanize(unicodedata.normalize("NFC", text or "").lower())
+    return [w for w in re.split(r"[^a-z0-9]+", text) if w]
+
+
+def phonetic_key(text: str) -> str:
+    """Script-independent sound skeleton of text ('pihem kisan' -> 'pmksn')."""
+    return "".join(_word_key(w) for w in _words(text))
+
+
+def _bigrams(key: str) -> set[str]:
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _max_edits(length: int) -> int:
+    return 1 if length < 6 else 2
+
+
+def _similarity(a: str, b: str) -> float:
+    """1 - edit distance / longer length; 0 beyond the allowed edits for the length."""
+    if a == b:
+        return 1.0
+    longer = max(len(a), len(b))
+    limit = _max_edits(longer)
+    if abs(len(a) - len(b)) > limit:
+        return 0.0
+    # Only the diagonal band |i - j| <= limit can stay within the limit
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        current = [i if i <= limit else over] + [over] * len(b)
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        for j in range(lo, hi + 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != b[j - 1]))
+            current[j] = cost if cost < over else over
+        if min(current) > limit:
+            return 0.0
+        previous = current
+    if previous[-1] > limit:
+        return 0.0
+    return 1.0 - previous[-1] / longer
+
+
+@dataclass
+class FuzzyMatch:
+    scheme_id: str
+    confidence: float
+    alias: str
+    heard: str
+
+
+class FuzzySchemeMatcher:
+    """Bigram index over the phonetic keys of every scheme alias."""
+
+    def __init__(self, aliases: dict[str, list[str]], max_words: int = 16, candidates: int = 3):
+        self.max_words = max_words
+        self.candidates = candidates
+        # (window key, words) -> (score, entry); filler words recur in every turn
+        self._seen = LRUCache(maxsize=4096)
+        # (key, scheme_id, alias, bigram count, spoken words)
+        self._entries: list[tuple[str, str, str, int, int]] = []
+        self._postings: dict[str, list[int]] = {}
+        self._exact: dict[str, list[int]] = {}
+        self._spelled: dict[tuple[str, int], int] = {}  # spelled acronyms, by (key, letters)
+        self._longest = 0
+        seen = set()
+        for scheme_id, names in aliases.items():
+            for alias in names:
+                words = _words(alias)
+                key = "".join(_word_key(w) for w in words)
+                if not key or (key, scheme_id) in seen:
+                    continue
+                seen.add((key, scheme_id))
+                spoken = sum(len(w) if _ACRONYM.match(w) else 1 for w in words)
+                if len(words) == 1 and _ACRONYM.match(words[0]):
+                    self._spelled.setdefault((key, spoken), len(self._entries))
+                elif len(key) < _MIN_KEY:
+                    continue
+                grams = _bigrams(key)
+                entry = len(self._entries)
+                self._entries.append((key, scheme_id, alias, len(grams), spoken))
+                if len(key) < _MIN_KEY:
+                    continue
+                self._exact.setdefault(key, []).append(entry)
+                self._longest = max(self._longest, len(key))
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _best_for(self, key: str, words: int) -> tuple[float, int]:
+        """Closest alias spoken with at least `words` words."""
+        cached = self._seen.get((key, words))
+        if cached is not None:
+            return cached
+        entries = self._entries
+        exact = next((e for e in self._exact.get(key, ()) if entries[e][4] >= words), None)
+        if exact is not None:
+            result = (MAX_CONFIDENCE, exact)
+        elif len(key) > self._longest + _max_edits(len(key)):
+            result = (0.0, -1)
+        else:
+            grams = _bigrams(key)
+            shared: dict[int, int] = {}
+            for gram in grams:
+                for entry in self._postings.get(gram, ()):
+                    shared[entry] = shared.get(entry, 0) + 1
+            # Each edit changes at most two bigrams, so aliases sharing fewer
+            # (or too different in length) cannot be within the allowed edits
+            length, size = len(key), len(grams)
+            viable = []
+            for entry, count in shared.items():
+                alias_key, _, _, alias_grams, spoken = entries[entry]
+                edits = 1 if length < 6 and len(alias_key) < 6 else 2
+                if (spoken >= words and abs(length - len(alias_key)) <= edits
+                        and count >= (size if size > alias_grams else alias_grams) - 2 * edits):
+                    viable.append((count / (size + alias_grams), -entry))
+            # Edit distance only for the aliases with the highest bigram overlap (Dice)
+            top = heapq.nlargest(self.candidates, viable)
+            result = (0.0, -1)
+            for _, negated in top:
+                score = min(_similarity(key, entries[-negated][0]), MAX_CONFIDENCE)
+                if score > result[0]:
+                    result = (score, -negated)
+        self._seen.set((key, words), result)
+        return result
+
+    def match(self, message: str, limit: int = 3, min_confidence: float = 0.5) -> list[FuzzyMatch]:
+        """Best match per scheme, most confident first."""
+        words = _words(message)[:self.max_words]
+        keys = [_word_key(w) for w in words]
+        best: dict[str, FuzzyMatch] = {}
+        for start in range(len(words)):
+            for size in range(1, _MAX_WINDOW + 1):
+                if start + size > len(words):
+                    break
+                window = keys[start:start + size]
+                key = "".join(window)
+                if size > 1 and all(len(k) == 1 for k in window) and (key, size) in self._spelled:
+                    score, entry = MAX_CONFIDENCE, self._spelled[(key, size)]
+                elif len(key) < _MIN_KEY:
+                    continue
+                else:
+                    score, entry = self._best_for(key, size)
+                if entry < 0 or score < min_confidence:
+                    continue
+                _, scheme_id, alias, _, _ = self._entries[entry]
+                found = best.get(scheme_id)
+                if found is None or score > found.confidence:
+                    best[scheme_id] = FuzzyMatch(scheme_id, round(score, 3), alias,
+                                                 " ".join(words[start:start + size]))
+        ranked = sorted(best.values(), key=lambda m: -m.confidence)
+        return ranked[:limit]
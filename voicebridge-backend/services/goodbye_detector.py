@@ -0,0 +1,173 @@
+"""
+VoiceBridge AI — Goodbye Detector
+Decides whether the farmer is ending the call, in all supported languages.
+
+Every keyword is compiled once at import into a single Aho-Corasick automaton
+(NFC-normalized, lowercased), so a message is scanned once no matter how many
+keywords there are. Keywords are grouped per language and split into:
+  strong    — clear intent to end the call ("bye", "कॉल खत्म", "കോൾ അവസാനം")
+  ambiguous — could also be mid-conversation ("thanks", "ಸರಿ", "नमस्ते");
+              the call should be confirmed before hanging up
+"""
+
+import unicodedata
+from services.keyword_automaton import KeywordAutomaton
+
+# Goodbye keywords in ALL supported languages with multiple variations
+GOODBYE_KEYWORDS = {
+    # ============ ENGLISH ============
+    "en": {
+        "strong": [
+            'bye', 'goodbye', 'ok bye', 'bye now', 'see you', 'take care', 'gotta go',
+            'need to go',
+            'have to go', 'see ya', 'catch you later', 'end call', 'thanks bye',
+        ],
+        "ambiguous": [
+            'done', 'enough', 'stop', 'thanks', 'thank you', "that's all", "that's it",
+            'finish', 'complete', 'this is enough',
+            "i don't have anything to ask", 'i dont have anything to ask anymore',
+            "i don't want to know anymore", 'i dont want to know anymore',
+            'nothing more to ask',
+        ],
+    },
+    # ============ HINDI ============
+    "hi": {
+        "strong": [
+            'बाय', 'अलविदा', 'जाना है', 'कॉल खत्म', 'खुदा हाफिज', 'फिर मिलेंगे',
+            'कॉल अंत करो', 'कॉल बंद करो', 'जाता हूं', 'जाती हूं', 'जाऊँ', 'विदा',
+            'अच्छा बाय',
+        ],
+        "ambiguous": [
+            'खत्म', 'खत्म करो', 'धन्यवाद', 'सुक्रिया', 'बंद करो', 'बंद कर', 'जाते हैं',
+            'जाते हो', 'अलग करो', 'नमस्ते', 'यह काफी है', 'मुझे और कुछ नहीं पूछना',
+            'मुझे और जानना नहीं है', 'पर्याप्त है',
+        ],
+    },
+    # ============ TAMIL ============
+    "ta": {
+        "strong": [
+            'பை', 'போய்விடு', 'போகிறேன்', 'என்ற கோல் முடிக்க', 'கோல் முடிக்கவும்',
+            'அவசியம் செல்ல', 'அழைப்பு முடி', 'செல்கிறேன்', 'மீண்டு பார்ப்போம்',
+        ],
+        "ambiguous": [
+            'வணக்கம்', 'நன்றி', 'போனேன்', 'பேச முடிந்தவ', 'பேசலாம்', 'முடிந்தது', 'வாழ்க',
+            'நன்றி சொல்', 'இது போதும்', 'எனக்கு கேட்க ஒன்றுமில்லை',
+            'இனி தெரிந்து கொள்ள வேண்டாம்', 'நன்றாய் வாழ்க',
+        ],
+    },
+    # ============ KANNADA ============
+    "kn": {
+        "strong": [
+            'ವಿದಾ', 'ಹೋಗಬೇಕು', 'ಹೋಗುತ್ತೀನಿ', 'ಕರೆ ಮುಗಿಸು', 'ಕರೆ ಮುಗಿಸಿ', 'ಸರಿ ವಿದಾ',
+            'ಹಾಗಾದರೆ ಬಾಯ್',
+        ],
+        "ambiguous": [
+            'ಹೌದು', 'ಸರಿ', 'ಧನ್ಯವಾದ', 'ಶುಕ್ರಿಯೆ', 'ನಮಸ್ಕಾರ', 'ಹೋಗು', 'ಸಾಕು', 'ಮುಗಿಸು',
+            'ಮುಗಿದು', 'ನಿಲ್ಲಿಸು', 'ನಿಲ್ಲಬೇಕು', 'ಇದು ಸಾಕು', 'ನನಗೆ ಪ್ರಶ್ನೆಗಳು ಇಲ್ಲ',
+            'ನಾನು ಹೆಚ್ಚು ತಿಳಿಯಲು ಬಯಸುತ್ತೇನೆ ಇಲ್ಲ',
+        ],
+    },
+    # ============ TELUGU ============
+    "te": {
+        "strong": [
+            'బై', 'వెళ్ళవలసిన', 'నా వెళ్ళాలి', 'కాల్\u200c ముగించండి', 'కాల్ ముగిసిన',
+            'థాంక్ యూ బై',
+        ],
+        "ambiguous": [
+            'సరిగ్గా', 'ఆ విధంగా', 'ధన్యవాదాలు', 'దయచేసి', 'నమస్కారం', 'పోకూ', 'సరిపడింది',
+            'ఆపండి', 'విరమిస్తుంది', 'ఆపుకోండి', 'చాలు', 'ఖతమ్', 'ఇది సరిపోతుంది',
+            'నాకు ఏ ప్రశ్నలు లేవు', 'నేను ఇకపై తెలుసుకోవడానికి కోరుకోను',
+        ],
+    },
+    # ============ MALAYALAM ============
+    "ml": {
+        "strong": [
+            'കോൾ അവസാനിപ്പിക്കാം', 'കോൾ അവസാനിപ്പിക്കും', 'കോൾ അവസാനം', 'കോൾ കം കരോ',
+            'കോൾ കഴിയ്ക്കാം', 'പോകാം', 'പോണം', 'പോകുന്നു', 'പോകണം', 'പോയ്', 'പോയ്\u200c',
+            'കെട്ടിപ്പോകാം', 'അവ്സാനിപ്പിക്കാം',
+        ],
+        "ambiguous": [
+            'നിർത്തൽ', 'ഓകെ', 'ജാ', 'വാഴ്ക', 'നന്ദി', 'നന്ദി പറയുന്നു', 'നിലയ്ക്കാം',
+            'നില്\u200dക്കാം', 'നിന്നുപോകാം', 'നിൽപ്പിച്ചോ', 'നിൽപ്പിക്കാം', 'സാധിച്ചു',
+            'സാരമായി തീരുന്നു', 'കഴിഞ്ഞു', 'കഴിയുന്നു', 'തീരണ്ടെ', 'തീരുമ്പോൾ', 'ഇത് മതി',
+            'എനിക്കൊരു ചോദ്യവും ഇല്ല', 'എനിക്കൂടെ കൂടുതൽ അറിയാൻ താത്പര്യമില്ല',
+        ],
+    },
+}
+
+# Farewell phrases in Sahaya's own reply...
+RESPONSE_FAREWELL_PHRASES = [
+    'धन्यवाद', 'take care', 'all the best', 'வாழ்க', 'നന്ദി', 'good luck', 'ಧನ್ಯವಾದ',
+    'థాంకు', 'thanks', 'farewell', 'કોલ/call शેষ',
+]
+
+# ...combined with a short acknowledgement from the farmer also ends the call
+ACKNOWLEDGEMENT_WORDS = ['thanks', 'bye', 'done', 'धन्यवाद', 'നന്ദി', 'thank', 'okay', 'ok']
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize('NFC', text or '').lower()
+
+
+def _compile_keywords() -> KeywordAutomaton:
+    entries = []
+    for language, groups in GOODBYE_KEYWORDS.items():
+        for strength, keywords in groups.items():
+            for keyword in keywords:
+                entries.append((_normalize(keyword), (language, strength)))
+    return KeywordAutomaton(entries)
+
+
+_KEYWORDS = _compile_keywords()
+_RESPONSE_PHRASES = KeywordAutomaton((_normalize(p), None) for p in RESPONSE_FAREWELL_PHRASES)
+_ACKNOWLEDGEMENTS = KeywordAutomaton((_normalize(w), None) for w in ACKNOWLEDGEMENT_WORDS)
+
+
+def detect_goodbye(message: str, response_text: str = '') -> dict:
+    """
+    Scans the farmer's message (and Sahaya's reply) once.
+
+    Returns dict with:
+    - is_goodbye: bool - True if the farmer wants to end the call (strong or ambiguous)
+    - needs_confirmation: bool - True if only ambiguous keywords matched
+    - strength: 'strong' | 'ambiguous' | None
+    - languages: languages of the matched keywords, in order of appearance
+    - matched: matched keywords, in order of appearance
+    """
+    msg = _normalize(message)
+    matched, languages = [], []
+    strong = False
+    for _, keyword, (language, strength) in _KEYWORDS.iter_matches(msg):
+        if keyword not in matched:
+            matched.append(keyword)
+        if language not in languages:
+            languages.append(language)
+        strong = strong or strength == "strong"
+
+    if matched:
+        return {
+            "is_goodbye": True,
+            "needs_confirmation": not strong,
+            "strength": "strong" if strong else "ambiguous",
+            "languages": languages,
+            "matched": matched,
+        }
+
+    # Sahaya already said farewell and the farmer just acknowledged it
+    if response_text and _ACKNOWLEDGEMENTS.contains_any(msg) \
+            and _RESPONSE_PHRASES.contains_any(_normalize(response_text)):
+        return {
+            "is_goodbye": True,
+            "needs_confirmation": False,
+            "strength": "strong",
+            "languages": [],
+            "matched": [],
+        }
+
+    return {
+        "is_goodbye": False,
+        "needs_confirmation": False,
+        "strength": None,
+        "languages": [],
+        "matched": [],
+    }
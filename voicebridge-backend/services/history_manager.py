@@ -0,0 +1,154 @@
+"""
+VoiceBridge AI — Conversation History Manager
+Keeps the Bedrock input bounded however long the call runs.
+
+The last HISTORY_MAX_TURNS turns go to the model verbatim. Anything older is
+folded into a short extractive summary ("Farmer asked ... / Sahaya said ...")
+that is placed in the dynamic system block. Summaries are cached per
+conversation and extended incrementally, so each turn only summarizes the
+messages that just fell out of the window.
+"""
+
+from services.lru_cache import LRUCache
+from services.sentence_splitter import split_sentences
+
+# Approximate characters per token by script. Claude's tokenizer spends far
+# more tokens on Indic scripts than on Latin text, so a flat chars/4 estimate
+# undercounts a Malayalam turn several times over.
+_CHARS_PER_TOKEN = (
+    # (first code point, last code point, chars per token)
+    (0x0000, 0x024F, 4.0),   # Latin (English, Hinglish)
+    (0x0900, 0x097F, 2.0),   # Devanagari (Hindi)
+    (0x0B80, 0x0BFF, 1.3),   # Tamil
+    (0x0C00, 0x0C7F, 1.4),   # Telugu
+    (0x0C80, 0x0CFF, 1.4),   # Kannada
+    (0x0D00, 0x0D7F, 1.2),   # Malayalam
+)
+_DEFAULT_CHARS_PER_TOKEN = 1.0   # anything else (emoji, symbols): assume the worst
+_MESSAGE_OVERHEAD_TOKENS = 4     # role + separators per message
+
+# Each summary line keeps at most this much of the turn's first sentence
+_SUMMARY_LINE_CHARS = 160
+_ROLE_LABELS = {"user": "Farmer", "assistant": "Sahaya"}
+
+
+def _chars_per_token(char: str) -> float:
+    code = ord(char)
+    for first, last, ratio in _CHARS_PER_TOKEN:
+        if first <= code <= last:
+            return ratio
+    return _DEFAULT_CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate Claude token count for mixed English/Indic text."""
+    if not text:
+        return 0
+    tokens = 0.0
+    for char in text:
+        if char.isspace():
+            tokens += 0.25
+        else:
+            tokens += 1.0 / _chars_per_token(char)
+    return int(tokens + 0.999)
+
+
+def message_tokens(message: dict) -> int:
+    return estimate_tokens(message.get("content", "")) + _MESSAGE_OVERHEAD_TOKENS
+
+
+def _clean_history(history: list[dict]) -> list[dict]:
+    """Drops malformed items; keeps only user/assistant text turns."""
+    cleaned = []
+    for item in history or []:
+        if not isinstance(item, dict):
+            continue
+        role = item.get("role", "user")
+        content = item.get("content", "")
+        if role not in _ROLE_LABELS or not isinstance(content, str) or not content.strip():
+            continue
+        cleaned.append({"role": role, "content": content.strip()})
+    return cleaned
+
+
+def _summary_line(message: dict) -> str:
+    sentences = split_sentences(message["content"])
+    text = sentences[0] if sentences else message["content"]
+    if len(text) > _SUMMARY_LINE_CHARS:
+        text = text[:_SUMMARY_LINE_CHARS].rsplit(" ", 1)[0] + "…"
+    return f"{_ROLE_LABELS[message['role']]}: {text}"
+
+
+class HistoryManager:
+    """
+    Splits client-sent history into (recent messages, summary of older ones).
+    max_turns counts farmer+Sahaya exchanges; token_budget caps recent + summary.
+    """
+
+    def __init__(self, max_turns: int = 6, token_budget: int = 1500, cache_size: int = 1024,
+                 cache_ttl_seconds: float | None = 7200):
+        self.max_messages = max(2, int(max_turns) * 2)
+        self.token_budget = max(200, int(token_budget))
+        # conversation_id -> (folded message count, fingerprint of last folded, summary lines)
+        self._summaries = LRUCache(cache_size, cache_ttl_seconds)
+
+    def window(self, history: list[dict], conversation_id: str = None) -> tuple[list[dict], str]:
+        """
+        Returns (recent_messages, summary). recent_messages always starts with a
+        farmer turn, as Bedrock requires; summary is "" when nothing was folded.
+        """
+        messages = _clean_history(history)
+        start = max(0, len(messages) - self.max_messages)
+
+        # Trim further (oldest first) until recent turns fit in the budget,
+        # keeping a quarter of it for the summary
+        recent_budget = self.token_budget * 3 // 4
+        used = sum(message_tokens(m) for m in messages[start:])
+        while start < len(messages) - 1 and used > recent_budget:
+            used -= message_tokens(messages[start])
+            start += 1
+
+        # The first verbatim message must be the farmer's
+        while start < len(messages) and messages[start]["role"] != "user":
+            start += 1
+
+        if start == 0:
+            return messages, ""
+
+        lines = self._summary_lines(messages[:start], conversation_id)
+        summary_budget = self.token_budget - used
+        kept = []
+        for line in reversed(lines):
+            summary_budget -= estimate_tokens(line) + 1
+            if summary_budget < 0:
+                break
+            kept.append(line)
+        kept.reverse()
+        return messages[start:], "\n".join(kept)
+
+    def _summary_lines(self, folded: list[dict], conversation_id: str = None) -> list[str]:
+        """Summary of the folded messages, extended from the cached one when possible."""
+        fingerprint = folded[-1]["content"]
+        if not conversation_id:
+            return [_summary_line(m) for m in folded]
+
+        cached = self._summaries.get(conversation_id)
+        if cached is not None:
+            count, last_content, lines = cached
+            if count == len(folded) and last_content == fingerprint:
+                return lines
+            # Extend only if the client's history still contains what we summarized
+            if count < len(folded) and folded[count - 1]["content"] == last_content:
+                lines = lines + [_summary_line(m) for m in folded[count:]]
+                self._summaries.set(conversation_id, (len(folded), fingerprint, lines))
+                return lines
+
+        lines = [_summary_line(m) for m in folded]
+        self._summaries.set(conversation_id, (len(folded), fingerprint, lines))
+        return lines
+
+    def stats(self) -> dict:
+        return self._summaries.stats()
+
+    def clear(self):
+        self._summaries.clear()
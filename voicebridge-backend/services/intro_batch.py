@@ -0,0 +1,368 @@
+"""
+VoiceBridge AI — Call Intro Pre-generation
+Generates Sahaya's personalised scheme intros for a whole campaign ahead of
+time, so the Twilio webhooks only do a lookup instead of waiting on Bedrock
+while the farmer is on the line.
+
+Intros are generated concurrently behind a token-bucket rate limit (Bedrock
+throttles per account) and stored by (farmer, scheme, land, KCC):
+  Mock: in-process dict
+  AWS:  S3 (one small object per intro) with an in-process copy
+
+A batch runs where INTRO_BATCH_RUNNER says:
+  threads: on this process's pool. Needs a process that outlives the request
+           (long-running host, or scripts/generate_intros.py from the
+           campaign runner)
+  lambda:  as a chain of asynchronous Zappa invocations, one per
+           INTRO_TASK_CHUNK items, each waiting for its own items. A Lambda
+           container is frozen once it has responded, so nothing is left
+           running in the background; one chunk at a time keeps the token
+           bucket meaningful
+In AWS mode job progress is kept in S3 next to the intros, so a poll that
+lands on another container (or process) still finds the job.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from config.settings import (
+    USE_MOCK,
+    S3_ASSETS_BUCKET,
+    INTRO_BATCH_WORKERS,
+    INTRO_BATCH_RATE_PER_SECOND,
+    INTRO_BATCH_BURST,
+    INTRO_STORE_PREFIX,
+    INTRO_MISS_TTL_SECONDS,
+    INTRO_JOB_TTL_SECONDS,
+    INTRO_BATCH_RUNNER,
+    INTRO_TASK_CHUNK,
+)
+from services.aws_clients import get_client
+from services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Retries for throttled generations (seconds: 1, 2, 4)
+_MAX_RETRIES = 3
+_THROTTLE_MARKERS = ("ThrottlingException", "TooManyRequests", "Rate exceeded")
+# S3 error codes meaning "this object was never written" (anything else is transient).
+# Without s3:ListBucket, S3 answers a missing key with 403 AccessDenied.
+_NOT_FOUND_CODES = ("NoSuchKey", "404", "NotFound", "AccessDenied", "403")
+# Running jobs write their progress to S3 every this many items
+_PROGRESS_EVERY = 10
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, up to `burst` saved up."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(0.01, float(rate))
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def intro_key(farmer_name: str, scheme_id: str, land_acres: float, has_kcc: bool) -> str:
+    """Store key. Land is rounded to 0.1 acre, as the call flow only branches on buckets."""
+    name = " ".join((farmer_name or "").split()).lower()
+    return f"{scheme_id.upper()}|{round(float(land_acres or 0), 1)}|{int(bool(has_kcc))}|{name}"
+
+
+def _s3_key(key: str) -> str:
+    return f"{INTRO_STORE_PREFIX}{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+# In-process copy of stored intros. In mock mode this is the store.
+_intros = LRUCache(maxsize=50000)
+# Keys S3 confirmed absent, so an un-batched call does not hit S3 on every
+# stage; short-lived, so intros batched later are picked up
+_missing = LRUCache(maxsize=50000, ttl_seconds=INTRO_MISS_TTL_SECONDS)
+
+
+def _not_found(error: Exception) -> bool:
+    return getattr(error, "response", {}).get("Error", {}).get("Code", "") in _NOT_FOUND_CODES
+
+
+def save_intro(key: str, text: str):
+    _intros.set(key, text)
+    _missing.pop(key)
+    if USE_MOCK:
+        return
+    try:
+        get_client("s3").put_object(
+            Bucket=S3_ASSETS_BUCKET,
+            Key=_s3_key(key),
+            Body=json.dumps({"key": key, "text": text}, ensure_ascii=False).encode("utf-8"),
+            ContentType="application/json",
+        )
+    except Exception as e:
+        logger.error(f"[INTRO] S3 store failed for {key}: {e}")
+
+
+def get_intro(farmer_name: str, scheme_id: str, land_acres: float, has_kcc: bool) -> str | None:
+    """Returns the pre-generated intro, or None if this farmer/scheme was not batched."""
+    key = intro_key(farmer_name, scheme_id, land_acres, has_kcc)
+    text = _intros.get(key)
+    if text is not None:
+        return text
+    if USE_MOCK or _missing.get(key) is not None:
+        return None
+    try:
+        obj = get_client("s3").get_object(Bucket=S3_ASSETS_BUCKET, Key=_s3_key(key))
+        text = json.loads(obj["Body"].read()).get("text") or None
+    except Exception as e:
+        if _not_found(e):
+            _missing.set(key, True)
+        else:
+            # Transient: not remembered, the next stage asks S3 again
+            logger.warning(f"[INTRO] S3 lookup failed for {key}: {e}")
+        return None
+    if text:
+        _intros.set(key, text)
+    else:
+        _missing.set(key, True)
+    return text
+
+
+def generate_intro(farmer_name: str, scheme_id: str, land_acres: float, has_kcc: bool) -> str | None:
+    """
+    One Bedrock intro: two short Hindi sentences for this farmer and scheme.
+    Returns None when generation failed (callers fall back to a template).
+    Raises RuntimeError on throttling so the batch can back off and retry.
+    """
+    from models.farmer import FarmerProfile
+    from services.ai_service import generate_response
+    from services.scheme_service import get_scheme_by_id
+
+    scheme = get_scheme_by_id(scheme_id) or {}
+    scheme_name = scheme.get("name_hi") or scheme_id
+    farmer = FarmerProfile.from_dict({
+        'name': farmer_name, 'land_acres': land_acres,
+        'state': 'Karnataka', 'has_kcc': has_kcc,
+        'has_bank_account': True
+    })
+    result = generate_response(
+        f"{farmer_name} ji ko {scheme_name} ke baare mein 2 vaakya mein batao. Sirf Hindi mein.",
+        [scheme_id], farmer, []
+    )
+    error = result.get("error") or ""
+    if any(marker in error for marker in _THROTTLE_MARKERS):
+        raise RuntimeError(error)
+    text = result.get('response_text', '') if result.get("success") else ''
+    if text and len(text) > 20:
+        parts = text.split('।')
+        return ('। '.join(parts[:2]) + '।')[:280]
+    return None
+
+
+# ── Batch jobs ────────────────────────────────────────
+
+_executor = ThreadPoolExecutor(max_workers=INTRO_BATCH_WORKERS, thread_name_prefix="intro")
+_bucket = TokenBucket(INTRO_BATCH_RATE_PER_SECOND, INTRO_BATCH_BURST)
+# Jobs being run by this process
+_jobs: dict[str, dict] = {}
+_jobs_lock = threading.Lock()
+# Serializes progress writes so the last one stored is the latest state
+_store_lock = threading.Lock()
+
+
+def _job_s3_key(job_id: str, part: str) -> str:
+    return f"{INTRO_STORE_PREFIX}jobs/{job_id}.{part}.json"
+
+
+def _put_json(s3_key: str, value):
+    get_client("s3").put_object(
+        Bucket=S3_ASSETS_BUCKET, Key=s3_key,
+        Body=json.dumps(value, ensure_ascii=False).encode("utf-8"), ContentType="application/json",
+    )
+
+
+def _get_json(s3_key: str):
+    """The stored object, or None if it does not exist or S3 failed."""
+    try:
+        return json.loads(get_client("s3").get_object(Bucket=S3_ASSETS_BUCKET, Key=s3_key)["Body"].read())
+    except Exception as e:
+        if not _not_found(e):
+            logger.warning(f"[INTRO] S3 read failed for {s3_key}: {e}")
+        return None
+
+
+def _store_job(job: dict):
+    """Writes the job's progress to S3 (AWS mode), where any process can report it."""
+    if USE_MOCK:
+        return
+    with _store_lock:
+        with _jobs_lock:
+            snapshot = dict(job)
+        try:
+            _put_json(_job_s3_key(snapshot["job_id"], "status"), snapshot)
+        except Exception as e:
+            logger.error(f"[INTRO] Storing job {snapshot['job_id']} failed: {e}")
+
+
+def _generate_one(job: dict, item: dict):
+    key = intro_key(item["farmer_name"], item["scheme_id"], item["land_acres"], item["has_kcc"])
+    outcome = "failed"
+    try:
+        if not job["overwrite"] and get_intro(item["farmer_name"], item["scheme_id"],
+                                              item["land_acres"], item["has_kcc"]):
+            outcome = "skipped"
+            return
+        for attempt in range(_MAX_RETRIES + 1):
+            _bucket.acquire()
+            try:
+                text = generate_intro(item["farmer_name"], item["scheme_id"],
+                                      item["land_acres"], item["has_kcc"])
+                break
+            except RuntimeError as e:
+                if attempt == _MAX_RETRIES:
+                    logger.error(f"[INTRO] Throttled, giving up on {key}: {e}")
+                    return
+                time.sleep(2 ** attempt)
+        if text:
+            save_intro(key, text)
+            outcome = "generated"
+    except Exception as e:
+        logger.error(f"[INTRO] Generation failed for {key}: {e}")
+    finally:
+        with _jobs_lock:
+            job[outcome] += 1
+            job["done"] += 1
+            if job["done"] == job["total"]:
+                job["status"] = "completed"
+                job["finished_at"] = time.time()
+            progress = job["done"] % _PROGRESS_EVERY == 0 or job["status"] == "completed"
+        if progress:
+            _store_job(job)
+
+
+def normalize_items(farmers: list[dict], scheme_ids: list[str] = None, match_schemes=None) -> list[dict]:
+    """
+    Expands farmer profiles into (farmer, scheme) items.
+    Each farmer gets its own 'scheme_ids', else the shared scheme_ids,
+    else match_schemes(land_acres, has_kcc) when given.
+    """
+    items = []
+    for farmer in farmers or []:
+        name = (farmer.get("name") or farmer.get("farmer_name") or "").strip()
+        if not name:
+            continue
+        land = float(farmer.get("land_acres", farmer.get("land", 0)) or 0)
+        has_kcc = bool(farmer.get("has_kcc", False))
+        ids = farmer.get("scheme_ids") or scheme_ids
+        if not ids and match_schemes:
+            ids = match_schemes(land, has_kcc)[:1]
+        for scheme_id in ids or []:
+            items.append({"farmer_name": name, "scheme_id": scheme_id,
+                          "land_acres": land, "has_kcc": has_kcc})
+    return items
+
+
+def _prune_jobs(now: float):
+    """Drops jobs that finished more than INTRO_JOB_TTL_SECONDS ago. Call with _jobs_lock held."""
+    expired = [job_id for job_id, job in _jobs.items()
+               if job["finished_at"] is not None and now - job["finished_at"] > INTRO_JOB_TTL_SECONDS]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def start_batch(items: list[dict], overwrite: bool = False) -> dict:
+    """Starts intro generation for items (see INTRO_BATCH_RUNNER). Returns the job status immediately."""
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "status": "running" if items else "completed",
+        "total": len(items),
+        "done": 0,
+        "generated": 0,
+        "skipped": 0,
+        "failed": 0,
+        "overwrite": overwrite,
+        "started_at": time.time(),
+        "finished_at": None if items else time.time(),
+    }
+    on_lambda = INTRO_BATCH_RUNNER == "lambda" and items and not USE_MOCK
+    with _jobs_lock:
+        _prune_jobs(job["started_at"])
+        if not on_lambda:
+            _jobs[job["job_id"]] = job
+    _store_job(job)
+    if on_lambda:
+        try:
+            _put_json(_job_s3_key(job["job_id"], "items"), items)
+            _dispatch_chunk(job["job_id"], 0)
+        except Exception as e:
+            logger.error(f"[INTRO] Could not start job {job['job_id']}: {e}")
+            job["status"] = "failed"
+            job["finished_at"] = time.time()
+            _store_job(job)
+        return dict(job)
+    for item in items:
+        _executor.submit(_generate_one, job, item)
+    return get_job(job["job_id"])
+
+
+def _dispatch_chunk(job_id: str, start: int):
+    """Runs run_batch_chunk(job_id, start) in a new asynchronous Lambda invocation."""
+    from zappa.asynchronous import run
+    run(run_batch_chunk, args=(job_id, start))
+
+
+def run_batch_chunk(job_id: str, start: int = 0):
+    """
+    Lambda task: generates items [start, start + INTRO_TASK_CHUNK) of a stored
+    job and waits for them, then hands the rest to the next invocation.
+    """
+    job = _get_json(_job_s3_key(job_id, "status"))
+    items = _get_json(_job_s3_key(job_id, "items"))
+    if job is None or items is None:
+        logger.error(f"[INTRO] Job {job_id} not found in S3, chunk at {start} dropped")
+        return
+    with _jobs_lock:
+        _jobs[job_id] = job
+    try:
+        wait([_executor.submit(_generate_one, job, item) for item in items[start:start + INTRO_TASK_CHUNK]])
+        _store_job(job)
+    finally:
+        with _jobs_lock:
+            _jobs.pop(job_id, None)
+    if start + INTRO_TASK_CHUNK < len(items):
+        _dispatch_chunk(job_id, start + INTRO_TASK_CHUNK)
+
+
+def get_job(job_id: str) -> dict | None:
+    """This process's copy of a job it is running, else the one stored in S3 (AWS mode)."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job:
+            return dict(job)
+    return None if USE_MOCK else _get_json(_job_s3_key(job_id, "status"))
+
+
+def wait_for_job(job_id: str, timeout: float = None) -> dict | None:
+    """Polls until the job finishes or timeout seconds pass (scripts and tests)."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        job = get_job(job_id)
+        if not job or job["status"] != "running":
+            return job
+        if deadline is not None and time.monotonic() >= deadline:
+            return job
+        time.sleep(0.05)
@@ -0,0 +1,168 @@
+"""
+VoiceBridge AI — IVR Plan
+Everything the Twilio stage webhooks need, computed once per catalog load:
+the matched schemes for every DTMF path (3 land answers x 2 KCC answers),
+each scheme's spoken details, and the template fallback texts. Webhooks
+then only do dictionary lookups and never wait on DynamoDB; when the
+catalog may have changed, the plan is rebuilt in the background.
+"""
+
+import logging
+import threading
+import time
+from config.settings import S3_AUDIO_BUCKET, AWS_REGION, SCHEME_CATALOG_CHECK_SECONDS
+from models.farmer import FarmerProfile
+
+logger = logging.getLogger(__name__)
+
+# Stage 2 answer -> acres (1: under 2, 2: 2-5, 3: over 5); anything else 2.0
+LAND_ANSWERS = {'1': 1.0, '2': 3.0, '3': 7.0}
+DEFAULT_LAND = 2.0
+# When eligibility cannot be computed at all
+DEFAULT_MATCHED = ['PM_KISAN', 'PMFBY']
+
+CLIP_FILES = {
+    'PM_KISAN': 'voice_memory_PM_KISAN.mp3',
+    'KCC': 'voice_memory_KCC.mp3',
+    'PMFBY': 'voice_memory_PMFBY.mp3',
+}
+
+# Verified fallback — amounts from official government sources
+FALLBACK_SCHEMES = {
+    'PM_KISAN': {
+        'name_hi': 'पीएम किसान सम्मान निधि',
+        'benefit': '6,000 rupaye pratisaal, teen kisht mein seedha bank mein',
+        'documents': ['Aadhaar card', 'Zameen ke kagaz (Khatauni)', 'Bank passbook'],
+        'apply_at': 'pmkisan.gov.in ya nazdiki CSC kendra'
+    },
+    'KCC': {
+        'name_hi': 'किसान क्रेडिट कार्ड',
+        'benefit': '3 lakh rupaye tak ka loan, sirf 4 pratishat byaaj par saal mein',
+        'documents': ['Aadhaar card', 'Zameen ke kagaz', 'Bank passbook', 'Passport photo'],
+        'apply_at': 'nazdiki bank shaakha mein'
+    },
+    'PMFBY': {
+        'name_hi': 'प्रधानमंत्री फसल बीमा योजना',
+        'benefit': 'Fasal kharab hone par poora muavza, sirf 2 pratishat premium',
+        'documents': ['Aadhaar card', 'Zameen ke kagaz', 'Bank passbook', 'Baayi fasal ki jaankari'],
+        'apply_at': 'nazdiki bank ya bima company mein'
+    },
+    'AYUSHMAN_BHARAT': {
+        'name_hi': 'आयुष्मान भारत',
+        'benefit': '5 lakh rupaye tak ka muft ilaaj har saal parivar ke liye',
+        'documents': ['Aadhaar card', 'Ration card'],
+        'apply_at': 'nazdiki sarkari aspatal ya CSC kendra'
+    },
+    'MGNREGS': {
+        'name_hi': 'मनरेगा',
+        'benefit': '100 din ka guaranteed kaam, 220 se 357 rupaye rozana state ke hisaab se',
+        'documents': ['Aadhaar card', 'Bank passbook'],
+        'apply_at': 'gram panchayat office'
+    }
+}
+
+
+def voice_memory_url(scheme_id: str) -> str:
+    """Public S3 URL for Voice Memory clip. Twilio fetches directly."""
+    filename = CLIP_FILES.get(scheme_id, CLIP_FILES['PM_KISAN'])
+    return f"https://{S3_AUDIO_BUCKET}.s3.{AWS_REGION}.amazonaws.com/{filename}"
+
+
+def scheme_details(scheme: dict) -> dict:
+    """A scheme as the call flow speaks it, with its stage texts pre-rendered."""
+    documents = scheme.get('documents', [])[:3]
+    name_hi, benefit = scheme.get('name_hi', ''), scheme.get('benefit', '')
+    return {
+        'name_hi': name_hi,
+        'benefit': benefit,
+        'documents': documents,
+        'apply_at': scheme.get('apply_at', 'nazdiki CSC kendra'),
+        'docs_speech': ' '.join(f"Number {i + 1}: {d}." for i, d in enumerate(documents)),
+        'intro_tail': f" ji, {name_hi} mein aapko {benefit} milega. Yeh yojana aapke liye bilkul sahi hai.",
+        'voice_memory_url': voice_memory_url(scheme['scheme_id']),
+    }
+
+
+class IvrPlan:
+    """Matched schemes per (land, KCC) answer and details per scheme_id."""
+
+    def __init__(self, scheme_rules: list[tuple] = (), version=None):
+        self.version = version
+        self._rules = list(scheme_rules)
+        self._schemes = {sid: scheme_details({'scheme_id': sid, **s}) for sid, s in FALLBACK_SCHEMES.items()}
+        for scheme, _ in self._rules:
+            self._schemes[scheme['scheme_id']] = scheme_details(scheme)
+        self._matched = {}
+        for land in (*LAND_ANSWERS.values(), DEFAULT_LAND):
+            for has_kcc in (True, False):
+                self.matched(land, has_kcc)
+
+    def _match(self, land: float, has_kcc: bool) -> list[str]:
+        if not self._rules:
+            return list(DEFAULT_MATCHED)
+        farmer = FarmerProfile.from_dict({
+            'name': 'Kisan', 'land_acres': land,
+            'state': 'Karnataka', 'has_kcc': has_kcc,
+            'has_bank_account': True, 'age': 40
+        })
+        return [scheme['scheme_id'] for scheme, rule in self._rules if not rule.failures(farmer)][:2]
+
+    def matched(self, land: float, has_kcc: bool) -> list[str]:
+        """Top 2 eligible scheme_ids. DTMF paths are precomputed; other land values are memoized."""
+        key = (round(float(land), 1), bool(has_kcc))
+        matched = self._matched.get(key)
+        if matched is None:
+            matched = self._matched[key] = self._match(*key)
+        return list(matched)
+
+    def scheme(self, scheme_id: str) -> dict:
+        return self._schemes.get(scheme_id) or self._schemes['PM_KISAN']
+
+
+_plan: IvrPlan | None = None
+_checked_at = 0.0
+_refreshing = False
+_lock = threading.Lock()
+
+
+def _build() -> IvrPlan:
+    """Plan for the current catalog, reusing the existing one if the catalog did not reload."""
+    global _plan, _checked_at
+    from services.scheme_service import catalog
+
+    try:
+        rules = catalog.rules()
+        if _plan is None or _plan.version != catalog.loads:
+            _plan = IvrPlan(rules, catalog.loads)
+            logger.info(f"[IVR] Plan built for {len(rules)} schemes")
+    except Exception as e:
+        logger.error(f"[IVR] Catalog unavailable, using fallback plan: {e}")
+        if _plan is None:
+            _plan = IvrPlan()
+    _checked_at = time.monotonic()
+    return _plan
+
+
+def _refresh_in_background():
+    global _refreshing
+    try:
+        _build()
+    finally:
+        _refreshing = False
+
+
+def get_plan() -> IvrPlan:
+    """
+    The current plan. Built on first use; afterwards a catalog check (and any
+    rebuild) runs on a background thread so a webhook never waits for it.
+    """
+    global _refreshing
+    if _plan is None:
+        with _lock:
+            return _plan or _build()
+    if time.monotonic() - _checked_at >= SCHEME_CATALOG_CHECK_SECONDS and not _refreshing:
+        with _lock:
+            if not _refreshing:
+                _refreshing = True
+                threading.Thread(target=_refresh_in_background, daemon=True, name="ivr-plan").start()
+    return _plan
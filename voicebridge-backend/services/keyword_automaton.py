@@ -0,0 +1,116 @@
+"""
+VoiceBridge AI — Keyword Automaton
+Aho-Corasick matcher: finds every occurrence of a fixed keyword set in one
+pass over the text, however many keywords there are. Build once at import,
+then call find_all() per message.
+"""
+
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class KeywordAutomaton:
+    """
+    Multi-keyword substring matcher.
+    Each keyword carries a payload (language, category, scheme id...). The same
+    keyword may be added more than once with different payloads.
+    Matching is exact; normalize/lowercase keywords and text the same way.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[str, object]] = ()):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._own: list[list[tuple[str, object]]] = [[]]
+        self._out: list[list[tuple[str, object]]] = [[]]
+        # Memoized full transitions (goto + failure links), filled while matching
+        self._delta: list[dict[str, int]] = [{}]
+        self._built = False
+        for keyword, payload in keywords:
+            self.add(keyword, payload)
+        self.build()
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "KeywordAutomaton":
+        """Rebuilds a compiled automaton from to_state() without recompiling."""
+        automaton = cls()
+        goto, fail, own, out = state
+        automaton._goto, automaton._fail = list(goto), list(fail)
+        automaton._own, automaton._out = list(own), list(out)
+        automaton._delta = [{} for _ in automaton._goto]
+        automaton._built = True
+        return automaton
+
+    def to_state(self) -> tuple:
+        """Compiled tables as plain builtins (marshal/pickle friendly)."""
+        if not self._built:
+            self.build()
+        return (self._goto, self._fail, self._own, self._out)
+
+    def __len__(self):
+        return sum(len(own) for own in self._own)
+
+    def add(self, keyword: str, payload=None):
+        """Adds a keyword. Call build() again before matching."""
+        if not keyword:
+            return
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._own.append([])
+            state = nxt
+        self._own[state].append((keyword, payload))
+        self._built = False
+
+    def build(self):
+        """Computes failure links breadth-first and merges outputs along them."""
+        self._fail = [0] * len(self._goto)
+        self._out = [list(own) for own in self._own]
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+        self._delta = [{} for _ in self._goto]
+        self._built = True
+
+    def _transition(self, state: int, char: str) -> int:
+        """Next state from state on char, following failure links; memoized."""
+        goto, fail = self._goto, self._fail
+        current = state
+        while current and char not in goto[current]:
+            current = fail[current]
+        nxt = goto[current].get(char, 0)
+        self._delta[state][char] = nxt
+        return nxt
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, str, object]]:
+        """Yields (start_index, keyword, payload) for every occurrence, overlaps included."""
+        if not self._built:
+            self.build()
+        delta, out = self._delta, self._out
+        state = 0
+        for index, char in enumerate(text):
+            nxt = delta[state].get(char)
+            state = self._transition(state, char) if nxt is None else nxt
+            if out[state]:
+                for keyword, payload in out[state]:
+                    yield index - len(keyword) + 1, keyword, payload
+
+    def find_all(self, text: str) -> list[tuple[int, str, object]]:
+        return list(self.iter_matches(text))
+
+    def contains_any(self, text: str) -> bool:
+        """True as soon as any keyword is found (stops at the first match)."""
+        for _ in self.iter_matches(text):
+            return True
+        return False
@@ -0,0 +1,108 @@
+"""
+VoiceBridge AI — System Prompt Builder
+Sahaya's system prompt is two blocks: a static prefix shared by every farmer
+(cacheable by Bedrock) and a small dynamic block rendered from a template that
+is split once at import. Scheme JSON, profile JSON and the rendered dynamic
+block are cached by content, so the same farmer reuses them every turn.
+"""
+
+import json
+import re
+from decimal import Decimal
+from services.lru_cache import LRUCache
+
+# Placeholders substituted per turn. Anything else in braces is left as-is.
+PLACEHOLDERS = ("scheme_data", "farmer_profile", "name")
+_PLACEHOLDER_RE = re.compile(r"\{(" + "|".join(PLACEHOLDERS) + r")\}")
+
+
+def _json_default(obj):
+    """
+    Decimal fallback for items that bypassed scheme_store.normalize_item.
+    Catalog records are already plain, so json.dumps never calls this for them.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj) if '.' in str(obj) else int(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _content_key(obj) -> str:
+    """
+    Cache key for JSON-like data. repr() runs in C and is several times
+    cheaper than json.dumps(indent=2); equal content gives an equal key.
+    """
+    return repr(obj)
+
+
+class PromptTemplate:
+    """Template pre-split into literal segments and placeholder slots."""
+
+    def __init__(self, template: str):
+        self.segments: list[str] = []
+        self.slots: list[str] = []
+        pos = 0
+        for match in _PLACEHOLDER_RE.finditer(template):
+            self.segments.append(template[pos:match.start()])
+            self.slots.append(match.group(1))
+            pos = match.end()
+        self.segments.append(template[pos:])
+
+    def render(self, values: dict) -> str:
+        parts = [self.segments[0]]
+        for slot, literal in zip(self.slots, self.segments[1:]):
+            parts.append(values[slot])
+            parts.append(literal)
+        return "".join(parts)
+
+
+class SystemPromptBuilder:
+    """
+    Builds the per-turn system prompt blocks.
+    Two bounded LRUs: JSON fragments (scheme data, profile) and rendered dynamic blocks.
+    """
+
+    def __init__(self, static_prompt: str, dynamic_template: str, maxsize: int = 256):
+        self.static_prompt = static_prompt
+        self.template = PromptTemplate(dynamic_template)
+        self._fragments = LRUCache(maxsize * 2)
+        self._rendered = LRUCache(maxsize)
+
+    def _fragment(self, kind: str, key, data) -> str:
+        return self._fragments.get_or_create(
+            (kind, key),
+            lambda: json.dumps(data, ensure_ascii=False, indent=2, default=_json_default)
+        )
+
+    def build(self, scheme_data: list[dict], farmer_profile: dict, lang_instruction: str = None) -> str:
+        """
+        Returns the dynamic system block for this turn (send it after static_prompt).
+        farmer_profile is FarmerProfile.to_dict(); its 'name' fills {name}.
+        """
+        scheme_key = _content_key(scheme_data)
+        profile_key = _content_key(farmer_profile)
+        cache_key = (lang_instruction, scheme_key, profile_key)
+
+        cached = self._rendered.get(cache_key)
+        if cached is not None:
+            return cached
+
+        values = {
+            "scheme_data": self._fragment("schemes", scheme_key, scheme_data),
+            "farmer_profile": self._fragment("profile", profile_key, farmer_profile),
+            "name": farmer_profile.get("name", "Kisan bhai"),
+        }
+        prompt = self.template.render(values)
+
+        # Prepend language instruction if provided
+        if lang_instruction:
+            prompt = f"LANGUAGE INSTRUCTION (HIGHEST PRIORITY):\n{lang_instruction}\n\n{prompt}"
+
+        self._rendered.set(cache_key, prompt)
+        return prompt
+
+    def stats(self) -> dict:
+        return {"rendered": self._rendered.stats(), "fragments": self._fragments.stats()}
+
+    def clear(self):
+        self._rendered.clear()
+        self._fragments.clear()
@@ -1,5 +1,4 @@
 import os
-import boto3
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -28,7 +27,8 @@ def initiate_outbound_call(farmer_phone, farmer_name, scheme_ids):
     try:
         queue_id = connect_queue_arn.split('/queue/')[-1] if connect_queue_arn else None
         
-        connect_client = boto3.client('connect', region_name=aws_region)
+        from services.aws_clients import get_client
+        connect_client = get_client('connect', aws_region)
         response = connect_client.start_outbound_voice_contact(
             DestinationPhoneNumber=farmer_phone,
             ContactFlowId=connect_contact_flow_id,
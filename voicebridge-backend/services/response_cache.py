@@ -0,0 +1,130 @@
+"""
+VoiceBridge AI — Response Cache
+Most turns are the same few questions ("PM Kisan ke baare mein batao",
+"KCC kya hai", "documents kya chahiye") in the same language. Sahaya's reply
+to them is cached so a repeat skips Bedrock entirely.
+
+Entries are stored as templates: the farmer's name is swapped for a
+placeholder before storing and the current farmer's name is put back on a hit.
+Replies that address the farmer some other way (e.g. a transliterated name)
+are not cached.
+"""
+
+import hashlib
+import re
+import unicodedata
+from services.lru_cache import LRUCache
+
+NAME_PLACEHOLDER = "{name}"
+FIRST_NAME_PLACEHOLDER = "{first_name}"
+
+# Honorifics Sahaya puts after a farmer's name. One left over after the
+# placeholders are substituted means the reply addresses the farmer in a
+# form we cannot swap back (e.g. "Ramesh" written as "रमेश जी").
+_HONORIFIC_RE = re.compile(r"(?<!\w)(ji|जी|ஜி|ಜೀ|ജി|గారు)(?!\w)", re.IGNORECASE)
+_PLACEHOLDER_HONORIFIC_RE = re.compile(
+    r"(\{name\}|\{first_name\})\s*(ji|जी|ஜி|ಜೀ|ജി|గారు)(?!\w)", re.IGNORECASE
+)
+
+# Punctuation and symbols are dropped; letters, digits and combining marks
+# (matras, viramas) are kept so Indic words survive intact
+_DROP_CATEGORIES = ("P", "S")
+
+
+def normalize_question(message: str) -> str:
+    """NFC, lowercase, punctuation stripped, whitespace collapsed."""
+    text = unicodedata.normalize("NFC", message or "").lower()
+    text = "".join(
+        " " if unicodedata.category(ch)[0] in _DROP_CATEGORIES else ch
+        for ch in text
+    )
+    return " ".join(text.split())
+
+
+def _first_name(name: str) -> str:
+    parts = name.split()
+    return parts[0] if len(parts) > 1 else ""
+
+
+def _replace_word(text: str, word: str, replacement: str) -> str:
+    """Replaces whole-word occurrences only ("Ram" must not touch "Ramesh")."""
+    return re.sub(rf"(?<!\w){re.escape(word)}(?!\w)", lambda _: replacement, text)
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of reply templates keyed by
+    (language, scheme ids, context, profile facets, normalized message).
+    context is "opening" or the fingerprint of the previous reply, so "haan"
+    only matches "haan" said after the same question.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl_seconds: float | None = 3600):
+        self._cache = LRUCache(maxsize, ttl_seconds)
+        self.skipped = 0
+
+    @staticmethod
+    def make_key(message: str, lang_instruction: str, scheme_ids: list[str],
+                 stage: str, facets: tuple = ()) -> tuple | None:
+        """Returns the cache key, or None if the message has nothing to key on."""
+        question = normalize_question(message)
+        if not question:
+            return None
+        return (lang_instruction or "", tuple(scheme_ids or ()), stage, facets, question)
+
+    @staticmethod
+    def context_fingerprint(text: str, farmer_name: str) -> str:
+        """
+        Short digest of a previous turn (normally Sahaya's last reply), with the
+        farmer's name swapped out so the same reply to another farmer matches.
+        """
+        template = text or ""
+        name = (farmer_name or "").strip()
+        if name:
+            template = _replace_word(template, name, NAME_PLACEHOLDER)
+            first = _first_name(name)
+            if first:
+                # One marker for both: "Ramesh ji" and "Lakshmi ji" are the same question
+                template = _replace_word(template, first, NAME_PLACEHOLDER)
+        return hashlib.sha1(normalize_question(template).encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: tuple, farmer_name: str) -> str | None:
+        """Returns the cached reply personalized for farmer_name, or None."""
+        template = self._cache.get(key)
+        if template is None:
+            return None
+        name = (farmer_name or "").strip() or "Kisan bhai"
+        return template.replace(NAME_PLACEHOLDER, name).replace(
+            FIRST_NAME_PLACEHOLDER, _first_name(name) or name
+        )
+
+    def put(self, key: tuple, response_text: str, farmer_name: str) -> bool:
+        """Stores a reply as a template. Returns False if it was not cacheable."""
+        template = self._to_template(response_text, farmer_name)
+        if template is None:
+            self.skipped += 1
+            return False
+        self._cache.set(key, template)
+        return True
+
+    @staticmethod
+    def _to_template(response_text: str, farmer_name: str) -> str | None:
+        if not response_text or not response_text.strip():
+            return None
+        template = response_text
+        name = (farmer_name or "").strip()
+        if name:
+            template = _replace_word(template, name, NAME_PLACEHOLDER)
+            first = _first_name(name)
+            if first:
+                template = _replace_word(template, first, FIRST_NAME_PLACEHOLDER)
+        # Any honorific not attached to a placeholder is a name we could not swap
+        if _HONORIFIC_RE.search(_PLACEHOLDER_HONORIFIC_RE.sub("", template)):
+            return None
+        return template
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "not_cacheable": self.skipped}
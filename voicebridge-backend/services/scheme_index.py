@@ -0,0 +1,236 @@
+"""
+VoiceBridge AI — Scheme Keyword Index
+Finds which schemes a farmer is asking about, in every supported language.
+
+One Aho-Corasick automaton is compiled from two sources, so a message is
+scanned once (NFC-normalized, lowercased) however many schemes there are:
+  aliases  — hand-curated per-language names and speech-to-text variants
+             (SCHEME_ALIASES); matched anywhere, weight ALIAS_WEIGHT
+  keywords — the 'keywords' field of each scheme in the catalog; broader,
+             so matched as whole words only, weight KEYWORD_WEIGHT, and
+             everyday words (GENERIC_KEYWORDS) are left out
+
+A keyword that lies inside a longer match for another scheme ("kisan" in
+"kisan credit") is ignored; overlapping keywords of one scheme count as one
+mention. Schemes are ranked by total weight, then by where they were first
+mentioned.
+"""
+
+import unicodedata
+from dataclasses import dataclass, field
+from services.keyword_automaton import KeywordAutomaton
+
+ALIAS_WEIGHT = 3
+KEYWORD_WEIGHT = 1
+
+# Scheme names as farmers say them (and as speech-to-text writes them)
+SCHEME_ALIASES = {
+    "PM_KISAN": {
+        "en": [
+            'pm kisan', 'pmkisan', 'pm-kisan', 'kisan samman', 'kisaan samman', '6000',
+            'kisan yojana', 'kisaan', 'pihem kisan', 'piem kisan', '₹6000', 'rupees 6000',
+        ],
+        "hi": [
+            'पीएम किसान', 'किसान सम्मान', 'पी एम किसान',
+        ],
+        "ml": [
+            'പി എം കിസാൻ', 'പിഎം കിസാൻ', 'കിസാൻ സമ്മാൻ',
+        ],
+        "ta": [
+            'கிசான்', 'பிஎம் கிசான்', 'கிசான் சம்மான்',
+        ],
+    },
+    "KCC": {
+        "en": [
+            'kcc', 'kisan credit', 'kisaan credit', 'credit card', 'kisan card', 'crop loan', 'kisan loan',
+            '4 percent', '4%', 'si si si', 'see see see', 'kisan lon', '4 pratishat', 'kscc',
+        ],
+        "hi": [
+            'किसान क्रेडिट', 'केसीसी', 'क्रेडिट कार्ड', 'सीसीसी', 'केसी',
+        ],
+    },
+    "PMFBY": {
+        "en": [
+            'pmfby', 'fasal bima', 'crop insurance', 'fasal bima yojana', 'bima yojana',
+            'crop loss', 'fasal insurance', 'piem ef bi', 'crop bima', 'bima scheme', 'silk',
+        ],
+        "hi": [
+            'फसल बीमा', 'पीएमएफबीवाई', 'फसल',
+        ],
+        "ml": [
+            'ഫസൽ ബീമ', 'വിള ഇൻഷുറൻസ്', 'പിഎംഎഫ്ബിവൈ',
+        ],
+        "ta": [
+            'பயிர് காப்பீடு', 'பிஎம்எஃப்பिઓય', 'பயிர்', 'விளை',
+        ],
+    },
+    "MGNREGS": {
+        "en": [
+            'mgnrega', 'mnrega', 'manrega', 'nrega', '100 days', 'job card', 'rozgar', '100 din',
+        ],
+        "hi": [
+            'मनरेगा', 'रोजगार',
+        ],
+    },
+    "AYUSHMAN_BHARAT": {
+        "en": [
+            'ayushman', 'ayushman card', 'pmjay', 'health insurance', '5 lakh', 'free hospital', 'free treatment',
+            '5 lakh health',
+        ],
+        "hi": [
+            'आयुष्मान',
+        ],
+    },
+    "PM_AWAS_GRAMIN": {
+        "en": [
+            'pm awas', 'pmay', 'awas yojana', 'house scheme', 'pucca house', 'ghar yojana',
+        ],
+        "hi": [
+            'आवास योजना',
+        ],
+    },
+    "SOIL_HEALTH_CARD": {
+        "en": [
+            'soil health', 'soil card', 'mitti', 'soil test', 'fertilizer',
+        ],
+        "hi": [
+            'मृदा स्वास्थ्य',
+        ],
+    },
+}
+
+
+# Everyday words that are catalog keywords but say nothing about which scheme
+# a farmer means ("main kisan hoon", "loan chahiye", "beti ki padhai"). They
+# are not indexed on their own; longer keywords and aliases containing them
+# ("kisan credit card") still match.
+GENERIC_KEYWORDS = frozenset({
+    'kisan', 'loan', 'credit', 'ghar', 'makaan', 'housing', 'beti', 'daughter', 'hospital', 'medical',
+    'ilaaj', 'pension', 'retirement', 'savings', 'food', 'anaj', 'rice', 'wheat', 'employment',
+    'किसान', 'लोन', 'घर', 'मकान', 'बेटी', 'लड़की', 'अस्पताल', 'पेंशन', 'बचत', 'अनाज',
+})
+
+
+def normalize_message(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "").lower()
+
+
+def _is_word_char(ch: str) -> bool:
+    # Letters, combining vowel signs/viramas and digits all continue a word
+    return unicodedata.category(ch)[0] in "LMN"
+
+
+def _whole_word(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not _is_word_char(text[start - 1])) and \
+           (end == len(text) or not _is_word_char(text[end]))
+
+
+def _malayalam_kcc(text: str) -> int:
+    """
+    Malayalam speech-to-text writes KCC as കെ സി സി, കെ സി പറ്റി, കെസി...:
+    any word with both 'കെ' and 'സ'. Returns the word's offset, or -1.
+    """
+    if "കെ" not in text or "സ" not in text:
+        return -1
+    offset = 0
+    for word in text.split(" "):
+        if "കെ" in word and "സ" in word:
+            return offset
+        offset += len(word) + 1
+    return -1
+
+
+def scheme_keywords(scheme: dict) -> list[str]:
+    """A scheme's catalog keywords, normalized, without GENERIC_KEYWORDS."""
+    keywords = (normalize_message(keyword).strip() for keyword in scheme.get("keywords") or [])
+    return [keyword for keyword in keywords if keyword and keyword not in GENERIC_KEYWORDS]
+
+
+@dataclass
+class SchemeMatch:
+    scheme_id: str
+    score: int
+    position: int
+    keywords: list[str] = field(default_factory=list)
+
+
+class SchemeKeywordIndex:
+    """Compiled alias + catalog keyword index. Build once per catalog version."""
+
+    def __init__(self, schemes: list[dict] = (), aliases: dict = None):
+        aliases = SCHEME_ALIASES if aliases is None else aliases
+        entries = {}
+        for scheme_id, by_language in aliases.items():
+            for keywords in by_language.values():
+                for keyword in keywords:
+                    entries[(normalize_message(keyword), scheme_id)] = (ALIAS_WEIGHT, False)
+        for scheme in schemes:
+            for keyword in scheme_keywords(scheme):
+                entries.setdefault((keyword, scheme["scheme_id"]), (KEYWORD_WEIGHT, True))
+
+        self._automaton = KeywordAutomaton(
+            (keyword, (scheme_id, weight, whole_word))
+            for (keyword, scheme_id), (weight, whole_word) in entries.items()
+            if keyword.strip()
+        )
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "SchemeKeywordIndex":
+        """Index from to_state() (e.g. a catalog bundle), skipping compilation."""
+        index = cls.__new__(cls)
+        index._automaton = KeywordAutomaton.from_state(state)
+        return index
+
+    def to_state(self) -> tuple:
+        return self._automaton.to_state()
+
+    def __len__(self) -> int:
+        return len(self._automaton)
+
+    def match(self, message: str, limit: int = None) -> list[SchemeMatch]:
+        """Ranked schemes mentioned in message (best first)."""
+        text = normalize_message(message)
+        hits = []
+        for start, keyword, (scheme_id, weight, whole_word) in self._automaton.iter_matches(text):
+            end = start + len(keyword)
+            if whole_word and not _whole_word(text, start, end):
+                continue
+            hits.append((start, end, keyword, scheme_id, weight))
+
+        matches: dict[str, SchemeMatch] = {}
+        cluster_end: dict[str, int] = {}
+        cluster_weight: dict[str, int] = {}
+        # Furthest end of a span seen so far per scheme (hits sorted by start, longest first)
+        reach: dict[str, tuple] = {}
+        for start, end, keyword, scheme_id, weight in sorted(hits, key=lambda h: (h[0], -h[1])):
+            # Part of a longer phrase naming a different scheme
+            if any(e >= end and (s, e) != (start, end) and sid != scheme_id
+                   for sid, (s, e) in reach.items()):
+                continue
+            if end > reach.get(scheme_id, (0, -1))[1]:
+                reach[scheme_id] = (start, end)
+            found = matches.get(scheme_id)
+            if found is None:
+                found = matches[scheme_id] = SchemeMatch(scheme_id, 0, start)
+            if keyword not in found.keywords:
+                found.keywords.append(keyword)
+            # Overlapping keywords are one mention, worth its strongest keyword
+            if start < cluster_end.get(scheme_id, -1):
+                if weight > cluster_weight[scheme_id]:
+                    found.score += weight - cluster_weight[scheme_id]
+                    cluster_weight[scheme_id] = weight
+                cluster_end[scheme_id] = max(cluster_end[scheme_id], end)
+            else:
+                found.score += weight
+                cluster_end[scheme_id], cluster_weight[scheme_id] = end, weight
+
+        if "KCC" not in matches:
+            position = _malayalam_kcc(text)
+            if position >= 0:
+                matches["KCC"] = SchemeMatch("KCC", ALIAS_WEIGHT, position, ["കെ+സ"])
+
+        ranked = sorted(matches.values(), key=lambda m: (-m.score, m.position))
+        return ranked[:limit] if limit else ranked
+
+    def match_ids(self, message: str, limit: int = None) -> list[str]:
+        return [m.scheme_id for m in self.match(message, limit)]
@@ -0,0 +1,115 @@
+"""
+VoiceBridge AI — Scheme Retrieval
+Picks the few schemes worth putting in Sahaya's prompt for this message and
+farmer, so the prompt stays within budget as state schemes are added.
+
+Okapi BM25 over each scheme's text (names, benefit, eligibility, keywords and
+the multilingual SCHEME_ALIASES), fully offline. The per-(term, scheme) BM25
+weights are query-independent, so they are computed once per catalog version;
+a query is a tokenize plus a few dict lookups.
+
+The farmer's profile re-ranks: schemes they do not qualify for score
+INELIGIBLE_FACTOR of their text score. A message with no scheme terms at all
+(greetings, the opening turn) gets the eligible schemes in catalog order,
+i.e. the opening menu.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from services.scheme_index import SCHEME_ALIASES, normalize_message
+
+# Okapi BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Names and aliases count this many times towards a term's frequency
+NAME_BOOST = 2
+INELIGIBLE_FACTOR = 0.5
+
+# Letters and digits of every script, plus the Indic blocks' vowel signs and
+# viramas (which \w alone would split words on)
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0DFF]+")
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3})")
+
+
+def tokenize(text: str) -> list[str]:
+    """NFC-lowercased word tokens; '6,000' stays one token."""
+    text = _THOUSANDS_RE.sub("", normalize_message(text))
+    return [token for token in _TOKEN_RE.findall(text) if len(token) > 1 or token.isdigit()]
+
+
+def scheme_text(scheme: dict, aliases: dict = None) -> tuple[list[str], list[str]]:
+    """(name tokens, body tokens) of one scheme."""
+    aliases = SCHEME_ALIASES if aliases is None else aliases
+    names = [scheme.get("scheme_id", "").replace("_", " "), scheme.get("name_en") or "",
+             scheme.get("name_hi") or ""]
+    names += [alias for by_language in aliases.get(scheme.get("scheme_id"), {}).values() for alias in by_language]
+    body = [scheme.get("benefit") or "", scheme.get("apply_at") or ""]
+    body += list(scheme.get("eligibility") or []) + list(scheme.get("keywords") or [])
+    return tokenize(" ".join(names)), tokenize(" ".join(body))
+
+
+@dataclass
+class SchemeHit:
+    scheme_id: str
+    score: float
+
+
+class SchemeRetriever:
+    """BM25 index over the catalog. Build once per catalog version."""
+
+    def __init__(self, schemes: list[dict] = (), aliases: dict = None):
+        self.scheme_ids = [scheme["scheme_id"] for scheme in schemes]
+        term_counts = []
+        for scheme in schemes:
+            names, body = scheme_text(scheme, aliases)
+            counts = {}
+            for token in names:
+                counts[token] = counts.get(token, 0) + NAME_BOOST
+            for token in body:
+                counts[token] = counts.get(token, 0) + 1
+            term_counts.append(counts)
+
+        total = len(term_counts)
+        lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = (sum(lengths) / total) if total else 1.0
+        doc_freq = {}
+        for counts in term_counts:
+            for term in counts:
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+
+        # term -> ((scheme position, BM25 weight), ...)
+        self._postings: dict[str, tuple] = {}
+        for position, (counts, length) in enumerate(zip(term_counts, lengths)):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+            for term, tf in counts.items():
+                idf = math.log(1 + (total - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                weight = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                self._postings.setdefault(term, []).append((position, weight))
+        self._postings = {term: tuple(postings) for term, postings in self._postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.scheme_ids)
+
+    def search(self, message: str, limit: int = 3, eligible=None) -> list[SchemeHit]:
+        """
+        Top `limit` schemes for message, best first. eligible (optional) is the
+        set of scheme_ids the farmer qualifies for; it re-ranks, and is the
+        fallback when the message mentions no scheme terms.
+        """
+        scores = {}
+        for term in set(tokenize(message)):
+            for position, weight in self._postings.get(term, ()):
+                scores[position] = scores.get(position, 0.0) + weight
+
+        if eligible is not None:
+            for position in scores:
+                if self.scheme_ids[position] not in eligible:
+                    scores[position] *= INELIGIBLE_FACTOR
+        if not scores:
+            if eligible is None:
+                return []
+            return [SchemeHit(sid, 0.0) for sid in self.scheme_ids if sid in eligible][:limit]
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [SchemeHit(self.scheme_ids[position], score) for position, score in ranked]
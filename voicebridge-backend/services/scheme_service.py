@@ -4,197 +4,461 @@ Matches farmer profiles and messages to eligible welfare schemes.
 Data source: local JSON (mock) or DynamoDB (AWS).
 """
 
+import hashlib
 import json
-import re
-from config.settings import USE_MOCK, DYNAMODB_TABLE_NAME, AWS_REGION
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from config.settings import (
+    USE_MOCK,
+    DYNAMODB_TABLE_NAME,
+    SCHEME_CATALOG_CHECK_SECONDS,
+    SCHEME_FUZZY_MIN_CONFIDENCE,
+    FUZZY_MAX_WORDS,
+    SCHEME_PROMPT_TOP_K,
+    SMS_MAX_SEGMENTS,
+    SCHEME_BUNDLE_PATH,
+)
 from models.farmer import FarmerProfile
 
-if not USE_MOCK:
-    import boto3
+from services.aws_clients import get_resource
+from services.scheme_store import PROMPT_FIELDS, SMS_FIELDS, SUMMARY_FIELDS, batch_get, normalize_item, normalize_value, scan_all
+from services.eligibility_engine import SchemeRule, compile_rules, evaluate
+from services.scheme_index import GENERIC_KEYWORDS, SCHEME_ALIASES, SchemeKeywordIndex, scheme_keywords
+from services.catalog_bundle import file_sha1, read_bundle, write_bundle
+from services.fuzzy_matcher import FuzzySchemeMatcher
+from services.scheme_retrieval import SchemeRetriever
+from services.sms_composer import SmsMessage, compose, sms_parts
+from services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+SCHEMES_PATH = Path(__file__).resolve().parent.parent / "data" / "schemes.json"
+
+# DynamoDB item holding the catalog version. Bump its 'version' attribute
+# after editing schemes and every instance reloads within one check interval.
+CATALOG_META_ID = "__catalog_meta__"
+
+# Sahaya's name in Devanagari, for the header of Hindi SMS
+SAHAYA_NATIVE_NAME = "सहायक"
+
+
+def _aliases_digest() -> str:
+    # The stoplist changes the compiled index too, so it invalidates bundles
+    return hashlib.sha1(repr((sorted(SCHEME_ALIASES.items()), sorted(GENERIC_KEYWORDS))).encode("utf-8")).hexdigest()
+
+
+def compile_catalog(schemes: list[dict]) -> tuple:
+    """(rules, keyword index, SMS parts by scheme_id) for a list of schemes."""
+    return (compile_rules(schemes), SchemeKeywordIndex(schemes),
+            {scheme["scheme_id"]: sms_parts(scheme) for scheme in schemes})
+
+
+def build_bundle(path, schemes: list[dict], source: str, version) -> int:
+    """
+    Compiles schemes into a catalog bundle at path (see services/catalog_bundle.py).
+    source is 'json' (version: SHA-1 of schemes.json) or 'dynamodb'
+    (version: the CATALOG_META_ID item's version). Returns the size in bytes.
+    """
+    rules, index, sms = compile_catalog(schemes)
+    return write_bundle(
+        path, source=source, version=version, schemes=schemes,
+        rules=[(rule.scheme_id, *rule.requirements) for rule in rules],
+        index_state=(_aliases_digest(), index.to_state()), sms=sms,
+    )
+
+
+class SchemeCatalog:
+    """
+    All schemes, loaded once and indexed by scheme_id.
+
+    Mock: reloads when data/schemes.json's mtime changes.
+    AWS:  reloads when the version attribute of the CATALOG_META_ID item changes
+          (or on every check if the table has no such item).
+    The source is checked at most once per check_interval seconds, so lookups
+    between checks never touch disk or DynamoDB.
+
+    Records are normalized once at load (scheme_store.normalize_item) and kept
+    read-only (MappingProxyType of ints/floats/strings/tuples), so the shared
+    copies cannot be modified by callers and json.dumps needs no Decimal hook.
+
+    The first load uses the deploy-time bundle at bundle_path when it matches
+    the source: mock compares schemes.json's SHA-1 up front; AWS installs it
+    immediately and compares the meta version on a background thread
+    (self.verifier), reloading from DynamoDB if the table has moved on.
+    """
+
+    def __init__(self, path: Path = SCHEMES_PATH, check_interval: float = SCHEME_CATALOG_CHECK_SECONDS,
+                 bundle_path=SCHEME_BUNDLE_PATH):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.bundle_path = Path(bundle_path) if bundle_path else None
+        self.version = None
+        self.loads = 0
+        self.from_bundle = False
+        self.verifier = None
+        self._schemes: list[dict] = []
+        self._by_id: dict[str, dict] = {}
+        self._rules = []
+        self._index = SchemeKeywordIndex()
+        self._sms: dict[str, dict] = {}
+        self._positions: dict[str, int] = {}
+        self._fuzzy = None
+        self._retriever = None
+        self._loaded = False
+        self._bundle_tried = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # ── Source access ──
+
+    def _source_version(self):
+        if USE_MOCK:
+            try:
+                return os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                raise Exception("data/schemes.json not found. Create schemes.json first.")
+        table = get_resource("dynamodb").Table(DYNAMODB_TABLE_NAME)
+        item = table.get_item(Key={"scheme_id": CATALOG_META_ID}).get("Item")
+        return normalize_value(item.get("version")) if item else None
+
+    def _load_source(self) -> list[dict]:
+        if USE_MOCK:
+            # Load from local JSON file
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    schemes = json.load(f)
+                return [normalize_item(scheme) for scheme in schemes or []]
+            except FileNotFoundError:
+                raise Exception("data/schemes.json not found. Create schemes.json first.")
+            except json.JSONDecodeError:
+                raise Exception("data/schemes.json is not valid JSON.")
+        # Load from DynamoDB (every page of every segment)
+        return [item for item in scan_all() if item.get("scheme_id") != CATALOG_META_ID]
+
+    # ── Bundle ──
+
+    def _load_bundle(self) -> bool:
+        """Installs the deploy-time bundle if it fits this source. Called once, under the lock."""
+        self._bundle_tried = True
+        if not self.bundle_path:
+            return False
+        bundle = read_bundle(self.bundle_path)
+        if not bundle or bundle["source"] != ("json" if USE_MOCK else "dynamodb"):
+            return False
+        digest, index_state = bundle["index"]
+        if digest != _aliases_digest():
+            return False
+        if USE_MOCK:
+            try:
+                if file_sha1(self.path) != bundle["version"]:
+                    return False
+            except FileNotFoundError:
+                return False
+            version = self._source_version()
+        else:
+            version = bundle["version"]
+        schemes = bundle["schemes"]
+        self._install(schemes, [SchemeRule(*rule) for rule in bundle["rules"]],
+                      SchemeKeywordIndex.from_state(index_state), bundle["sms"], version)
+        self.from_bundle = True
+        logger.info(f"[CATALOG] Loaded {len(schemes)} schemes from bundle (version {bundle['version']})")
+        if not USE_MOCK:
+            self.verifier = threading.Thread(target=self._verify_bundle, args=(version,),
+                                             name="catalog-bundle-verify", daemon=True)
+            self.verifier.start()
+        return True
+
+    def _verify_bundle(self, bundle_version):
+        try:
+            live = self._source_version()
+        except Exception as e:
+            logger.warning(f"[CATALOG] Could not verify bundle version: {e}")
+            return
+        if live is None or live != bundle_version:
+            logger.info(f"[CATALOG] Bundle version {bundle_version} is stale (live {live}), reloading")
+            self.invalidate()
+
+    # ── Freshness ──
+
+    def _install(self, schemes: list[dict], rules: list, index: SchemeKeywordIndex, sms: dict, version):
+        schemes = [MappingProxyType(scheme) for scheme in schemes]
+        self._schemes = schemes
+        self._by_id = {scheme["scheme_id"]: scheme for scheme in schemes}
+        self._rules = list(zip(schemes, rules))
+        self._index = index
+        self._sms = sms
+        self._positions = {scheme["scheme_id"]: i for i, scheme in enumerate(schemes)}
+        self._fuzzy = None
+        self._retriever = None
+        self.version = version
+        self._loaded = True
+        self.loads += 1
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._loaded and now - self._checked_at < self.check_interval:
+                return
+            if not self._loaded and not self._bundle_tried and self._load_bundle():
+                self._checked_at = time.monotonic()
+                return
+            version = self._source_version()
+            if not self._loaded or version is None or version != self.version:
+                schemes = self._load_source()
+                self._install(schemes, *compile_catalog(schemes), version)
+                self.from_bundle = False
+                logger.info(f"[CATALOG] Loaded {len(schemes)} schemes (version {version})")
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Forces a reload on the next lookup."""
+        with self._lock:
+            self._loaded = False
+
+    # ── Lookups ──
+
+    def all(self) -> list[dict]:
+        self._refresh()
+        return self._schemes
+
+    def rules(self) -> list[tuple]:
+        """(scheme, SchemeRule) pairs compiled at load time."""
+        self._refresh()
+        return self._rules
+
+    def index(self) -> SchemeKeywordIndex:
+        """Keyword index over SCHEME_ALIASES and the schemes' keywords."""
+        self._refresh()
+        return self._index
+
+    def fuzzy(self) -> FuzzySchemeMatcher:
+        """Phonetic matcher over the aliases and scheme keywords, built on first use."""
+        self._refresh()
+        fuzzy = self._fuzzy
+        if fuzzy is None:
+            names = {sid: [k for keywords in by_language.values() for k in keywords]
+                     for sid, by_language in SCHEME_ALIASES.items()}
+            for scheme in self._schemes:
+                names.setdefault(scheme["scheme_id"], []).extend(scheme_keywords(scheme))
+            fuzzy = self._fuzzy = FuzzySchemeMatcher(names, max_words=FUZZY_MAX_WORDS)
+        return fuzzy
+
+    def retriever(self) -> SchemeRetriever:
+        """BM25 index over the schemes' text, built on first use."""
+        self._refresh()
+        retriever = self._retriever
+        if retriever is None:
+            retriever = self._retriever = SchemeRetriever(self._schemes)
+        return retriever
+
+    def get(self, scheme_id: str) -> dict | None:
+        self._refresh()
+        return self._by_id.get(scheme_id)
+
+    def sms_parts(self, scheme_id: str) -> dict | None:
+        """Precomputed sms_composer.sms_parts() of a catalog scheme, None if unknown."""
+        self._refresh()
+        return self._sms.get(scheme_id)
+
+    def position(self, scheme_id: str) -> int:
+        """Index of scheme_id in catalog order (unknown ids sort last)."""
+        return self._positions.get(scheme_id, len(self._positions))
+
+    def get_many(self, scheme_ids: list[str]) -> list[dict]:
+        """Schemes for scheme_ids in the given order; unknown ids are skipped."""
+        self._refresh()
+        return [self._by_id[sid] for sid in scheme_ids if sid in self._by_id]
+
+
+# Process-wide catalog used by every function below
+catalog = SchemeCatalog()
 
 
 def get_all_schemes() -> list[dict]:
     """
     Returns all 10 welfare schemes as list of dicts.
-    Mock: reads data/schemes.json
-    AWS: scans DynamoDB welfare_schemes table
+    Mock: data/schemes.json
+    AWS: DynamoDB welfare_schemes table
+    Served from the in-memory catalog; callers get copies they may modify.
     """
-    if USE_MOCK:
-        # Load from local JSON file
-        try:
-            with open("data/schemes.json", "r", encoding="utf-8") as f:
-                schemes = json.load(f)
-            return schemes if schemes else []
-        except FileNotFoundError:
-            raise Exception("data/schemes.json not found. Create schemes.json first.")
-        except json.JSONDecodeError:
-            raise Exception("data/schemes.json is not valid JSON.")
-    else:
-        # Load from DynamoDB
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-        table = dynamodb.Table(DYNAMODB_TABLE_NAME)
-        response = table.scan()
-        return response.get("Items", [])
+    return [dict(scheme) for scheme in catalog.all()]
 
 
 def get_scheme_by_id(scheme_id: str) -> dict | None:
     """
     Returns single scheme dict or None if not found.
     """
-    if USE_MOCK:
-        with open("data/schemes.json", "r", encoding="utf-8") as f:
-            schemes = json.load(f)
-        for scheme in schemes:
-            if scheme["scheme_id"] == scheme_id:
-                return scheme
-        return None
-    else:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-        table = dynamodb.Table(DYNAMODB_TABLE_NAME)
-        response = table.get_item(Key={"scheme_id": scheme_id})
-        return response.get("Item", None)
+    scheme = catalog.get(scheme_id)
+    return dict(scheme) if scheme else None
+
 
+def _project(scheme: dict, fields) -> dict:
+    if not fields:
+        return dict(scheme)
+    return {field: scheme[field] for field in fields if field in scheme}
 
-def match_schemes_to_message(message: str) -> list[str]:
+
+def get_schemes_by_ids(scheme_ids: list[str], fields=None) -> list[dict]:
     """
-    Match user message to relevant scheme IDs.
-    Comprehensive keyword matching with punctuation removal for better matching.
+    Returns scheme dicts for scheme_ids (in order), skipping unknown ids.
+    fields limits the attributes returned (e.g. PROMPT_FIELDS, SMS_FIELDS).
+    AWS: schemes added since the catalog's last reload are fetched in one
+    BatchGetItem instead of one get_item each.
+    """
+    scheme_ids = scheme_ids or []
+    found = {sid: catalog.get(sid) for sid in scheme_ids}
+    missing = [sid for sid, scheme in found.items() if scheme is None]
+    if missing and not USE_MOCK:
+        try:
+            found.update(batch_get(missing, fields))
+        except Exception as e:
+            logger.error(f"[SCHEMES] batch_get failed for {missing}: {e}")
+    return [_project(found[sid], fields) for sid in scheme_ids if found.get(sid)]
+
+
+def match_schemes_to_message(message: str, limit: int = None) -> list[str]:
+    """
+    Match user message to relevant scheme IDs, best match first.
+    One pass over the message with the catalog's multilingual keyword index.
     """
     if not message:
         return []
-    
-    msg = message.lower()
-    # Remove punctuation for better matching
-    import re
-    msg = re.sub(r'[।!?.,]', ' ', msg)
-    matched = []
-    
-    checks = [
-        ('PM_KISAN', ['pm kisan', 'pmkisan', 'pm-kisan', 'kisan samman',
-                      'kisaan samman', '6000', 'kisan yojana',
-                      'पीएम किसान',
-                      'किसान सम्मान']),
-        ('KCC',      ['kcc', 'kisan credit', 'credit card', 'kisan card',
-                      'crop loan', 'kisan loan', '4 percent', '4%',
-                      'किसान क्रेडिट',
-                      'केसीसी',
-                      'क्रेडिट कार्ड']),
-        ('PMFBY',    ['pmfby', 'fasal bima', 'crop insurance',
-                      'fasal bima yojana', 'bima yojana', 'crop loss',
-                      'फसल बीमा',
-                      'पीएमएफबीवाई']),
-        ('MGNREGS',  ['mgnrega', 'mnrega', 'manrega', 'nrega',
-                      '100 days', 'job card', 'rozgar', '100 din',
-                      'मनरेगा',
-                      'रोजगार']),
-        ('AYUSHMAN_BHARAT', ['ayushman', 'pmjay', 'health insurance',
-                             '5 lakh', 'free hospital', 'free treatment',
-                             'आयुष्मान']),
-        ('PM_AWAS_GRAMIN', ['pm awas', 'pmay', 'awas yojana', 
-                            'house scheme', 'pucca house', 'ghar yojana',
-                            'आवास योजना']),
-        ('SOIL_HEALTH_CARD', ['soil health', 'soil card', 'mitti',
-                              'soil test', 'fertilizer',
-                              'मृदा स्वास्थ्य']),
-    ]
-    
-    for scheme_id, keywords in checks:
-        for kw in keywords:
-            if kw in msg:
-                matched.append(scheme_id)
-                break
-    
-    return matched
+    return catalog.index().match_ids(message, limit)
+
+
+def match_schemes_fuzzy(message: str, limit: int = 3) -> list:
+    """
+    Misheard scheme names (noisy STT), most confident first, as FuzzyMatch
+    (scheme_id, confidence 0-1, alias, heard). Callers decide whether a
+    confidence is enough to act on or whether to ask the farmer again.
+    """
+    if not message:
+        return []
+    return catalog.fuzzy().match(message, limit)
+
+
+def detect_schemes(message: str, limit: int = None) -> tuple[list[str], float]:
+    """
+    Exact keyword matches first; if there are none, the best fuzzy match at or
+    above SCHEME_FUZZY_MIN_CONFIDENCE. Returns (scheme_ids, confidence).
+    """
+    exact = match_schemes_to_message(message, limit)
+    if exact:
+        return exact, 1.0
+    fuzzy = match_schemes_fuzzy(message, limit=1)
+    if fuzzy and fuzzy[0].confidence >= SCHEME_FUZZY_MIN_CONFIDENCE:
+        return [fuzzy[0].scheme_id], fuzzy[0].confidence
+    return [], fuzzy[0].confidence if fuzzy else 0.0
+
+
+def prompt_schemes(message: str, scheme_ids: list[str], farmer: FarmerProfile = None,
+                   limit: int = SCHEME_PROMPT_TOP_K) -> list[dict]:
+    """
+    Scheme data for Sahaya's prompt: PROMPT_FIELDS of every scheme the farmer
+    named (scheme_ids), then SUMMARY_FIELDS of the best retrieved schemes for
+    this message and profile, up to limit schemes in total. With nothing named
+    or matched, the retrieved ones are the schemes the farmer qualifies for.
+    """
+    scheme_ids = list(scheme_ids or [])
+    data = get_schemes_by_ids(scheme_ids, PROMPT_FIELDS)
+    room = limit - len(data)
+    if room <= 0:
+        return data
+    eligible = None if farmer is None else {
+        scheme["scheme_id"] for scheme, rule in catalog.rules() if not rule.failures(farmer)
+    }
+    hits = catalog.retriever().search(message or "", limit + len(scheme_ids), eligible)
+    extra = [hit.scheme_id for hit in hits if hit.scheme_id not in scheme_ids][:room]
+    return data + get_schemes_by_ids(extra, SUMMARY_FIELDS)
+
+
+# Why a farmer who meets a scheme's requirements should care about it
+ELIGIBILITY_REASONS = {
+    "PM_KISAN": "You have a bank account, which is required for PM-KISAN direct benefit transfers.",
+    "KCC": "You have a bank account, which is required for KCC loan account operations.",
+    "PMFBY": "You have a bank account, which is required for crop insurance premium deduction.",
+    "AYUSHMAN_BHARAT": "Ayushman Bharat provides health insurance to all eligible household members.",
+    "MGNREGS": "MGNREGS provides guaranteed employment to all rural adults seeking work.",
+    "SOIL_HEALTH_CARD": "All farmers are eligible for free soil testing and crop recommendations.",
+    "PM_AWAS_GRAMIN": "PM Awas Gramin provides housing subsidy for rural households.",
+    "NFSA_RATION": "NFSA provides subsidized food grains to priority households.",
+    "SUKANYA_SAMRIDDHI": "Sukanya Samriddhi is available for girl children. Share this with parents who have young daughters.",
+}
+
+
+def _eligibility_reason(scheme: dict, farmer: FarmerProfile) -> str:
+    scheme_id = scheme["scheme_id"]
+    if scheme_id == "ATAL_PENSION":
+        # APY enrollment closes at age 40
+        if farmer.age < 40:
+            return f"You are {farmer.age} years old and have a bank account. APY enrollment must happen before age 40."
+        return "Your age exceeds the APY enrollment limit (40 years). Consider other pension schemes."
+    return ELIGIBILITY_REASONS.get(scheme_id) or (
+        f"You meet the land, KCC, bank account and income requirements for {scheme.get('name_en') or scheme_id}."
+    )
 
 
 def check_eligibility(farmer: FarmerProfile) -> list[dict]:
     """
-    Checks ALL 10 schemes against farmer's profile.
+    Checks ALL schemes against farmer's profile using the rules compiled from
+    each scheme's min_land_acres, requires_kcc, requires_bank_account and
+    income_limit.
     Returns list of eligible scheme dicts with reason_eligible field added.
     """
-    schemes = get_all_schemes()
     eligible = []
-    
-    for scheme in schemes:
-        scheme_id = scheme["scheme_id"]
-        reason = None
-        
-        # Eligibility rules per scheme
-        if scheme_id == "PM_KISAN":
-            if farmer.has_bank_account:
-                reason = "You have a bank account, which is required for PM-KISAN direct benefit transfers."
-        
-        elif scheme_id == "KCC":
-            if farmer.has_bank_account:
-                reason = "You have a bank account, which is required for KCC loan account operations."
-        
-        elif scheme_id == "PMFBY":
-            if farmer.has_bank_account:
-                reason = "You have a bank account, which is required for crop insurance premium deduction."
-        
-        elif scheme_id == "AYUSHMAN_BHARAT":
-            reason = "Ayushman Bharat provides health insurance to all eligible household members."
-        
-        elif scheme_id == "MGNREGS":
-            reason = "MGNREGS provides guaranteed employment to all rural adults seeking work."
-        
-        elif scheme_id == "SOIL_HEALTH_CARD":
-            reason = "All farmers are eligible for free soil testing and crop recommendations."
-        
-        elif scheme_id == "PM_AWAS_GRAMIN":
-            reason = "PM Awas Gramin provides housing subsidy for rural households."
-        
-        elif scheme_id == "NFSA_RATION":
-            reason = "NFSA provides subsidized food grains to priority households."
-        
-        elif scheme_id == "ATAL_PENSION":
-            # APY enrollment closes at age 40
-            if farmer.has_bank_account and farmer.age < 40:
-                reason = f"You are {farmer.age} years old and have a bank account. APY enrollment must happen before age 40."
-            elif farmer.has_bank_account:
-                reason = "Your age exceeds the APY enrollment limit (40 years). Consider other pension schemes."
-            else:
-                continue  # Not eligible
-        
-        elif scheme_id == "SUKANYA_SAMRIDDHI":
-            reason = "Sukanya Samriddhi is available for girl children. Share this with parents who have young daughters."
-        
-        # Add to eligible list with reason
-        if reason:
-            scheme_copy = scheme.copy()
-            scheme_copy["reason_eligible"] = reason
-            eligible.append(scheme_copy)
-    
+    for scheme, rule in catalog.rules():
+        if rule.failures(farmer):
+            continue
+        scheme_copy = scheme.copy()
+        scheme_copy["reason_eligible"] = _eligibility_reason(scheme, farmer)
+        eligible.append(scheme_copy)
     return eligible
 
 
-def format_scheme_for_sms(scheme_ids: list[str]) -> str:
-    """
-    Formats a list of scheme_ids as SMS text.
-    Returns formatted SMS with scheme names, documents, apply location, helpline.
-    Keeps total under 320 characters where possible.
-    """
-    schemes = get_all_schemes()
-    scheme_dict = {s["scheme_id"]: s for s in schemes}
-    
-    sms_lines = ["**VoiceBridge - सहायक**"]
-    
-    for scheme_id in scheme_ids[:3]:  # Limit to 3 schemes per SMS
-        if scheme_id in scheme_dict:
-            scheme = scheme_dict[scheme_id]
-            name_hi = scheme.get("name_hi", "")
-            docs = scheme.get("documents", [])
-            
-            sms_lines.append(f"\n{name_hi}:")
-            for i, doc in enumerate(docs[:3], 1):  # Limit to 3 docs
-                sms_lines.append(f"{i}. {doc}")
-    
-    sms_lines.append("\n✓ Sahaya helpline: 1800-123-SAHAYA")
-    
-    sms_text = "".join(sms_lines)
-    
-    # Truncate if too long
-    if len(sms_text) > 320:
-        sms_text = sms_text[:315] + "..."
-    
-    return sms_text
+def check_eligibility_bulk(farmers):
+    """
+    Eligibility of a whole registry (eligibility_engine.FarmerTable) for every
+    scheme in the catalog. Returns an EligibilityResult.
+    """
+    return evaluate(farmers, [rule for _, rule in catalog.rules()])
+
+
+# Composed checklist SMS per (sorted scheme ids, language, catalog load)
+_sms_cache = LRUCache(maxsize=1024)
+
+
+def compose_scheme_sms(scheme_ids: list[str], language: str = "hi-IN") -> SmsMessage:
+    """
+    Checklist SMS for the first 3 distinct scheme_ids, packed into the fewest
+    segments (services/sms_composer.py), schemes in catalog order. Memoized
+    per sorted scheme tuple and language until the catalog reloads.
+    """
+    chosen = list(dict.fromkeys(sid for sid in scheme_ids or [] if sid))[:3]  # Limit to 3 schemes per SMS
+    parts = {sid: catalog.sms_parts(sid) for sid in chosen}
+    code = (language or "hi-IN").split("-")[0].lower()
+    key = (tuple(sorted(chosen)), code, catalog.loads)
+
+    def build():
+        missing = [sid for sid, part in parts.items() if part is None]
+        if missing:
+            for scheme in get_schemes_by_ids(missing, SMS_FIELDS):
+                parts[scheme["scheme_id"]] = sms_parts(scheme)
+        ordered = sorted((p for p in parts.values() if p),
+                         key=lambda p: (catalog.position(p["scheme_id"]), p["scheme_id"]))
+        return compose(ordered, code, SMS_MAX_SEGMENTS, native_name=SAHAYA_NATIVE_NAME)
+
+    return _sms_cache.get_or_create(key, build)
+
+
+def format_scheme_for_sms(scheme_ids: list[str], language: str = "hi-IN") -> str:
+    """
+    Formats a list of scheme_ids as SMS text: scheme names, documents and
+    the helpline, within SMS_MAX_SEGMENTS segments and without cut words.
+    """
+    return compose_scheme_sms(scheme_ids, language).text
@@ -0,0 +1,137 @@
+"""
+VoiceBridge AI — Scheme Store (DynamoDB access layer)
+Reads the welfare_schemes table in ways that keep working as it grows from
+the 10 national schemes to hundreds of state schemes:
+  - scan_all:   parallel-segment scan, following LastEvaluatedKey on every page
+  - batch_get:  BatchGetItem in chunks of 100, retrying UnprocessedKeys
+  - projection: fetch only the attributes a caller needs (prompt, SMS)
+Items come back normalized (normalize_item): no Decimal, no mutable lists.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from config.settings import (
+    DYNAMODB_TABLE_NAME,
+    DYNAMODB_SCAN_SEGMENTS,
+    DYNAMODB_BATCH_GET_RETRIES,
+)
+from services.aws_clients import get_resource
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB limit for keys in one BatchGetItem request
+BATCH_GET_LIMIT = 100
+# Backoff between UnprocessedKeys retries (seconds: 0.05, 0.1, 0.2, ... capped)
+_BACKOFF_BASE = 0.05
+_BACKOFF_CAP = 2.0
+
+# Attributes Sahaya's system prompt uses (keywords only matter for matching)
+PROMPT_FIELDS = (
+    "scheme_id", "name_en", "name_hi", "benefit", "eligibility", "documents",
+    "apply_at", "min_land_acres", "requires_kcc", "requires_bank_account", "income_limit",
+)
+# Compact summary for schemes retrieved as context rather than asked about
+SUMMARY_FIELDS = ("scheme_id", "name_en", "name_hi", "benefit")
+# Attributes the checklist SMS uses
+SMS_FIELDS = ("scheme_id", "name_en", "name_hi", "documents")
+
+
+def normalize_value(value):
+    """
+    DynamoDB/JSON value as plain builtins: Decimal -> int, or float when it has
+    a fractional part; lists and sets -> tuples; maps normalized recursively.
+    """
+    if isinstance(value, Decimal):
+        return float(value) if value.as_tuple().exponent < 0 else int(value)
+    if isinstance(value, dict):
+        return {key: normalize_value(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_value(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize_value(v) for v in value))
+    return value
+
+
+def normalize_item(item: dict) -> dict:
+    """
+    A scheme item ready for the hot paths: json.dumps encodes it without a
+    default= hook, and the shared catalog copy cannot be mutated in place.
+    """
+    return {key: normalize_value(value) for key, value in item.items()}
+
+
+def projection(fields) -> dict:
+    """
+    ProjectionExpression kwargs for fields (empty dict = all attributes).
+    Every attribute goes through a #placeholder, since DynamoDB reserves many
+    plain words (name, status, ...). scheme_id is always included.
+    """
+    if not fields:
+        return {}
+    fields = list(dict.fromkeys(("scheme_id", *fields)))
+    names = {f"#f{i}": field for i, field in enumerate(fields)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def _scan_segment(table_name: str, segment: int, total_segments: int, fields) -> list[dict]:
+    # get_resource is per thread, so each segment has its own resource
+    table = get_resource("dynamodb").Table(table_name)
+    kwargs = projection(fields)
+    if total_segments > 1:
+        kwargs.update(Segment=segment, TotalSegments=total_segments)
+    items = []
+    while True:
+        response = table.scan(**kwargs)
+        items.extend(normalize_item(item) for item in response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def scan_all(fields=None, segments: int = None, table_name: str = DYNAMODB_TABLE_NAME) -> list[dict]:
+    """
+    Every item in the table. Segments are scanned concurrently and each one
+    is paginated to the end, so nothing is truncated at the 1 MB page limit.
+    """
+    segments = max(1, segments or DYNAMODB_SCAN_SEGMENTS)
+    if segments == 1:
+        return _scan_segment(table_name, 0, 1, fields)
+    with ThreadPoolExecutor(max_workers=segments, thread_name_prefix="scan") as pool:
+        parts = list(pool.map(lambda segment: _scan_segment(table_name, segment, segments, fields),
+                              range(segments)))
+    return [item for part in parts for item in part]
+
+
+def batch_get(scheme_ids: list[str], fields=None, table_name: str = DYNAMODB_TABLE_NAME,
+              retries: int = None) -> dict[str, dict]:
+    """
+    Fetches scheme_ids with BatchGetItem. Returns {scheme_id: item}; ids not in
+    the table (or still unprocessed after the retries) are absent.
+    """
+    retries = DYNAMODB_BATCH_GET_RETRIES if retries is None else retries
+    unique_ids = list(dict.fromkeys(sid for sid in scheme_ids or [] if sid))
+    if not unique_ids:
+        return {}
+
+    dynamodb = get_resource("dynamodb")
+    found = {}
+    for start in range(0, len(unique_ids), BATCH_GET_LIMIT):
+        chunk = unique_ids[start:start + BATCH_GET_LIMIT]
+        request = {table_name: {"Keys": [{"scheme_id": sid} for sid in chunk], **projection(fields)}}
+        for attempt in range(retries + 1):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table_name, []):
+                found[item["scheme_id"]] = normalize_item(item)
+            # UnprocessedKeys keeps the projection, so it can be resent as is
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                break
+            if attempt == retries:
+                left = len(request.get(table_name, {}).get("Keys", []))
+                logger.warning(f"[SCHEMES] {left} keys still unprocessed after {retries} retries")
+                break
+            time.sleep(min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+    return found
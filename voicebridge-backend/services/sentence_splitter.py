@@ -0,0 +1,74 @@
+"""
+VoiceBridge AI — Sentence Splitter
+Splits Sahaya's replies into speakable sentences for streaming and TTS.
+Works on incrementally arriving text (Bedrock response stream).
+"""
+
+import re
+
+# Sentence terminators: Devanagari danda, full stop, question mark.
+# '!' is included so exclamations do not get glued to the next sentence.
+SENTENCE_TERMINATORS = "।.?!"
+
+# A terminator only ends a sentence when followed by whitespace or end of text.
+# This keeps "₹2.5 lakh", "4.5%" and "pmkisan.gov.in" in one piece.
+_BOUNDARY_RE = re.compile(r"[।.?!]+(?=\s|$)")
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Splits complete text into a list of sentences.
+    Terminators are kept on the sentence they close. Empty pieces are dropped.
+    """
+    sentences, tail = _split(text or "")
+    if tail.strip():
+        sentences.append(tail.strip())
+    return sentences
+
+
+def _split(buffer: str) -> tuple[list[str], str]:
+    """Returns (complete sentences, unterminated remainder)."""
+    sentences = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, buffer[start:]
+
+
+class SentenceAccumulator:
+    """
+    Collects streamed text deltas and releases complete sentences.
+
+    A terminator at the very end of the buffer is held back until the next
+    delta arrives, because "4." may still become "4.5 acre".
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        """Adds a text delta. Returns sentences that are now complete."""
+        if not delta:
+            return []
+        self._buffer += delta
+        # Only treat a boundary as final when something follows it
+        cut = len(self._buffer)
+        if self._buffer and self._buffer[-1] in SENTENCE_TERMINATORS:
+            cut = len(self._buffer.rstrip(SENTENCE_TERMINATORS))
+        sentences, tail = _split(self._buffer[:cut])
+        self._buffer = tail + self._buffer[cut:]
+        return sentences
+
+    def flush(self) -> list[str]:
+        """Returns whatever is left once the stream has ended."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        if not remainder:
+            return []
+        sentences, tail = _split(remainder)
+        if tail.strip():
+            sentences.append(tail.strip())
+        return sentences
@@ -0,0 +1,163 @@
+"""
+VoiceBridge AI — SMS Composer
+Packs the document checklist into as few SMS segments as possible.
+
+Carriers bill per segment: GSM-7 text fits 160 characters in one segment
+(153 per segment once split), but a single character outside GSM-7 (any
+Devanagari, '✓') switches the whole message to UCS-2 at 70 (67). The
+composer renders the checklist in every form allowed for the language,
+native Hindi names first, then Latin names, then short names and documents
+without their parenthetical details. Within max_segments it keeps whole
+scheme names and documents, never cutting words. It picks the form that
+carries the most items in the fewest segments, preferring earlier forms on
+ties.
+"""
+
+import re
+from dataclasses import dataclass
+
+# 3GPP TS 23.038 default alphabet; the extension table costs two septets
+GSM7_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM7_EXTENSION = frozenset("\f^{}\\[~]|€")
+
+GSM7_SINGLE, GSM7_PART = 160, 153
+UCS2_SINGLE, UCS2_PART = 70, 67
+
+NATIVE_HEADER = "VoiceBridge - {native_name}"
+LATIN_HEADER = "VoiceBridge - Sahayak"
+NATIVE_FOOTER = "\n✓ Sahaya helpline: 1800-123-SAHAYA"
+LATIN_FOOTER = "\nSahaya helpline: 1800-123-SAHAYA"
+
+# Languages whose scheme names the catalog carries natively (name_hi)
+NATIVE_LANGUAGES = ("hi",)
+DOCS_PER_SCHEME = 3
+
+# (script, scheme name, documents), most preferred first
+NATIVE_FORMS = (("native", "native", "docs"), ("native", "native", "short_docs"))
+LATIN_FORMS = (
+    ("latin", "latin", "docs"), ("latin", "latin", "short_docs"),
+    ("latin", "short", "docs"), ("latin", "short", "short_docs"),
+)
+
+_PARENTHETICAL_RE = re.compile(r"\s*\([^)]*\)")
+
+
+def is_gsm7(text: str) -> bool:
+    return all(ch in GSM7_BASIC or ch in GSM7_EXTENSION for ch in text)
+
+
+def sms_segments(text: str) -> tuple[str, int]:
+    """
+    (encoding, segment count) as a carrier would split text: 'GSM-7' or
+    'UCS-2'. Escape sequences and surrogate pairs are never split across
+    segments.
+    """
+    if is_gsm7(text):
+        units = [2 if ch in GSM7_EXTENSION else 1 for ch in text]
+        single, part, encoding = GSM7_SINGLE, GSM7_PART, "GSM-7"
+    else:
+        units = [2 if ord(ch) > 0xFFFF else 1 for ch in text]
+        single, part, encoding = UCS2_SINGLE, UCS2_PART, "UCS-2"
+    if sum(units) <= single:
+        return encoding, 1
+    segments, used = 1, 0
+    for size in units:
+        if used + size > part:
+            segments, used = segments + 1, 0
+        used += size
+    return encoding, segments
+
+
+def short_document(document: str) -> str:
+    """'Bank account details (IFSC code, account number)' -> 'Bank account details'."""
+    return _PARENTHETICAL_RE.sub("", document).strip() or document
+
+
+def sms_parts(scheme: dict) -> dict:
+    """Every form of one scheme the composer may use (precomputed per catalog load)."""
+    documents = tuple((scheme.get("documents") or ())[:DOCS_PER_SCHEME])
+    latin = scheme.get("name_en") or scheme["scheme_id"]
+    return {
+        "scheme_id": scheme["scheme_id"],
+        "native": scheme.get("name_hi") or latin,
+        "latin": latin,
+        "short": scheme["scheme_id"].replace("_", "-"),
+        "docs": documents,
+        "short_docs": tuple(short_document(doc) for doc in documents),
+    }
+
+
+@dataclass(frozen=True)
+class SmsMessage:
+    text: str
+    encoding: str
+    segments: int
+    scheme_ids: tuple
+    documents: int
+    complete: bool
+
+
+def _render(header: str, footer: str, blocks: list[tuple]) -> str:
+    lines = [header]
+    for _, name, documents in blocks:
+        lines.append(f"\n{name}:")
+        lines.extend(f"\n{i}. {doc}" for i, doc in enumerate(documents, 1))
+    lines.append(footer)
+    return "".join(lines)
+
+
+def _fits(header: str, footer: str, blocks: list[tuple], max_segments: int) -> bool:
+    return sms_segments(_render(header, footer, blocks))[1] <= max_segments
+
+
+def _pack(header: str, footer: str, schemes: list[tuple], max_segments: int) -> list[tuple]:
+    """
+    Greedy over (scheme_id, name, documents): each scheme name, then its
+    documents, skipping any item that would exceed max_segments. The first
+    scheme name is always kept.
+    """
+    everything = [(scheme_id, name, tuple(documents)) for scheme_id, name, documents in schemes]
+    if _fits(header, footer, everything, max_segments):
+        return everything
+    blocks = []
+    for scheme_id, name, documents in schemes:
+        if blocks and not _fits(header, footer, blocks + [(scheme_id, name, ())], max_segments):
+            continue
+        kept = []
+        for doc in documents:
+            if _fits(header, footer, blocks + [(scheme_id, name, (*kept, doc))], max_segments):
+                kept.append(doc)
+        blocks.append((scheme_id, name, tuple(kept)))
+    return blocks
+
+
+def compose(parts: list[dict], language: str = "hi-IN", max_segments: int = 3,
+            native_name: str = "Sahayak") -> SmsMessage:
+    """
+    Checklist SMS for parts (sms_parts of each scheme, in display order).
+    native_name is Sahaya's name in the native script, used in the header.
+    """
+    code = (language or "hi").split("-")[0].lower()
+    forms = (NATIVE_FORMS if code in NATIVE_LANGUAGES else ()) + LATIN_FORMS
+    total_items = sum(1 + len(p["docs"]) for p in parts)
+
+    best, best_rank = None, None
+    for order, (script, name_form, doc_form) in enumerate(forms):
+        if script == "native":
+            header, footer = NATIVE_HEADER.format(native_name=native_name), NATIVE_FOOTER
+        else:
+            header, footer = LATIN_HEADER, LATIN_FOOTER
+        schemes = [(p["scheme_id"], p[name_form], p[doc_form]) for p in parts]
+        blocks = _pack(header, footer, schemes, max_segments)
+        text = _render(header, footer, blocks)
+        encoding, segments = sms_segments(text)
+        documents = sum(len(docs) for _, _, docs in blocks)
+        rank = (-(len(blocks) + documents), segments, order)
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            best = SmsMessage(text, encoding, segments, tuple(b[0] for b in blocks), documents,
+                              len(blocks) + documents == total_items)
+    return best
@@ -9,8 +9,9 @@ import os
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
-from config.settings import USE_MOCK, AWS_REGION, SNS_SENDER_ID
-from services.scheme_service import format_scheme_for_sms
+from config.settings import SNS_SENDER_ID
+from services.aws_clients import get_client
+from services.scheme_service import compose_scheme_sms
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,6 @@ logger = logging.getLogger(__name__)
 _BASE_DIR = Path(__file__).resolve().parent.parent
 _DOTENV_PATH = _BASE_DIR / '.env'
 
-if not USE_MOCK:
-    import boto3
-
 
 def _get_sms_provider():
     """Read SMS_PROVIDER fresh from .env every time. Never cached."""
@@ -28,9 +26,10 @@ def _get_sms_provider():
     return os.getenv('SMS_PROVIDER', 'mock').strip().lower()
 
 
-def send_checklist(phone_number: str, scheme_ids: list[str]) -> dict:
+def send_checklist(phone_number: str, scheme_ids: list[str], language: str = 'hi-IN') -> dict:
     """
-    Sends SMS with document checklist for selected schemes.
+    Sends SMS with document checklist for selected schemes, packed into the
+    fewest segments for language (see services/sms_composer.py).
     Provider can be switched via SMS_PROVIDER env var:
     - 'twilio': Use Twilio
     - 'sns': Use AWS SNS
@@ -42,15 +41,18 @@ def send_checklist(phone_number: str, scheme_ids: list[str]) -> dict:
     load_dotenv(dotenv_path=_DOTENV_PATH, override=True)
     sms_provider = os.getenv('SMS_PROVIDER', 'mock').strip().lower()
     
-    # Get formatted SMS text
-    message_text = format_scheme_for_sms(scheme_ids)
+    # Get formatted SMS text (memoized per scheme set and language)
+    sms = compose_scheme_sms(scheme_ids, language)
+    message_text = sms.text
     
     if sms_provider == 'twilio':
-        return _send_via_twilio(phone_number, message_text)
+        result = _send_via_twilio(phone_number, message_text)
     elif sms_provider == 'sns':
-        return _send_via_sns(phone_number, message_text)
+        result = _send_via_sns(phone_number, message_text)
     else:
-        return _send_via_mock(phone_number, message_text)
+        result = _send_via_mock(phone_number, message_text)
+    result.update(segments=sms.segments, encoding=sms.encoding)
+    return result
 
 
 def _send_via_mock(phone_number: str, message_text: str) -> dict:
@@ -72,7 +74,7 @@ def _send_via_mock(phone_number: str, message_text: str) -> dict:
 def _send_via_sns(phone_number: str, message_text: str) -> dict:
     """AWS SNS SMS provider"""
     try:
-        sns = boto3.client("sns", region_name=AWS_REGION)
+        sns = get_client("sns")
         
         response = sns.publish(
             PhoneNumber=phone_number,
@@ -6,10 +6,9 @@ Converts Hindi audio to text.
 import time
 import uuid
 import os
-from config.settings import USE_MOCK, AWS_REGION, S3_AUDIO_BUCKET
+from config.settings import USE_MOCK, S3_AUDIO_BUCKET
 
-if not USE_MOCK:
-    import boto3
+from services.aws_clients import get_client
 
 
 def transcribe_audio(audio_bytes: bytes, filename: str = "audio.mp3") -> dict:
@@ -29,8 +28,8 @@ def transcribe_audio(audio_bytes: bytes, filename: str = "audio.mp3") -> dict:
     else:
         # AWS path - use Transcribe
         try:
-            s3 = boto3.client("s3", region_name=AWS_REGION)
-            transcribe = boto3.client("transcribe", region_name=AWS_REGION)
+            s3 = get_client("s3")
+            transcribe = get_client("transcribe")
             
             # Upload audio to S3
             s3_key = f"transcribe_input/{uuid.uuid4()}_{filename}"
@@ -1,22 +1,81 @@
 """
 VoiceBridge AI — Text-to-Speech Service
-Converts Hindi text to MP3 audio.
+Converts Hindi text to MP3 audio (Polly) and regional text to WAV (Sarvam).
+Identical utterances are synthesized once and served from the S3 audio
+cache (services/audio_cache.py).
+
+Segmented mode synthesizes a reply sentence by sentence, in parallel, and
+returns an ordered playlist: the client starts playing the first sentence
+while the rest are still being synthesized, and sentences shared between
+replies (closings, menus) are cache hits on their own. Under a deadline the
+playlist is the prefix of sentences finished in time.
+
+Streaming mode (stream_speech) relays the audio bytes to the client as they
+arrive instead of uploading to S3 and handing out a URL; the finished audio
+is stored in the cache in the background.
 """
 
+import base64
 import os
-import uuid
-from config.settings import USE_MOCK, AWS_REGION, S3_AUDIO_BUCKET
+import logging
+import time
+import requests
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Iterable, Iterator
+from config.settings import USE_MOCK, SARVAM_API_KEY, SARVAM_API_URL, TTS_SEGMENT_WORKERS
 
-if not USE_MOCK:
-    import boto3
+from services.audio_cache import audio_key, normalize_text, tee, tts_cache
+from services.audio_disk_cache import iter_file
+from services.audio_transcoder import TranscodeError, content_type, negotiate, stream_transcode, transcode
+from services.aws_clients import get_client
+from services.sentence_splitter import split_sentences
+
+logger = logging.getLogger(__name__)
 
 MOCK_AUDIO_PATH = "data/voice_memory/mock_response.mp3"
+STREAM_CHUNK_BYTES = 4096
+
+# Polly voice for every backend reply
+POLLY_PARAMS = {"voice": "Kajal", "engine": "neural", "language": "hi-IN"}
+
+# Sarvam request settings (everything here changes the audio, so it is in the cache key)
+SARVAM_SPEAKER = "manisha"
+SARVAM_PARAMS = {"model": "bulbul:v2", "pace": 0.78, "pitch": 0, "loudness": 1.5, "enable_preprocessing": True}
+# Bounded per process so one long reply cannot use up the TTS provider's rate limit.
+# Separate from the turn pool: turn stages wait on these futures.
+_segment_executor = ThreadPoolExecutor(max_workers=TTS_SEGMENT_WORKERS, thread_name_prefix="tts")
+
+# Speaker reported to the client per language
+SARVAM_SPEAKER_MAP = {
+    'ta-IN': 'anushka',
+    'kn-IN': 'anushka',
+    'te-IN': 'anushka',
+    'ml-IN': 'manisha',
+    'hi-IN': 'anushka'
+}
+
+
+def _polly_stream(text: str):
+    """Polly's AudioStream (botocore StreamingBody) for text."""
+    response = get_client("polly").synthesize_speech(
+        Text=text,
+        VoiceId=POLLY_PARAMS["voice"],
+        Engine=POLLY_PARAMS["engine"],
+        OutputFormat="mp3",
+        LanguageCode=POLLY_PARAMS["language"]
+    )
+    return response["AudioStream"]
+
+
+def _polly_audio(text: str) -> bytes:
+    return _polly_stream(text).read()
 
 
 def synthesize_speech(text: str) -> dict:
     """
     Converts Hindi text to audio MP3.
-    Returns dict with audio_url, duration, success status.
+    Returns dict with audio_url, duration, success status, and cached
+    (True when the audio came from the cache without calling Polly).
     """
     if USE_MOCK:
         # Mock path - check if mock audio exists
@@ -37,36 +96,11 @@ def synthesize_speech(text: str) -> dict:
             }
     
     else:
-        # AWS path - use Polly
+        # AWS path - Polly, unless this exact utterance is already in S3
         try:
-            polly = boto3.client("polly", region_name=AWS_REGION)
-            s3 = boto3.client("s3", region_name=AWS_REGION)
-            
-            # Call Polly to synthesize
-            response = polly.synthesize_speech(
-                Text=text,
-                VoiceId="Kajal",
-                Engine="neural",
-                OutputFormat="mp3",
-                LanguageCode="hi-IN"
-            )
-            
-            # Save to S3
-            audio_stream = response["AudioStream"].read()
-            s3_key = f"tts_output/{uuid.uuid4()}.mp3"
-            s3.put_object(
-                Bucket=S3_AUDIO_BUCKET,
-                Key=s3_key,
-                Body=audio_stream,
-                ContentType="audio/mpeg"
-            )
-            
-            # Generate presigned URL
-            presigned_url = s3.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": S3_AUDIO_BUCKET, "Key": s3_key},
-                ExpiresIn=3600
-            )
+            text = normalize_text(text)
+            key = audio_key("polly", text, "mp3", **POLLY_PARAMS)
+            presigned_url, cached = tts_cache.fetch("polly", key, "mp3", lambda: _polly_audio(text), "audio/mpeg")
             
             # Estimate duration (150 words per minute for Hindi)
             word_count = len(text.split())
@@ -76,6 +110,7 @@ def synthesize_speech(text: str) -> dict:
                 "success": True,
                 "audio_url": presigned_url,
                 "duration_seconds": round(duration, 1),
+                "cached": cached,
                 "mock": False
             }
         
@@ -86,3 +121,246 @@ def synthesize_speech(text: str) -> dict:
                 "audio_url": None,
                 "mock": False
             }
+
+
+def _sarvam_audio(text: str, language: str) -> bytes:
+    payload = {'inputs': [text], 'target_language_code': language, 'speaker': SARVAM_SPEAKER, **SARVAM_PARAMS}
+    response = requests.post(SARVAM_API_URL, json=payload,
+                             headers={'api-subscription-key': SARVAM_API_KEY}, timeout=30)
+    if response.status_code != 200:
+        logger.error(f"Sarvam API error: {response.status_code} - {response.text}")
+        raise RuntimeError(f'Sarvam API returned {response.status_code}')
+    result = response.json()
+    audios = result.get('audios') or []
+    if not audios:
+        logger.error(f"Sarvam API no audio in response: {result}")
+        raise RuntimeError('No audio from Sarvam')
+    return base64.b64decode(audios[0])
+
+
+def _sarvam_key(text: str, language: str, fmt: str) -> str:
+    return audio_key("sarvam", text, fmt, language=language, speaker=SARVAM_SPEAKER, **SARVAM_PARAMS)
+
+
+def _store_encoded(text: str, language: str, fmt: str, wav_audio: bytes = None):
+    """
+    Encodes a Sarvam WAV to fmt and caches it for the next request. Runs on
+    the turn pool; without wav_audio the cached WAV is read back.
+    """
+    key = _sarvam_key(text, language, fmt)
+    if tts_cache.known(tts_cache.object_key("sarvam", key, fmt)):
+        return
+    try:
+        if wav_audio is None:
+            chunks = tts_cache.open("sarvam", _sarvam_key(text, language, "wav"), "wav")
+            if chunks is None:
+                return
+            wav_audio = b"".join(chunks)
+        tts_cache.store("sarvam", key, fmt, transcode(wav_audio, fmt), content_type(fmt))
+    except TranscodeError as e:
+        logger.warning(f"[TTS] {e}; {language} stays WAV")
+    except Exception as e:
+        logger.warning(f"[TTS] Storing {fmt} failed: {e}")
+
+
+def synthesize_regional(text: str, language: str, fmt: str = None) -> dict:
+    """
+    Regional language TTS via Sarvam AI, through the same audio cache.
+    language is BCP-47 (ml-IN); fmt is mp3 | opus | wav, default from
+    negotiate(). A cached encoding is served as is. On a miss Sarvam's WAV
+    is cached and returned at once, and ffmpeg encodes fmt on the turn pool
+    so the request never waits for it; repeats of the utterance get fmt.
+    Returns dict with audio_url, language, speaker, format, content_type
+    and cached, or success False with error.
+    """
+    fmt = negotiate(fmt)
+    if USE_MOCK:
+        return {
+            'success': True,
+            'audio_url': 'https://mock-sarvam-audio.s3.amazonaws.com/mock-audio.wav',
+            'language': language,
+            'format': 'wav'
+        }
+
+    speaker_id = SARVAM_SPEAKER_MAP.get(language, 'meera')
+    logger.info(f"Sarvam TTS: lang={language} speaker={speaker_id} format={fmt} text_len={len(text)}")
+    text = normalize_text(text)
+    wav = {}
+
+    def synthesize():
+        wav["audio"] = _sarvam_audio(text, language)
+        return wav["audio"]
+
+    try:
+        url = None if fmt == "wav" else tts_cache.cached_url("sarvam", _sarvam_key(text, language, fmt), fmt)
+        cached = url is not None
+        if url is None:
+            url, cached = tts_cache.fetch("sarvam", _sarvam_key(text, language, "wav"), "wav",
+                                          synthesize, content_type("wav"))
+            if fmt != "wav":
+                from services.turn_orchestrator import submit
+                submit(_store_encoded, text, language, fmt, wav.get("audio"))
+            fmt = "wav"
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    return {
+        'success': True,
+        'audio_url': url,
+        'language': language,
+        'speaker': speaker_id,
+        'format': fmt,
+        'content_type': content_type(fmt),
+        'cached': cached
+    }
+
+
+def submit_segment(sentence: str, synthesize=None) -> Future:
+    """Starts synthesizing one sentence on the segment pool. Returns a Future."""
+    return _segment_executor.submit(synthesize or synthesize_speech, sentence)
+
+
+def segment_result(index: int, sentence: str, future: Future, timeout: float = None) -> dict:
+    """
+    The finished segment {index, text, audio_url, duration_seconds, cached,
+    success}. Raises concurrent.futures.TimeoutError if it is not ready
+    within timeout seconds; a failed synthesis is an unsuccessful segment.
+    """
+    try:
+        result = future.result(timeout=timeout)
+    except FutureTimeout:
+        raise
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+    if not result.get("success"):
+        logger.warning(f"[TTS] Segment {index} failed: {result.get('error')}")
+    return {
+        "index": index,
+        "text": sentence,
+        "audio_url": result.get("audio_url"),
+        "duration_seconds": result.get("duration_seconds", 0),
+        "cached": bool(result.get("cached")),
+        "success": bool(result.get("success")),
+    }
+
+
+def iter_speech_segments(text: str, synthesize=None, deadline: float = None) -> Iterator[dict]:
+    """
+    Synthesizes each sentence of text in parallel and yields the segments in
+    order, each as soon as it (and every sentence before it) is ready.
+    Synthesis starts when this is called, not on the first next().
+    synthesize(sentence) -> dict defaults to synthesize_speech (Polly).
+    With a deadline (time.monotonic()), iteration stops at the first segment
+    not ready by then; the finished ones before it have been yielded.
+    """
+    sentences = split_sentences(text)
+    futures = [submit_segment(sentence, synthesize) for sentence in sentences]
+    return _in_order(sentences, futures, deadline)
+
+
+def _in_order(sentences: list[str], futures: list[Future], deadline: float = None) -> Iterator[dict]:
+    try:
+        for index, (sentence, future) in enumerate(zip(sentences, futures)):
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                yield segment_result(index, sentence, future, timeout)
+            except FutureTimeout:
+                logger.warning(f"[TTS] {len(sentences) - index} of {len(sentences)} segments missed the deadline")
+                return
+    finally:
+        # Consumer went away (client disconnected) or gave up: drop sentences not started yet
+        for future in futures:
+            future.cancel()
+
+
+def collect_segments(segments: Iterable[dict]) -> dict:
+    """
+    Segmented TTS as one result: the ordered playlist plus audio_url (first
+    segment) and total duration. success is False only if every segment failed.
+    """
+    segments = list(segments)
+    playable = [segment for segment in segments if segment["success"]]
+    if not playable:
+        return {
+            "success": False,
+            "error": "No segment could be synthesized" if segments else "No speakable text",
+            "audio_url": None,
+            "segments": segments,
+            "mock": USE_MOCK
+        }
+    return {
+        "success": True,
+        "audio_url": playable[0]["audio_url"],
+        "segments": segments,
+        "duration_seconds": round(sum(segment["duration_seconds"] or 0 for segment in playable), 1),
+        "cached_segments": sum(segment["cached"] for segment in segments),
+        "mock": USE_MOCK
+    }
+
+
+def synthesize_segments(text: str, synthesize=None, deadline: float = None) -> dict:
+    """
+    Segmented TTS of text as one result (see collect_segments). With a
+    deadline, the playlist is the prefix of sentences finished by then.
+    """
+    return collect_segments(iter_speech_segments(text, synthesize, deadline))
+
+
+def stream_speech(text: str, language: str = "hi-IN", fmt: str = None) -> dict:
+    """
+    Audio for text as an iterator of byte chunks, to pipe straight to the
+    client. hi-IN is Polly MP3, relayed as its AudioStream arrives. Other
+    languages are Sarvam (the API returns a whole WAV), run through the
+    streaming encoder into fmt (default from negotiate()). Hits are read from
+    the disk tier or S3; a miss is stored in the cache in the background once
+    the client has read it to the end.
+    Returns {success, chunks, content_type, cached} or success False with error.
+    """
+    text = normalize_text(text)
+    if language == POLLY_PARAMS["language"]:
+        provider, fmt = "polly", "mp3"
+        key = audio_key("polly", text, "mp3", **POLLY_PARAMS)
+    else:
+        provider = "sarvam"
+        fmt = negotiate(fmt)
+        key = _sarvam_key(text, language, fmt)
+    mime = content_type(fmt)
+
+    if USE_MOCK:
+        if not os.path.exists(MOCK_AUDIO_PATH):
+            return {"success": False, "error": "Place a mock_response.mp3 in data/voice_memory/ for audio playback",
+                    "mock": True}
+        return {"success": True, "chunks": iter_file(MOCK_AUDIO_PATH, STREAM_CHUNK_BYTES),
+                "content_type": "audio/mpeg", "cached": True, "mock": True}
+
+    try:
+        chunks = tts_cache.open(provider, key, fmt, STREAM_CHUNK_BYTES)
+        if chunks is not None:
+            return {"success": True, "chunks": chunks, "content_type": mime, "cached": True, "mock": False}
+
+        if provider == "polly":
+            # Synthesis starts here, so errors surface before any byte is sent
+            chunks = _polly_stream(text).iter_chunks(STREAM_CHUNK_BYTES)
+        else:
+            audio = _sarvam_audio(text, language)
+            wav_chunks = (audio[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(audio), STREAM_CHUNK_BYTES))
+            try:
+                chunks = stream_transcode(wav_chunks, fmt)
+            except TranscodeError as e:
+                logger.warning(f"[TTS] {e}; streaming WAV")
+                fmt, mime, key = "wav", content_type("wav"), _sarvam_key(text, language, "wav")
+                chunks = (audio[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(audio), STREAM_CHUNK_BYTES))
+    except Exception as e:
+        return {"success": False, "error": str(e), "mock": False}
+
+    def store(audio: bytes):
+        try:
+            tts_cache.store(provider, key, fmt, audio, mime)
+        except Exception as e:
+            logger.warning(f"[TTS] Caching streamed {provider} audio failed (non-fatal): {e}")
+
+    def store_in_background(audio: bytes):
+        from services.turn_orchestrator import submit
+        submit(store, audio)
+
+    return {"success": True, "chunks": tee(chunks, store_in_background), "content_type": mime, "cached": False,
+            "mock": False}
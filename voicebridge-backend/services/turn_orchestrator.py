@@ -0,0 +1,142 @@
+"""
+VoiceBridge AI — Turn Orchestrator
+Runs the independent I/O of one chat turn concurrently on a shared, bounded
+thread pool, so a turn costs roughly its slowest dependency rather than the
+sum of all of them:
+
+    voice memory presign ──────────────────┐
+    scheme lookup (batched) ─► Bedrock ─► TTS ─┴─► response
+
+Every stage has a deadline (Bedrock's is the client read timeout). A late or
+failed stage degrades the turn (no scheme data, no clip URL, no audio)
+instead of failing it.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from config.settings import (
+    USE_MOCK,
+    TURN_MAX_WORKERS,
+    TURN_SCHEME_TIMEOUT,
+    TURN_CLIP_TIMEOUT,
+    TURN_TTS_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared by every request in the process; threads are created on demand
+_executor = ThreadPoolExecutor(max_workers=TURN_MAX_WORKERS, thread_name_prefix="turn")
+
+
+def submit(fn, *args, **kwargs):
+    """Runs fn on the shared turn pool. Returns a Future."""
+    return _executor.submit(fn, *args, **kwargs)
+
+
+def _elapsed_ms(since: float) -> int:
+    return round((time.monotonic() - since) * 1000)
+
+
+def _result_or_none(future, timeout: float, stage: str):
+    """Waits for a stage until its deadline. Failures and timeouts return None."""
+    try:
+        return future.result(timeout=max(0.0, timeout))
+    except FutureTimeout:
+        future.cancel()
+        logger.warning(f"[TURN] {stage} missed its {timeout:.1f}s deadline")
+    except Exception as e:
+        logger.warning(f"[TURN] {stage} failed (non-fatal): {e}")
+    return None
+
+
+def fetch_schemes(scheme_ids: list[str], fetch_many, timeout: float = None) -> list[dict]:
+    """
+    Runs fetch_many(scheme_ids) (one batched lookup) under the scheme deadline.
+    A failed or late lookup returns [] so the turn goes ahead without scheme data.
+    scheme_ids may be empty: fetch_many can still retrieve relevant schemes.
+    """
+    timeout = TURN_SCHEME_TIMEOUT if timeout is None else timeout
+    return _result_or_none(_executor.submit(fetch_many, scheme_ids), timeout, "scheme lookup") or []
+
+
+def run_chat_turn(
+    message: str,
+    scheme_ids: list[str],
+    farmer,
+    conversation_history: list[dict] = None,
+    lang_instruction: str = None,
+    language: str = 'hi-IN',
+    conversation_id: str = None,
+    with_tts: bool = True,
+    tts_segments: bool = False
+) -> dict:
+    """
+    One /api/chat turn. Returns generate_response's dict plus:
+    - audio_url: TTS of the reply (None if TTS failed or was late); with
+      tts_segments, the first sentence's clip
+    - audio_segments: ordered per-sentence playlist (tts_segments only, else
+      None); sentences still synthesizing at the TTS deadline are left off
+    - voice_memory_url: presigned clip URL when the reply carries a clip
+    - timings_ms: per-stage wall clock
+    """
+    from services.ai_service import generate_response, get_voice_memory_clip, prompt_schemes
+    from services.tts_service import collect_segments, iter_speech_segments, synthesize_speech
+    from services.voice_memory_service import get_clip
+
+    timings = {}
+    started = time.monotonic()
+
+    # The clip is decided by scheme ids and message alone, so it can be
+    # presigned while schemes are fetched and Bedrock is generating
+    expected_clip = get_voice_memory_clip(scheme_ids, message)
+    clip_future = _executor.submit(get_clip, expected_clip, language) if expected_clip else None
+
+    # Mock replies do not use scheme data
+    scheme_data = None if USE_MOCK else fetch_schemes(
+        scheme_ids, lambda ids: prompt_schemes(message, ids, farmer)
+    )
+    timings["schemes"] = _elapsed_ms(started)
+
+    model_started = time.monotonic()
+    result = generate_response(
+        message, scheme_ids, farmer, conversation_history, lang_instruction,
+        conversation_id, scheme_data=scheme_data
+    )
+    timings["model"] = _elapsed_ms(model_started)
+
+    tts_started = time.monotonic()
+    tts_future = segments = None
+    if with_tts and result.get("response_text"):
+        if tts_segments:
+            # Sentences start now; whatever has finished by the deadline is kept
+            segments = iter_speech_segments(result["response_text"], deadline=tts_started + TURN_TTS_TIMEOUT)
+        else:
+            tts_future = _executor.submit(synthesize_speech, result["response_text"])
+
+    voice_memory_url = None
+    clip_id = result.get("voice_memory_clip")
+    if clip_id:
+        if clip_future is not None and clip_id == expected_clip:
+            clip_result = _result_or_none(clip_future, TURN_CLIP_TIMEOUT, "voice memory presign")
+        else:
+            clip_result = _result_or_none(_executor.submit(get_clip, clip_id, language),
+                                          TURN_CLIP_TIMEOUT, "voice memory presign")
+        if clip_result and clip_result.get("success"):
+            voice_memory_url = clip_result.get("audio_url")
+    elif clip_future is not None:
+        clip_future.cancel()
+
+    audio_url = audio_segments = tts_result = None
+    if segments is not None:
+        tts_result = collect_segments(segments)
+    elif tts_future is not None:
+        tts_result = _result_or_none(tts_future, TURN_TTS_TIMEOUT, "TTS")
+    if tts_result and tts_result.get("success"):
+        audio_url = tts_result.get("audio_url")
+        audio_segments = tts_result.get("segments")
+    timings["tts"] = _elapsed_ms(tts_started)
+    timings["total"] = _elapsed_ms(started)
+
+    return {**result, "audio_url": audio_url, "audio_segments": audio_segments,
+            "voice_memory_url": voice_memory_url, "timings_ms": timings}
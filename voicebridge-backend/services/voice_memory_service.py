@@ -4,10 +4,10 @@ Serves peer success story audio clips by scheme ID.
 """
 
 import os
-from config.settings import USE_MOCK, AWS_REGION, S3_AUDIO_BUCKET
+from config.settings import USE_MOCK, S3_AUDIO_BUCKET
 
-if not USE_MOCK:
-    import boto3
+from services import audio_disk_cache
+from services.aws_clients import get_client
 
 
 VOICE_MEMORY_CLIPS = {
@@ -123,22 +123,21 @@ def get_clip(scheme_id: str, language: str = 'en-IN') -> dict:
         }
     
     else:
-        # AWS path - generate presigned S3 URL
+        # AWS path - /audio/<key> through the local disk tier, else presigned S3 URL
         try:
-            s3 = boto3.client("s3", region_name=AWS_REGION)
-            
-            presigned_url = s3.generate_presigned_url(
+            key = f"voice_memory/{clip_info['filename']}"
+            url = audio_disk_cache.audio_url(key) or get_client("s3").generate_presigned_url(
                 "get_object",
                 Params={
                     "Bucket": S3_AUDIO_BUCKET,
-                    "Key": f"voice_memory/{clip_info['filename']}"
+                    "Key": key
                 },
                 ExpiresIn=3600
             )
             
             return {
                 "success": True,
-                "audio_url": presigned_url,
+                "audio_url": url,
                 "farmer_name": clip_info["farmer_name"],
                 "district": clip_info["district"],
                 "scheme": clip_info["scheme"],
@@ -0,0 +1,184 @@
+"""
+Tests for the Bedrock request/response handling in ai_service.
+Bedrock is replaced by a stub client; no AWS calls are made.
+Run with: python -m pytest tests/test_ai.py
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.ai_service as ai_service
+from models.farmer import FarmerProfile
+
+USAGE = {"input_tokens": 120, "output_tokens": 40,
+         "cache_read_input_tokens": 2900, "cache_creation_input_tokens": 0}
+
+
+class StubBedrock:
+    def __init__(self, text):
+        self.text = text
+        self.requests = []
+
+    def invoke_model(self, **kwargs):
+        self.requests.append(json.loads(kwargs["body"]))
+        body = {"content": [{"type": "text", "text": self.text}], "usage": USAGE}
+        return {"body": io.BytesIO(json.dumps(body).encode())}
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        self.requests.append(json.loads(kwargs["body"]))
+        events = [{"type": "message_start", "message": {"usage": {k: v for k, v in USAGE.items() if k != "output_tokens"}}}]
+        for i in range(0, len(self.text), 7):
+            events.append({"type": "content_block_delta", "delta": {"type": "text_delta", "text": self.text[i:i + 7]}})
+        events.append({"type": "message_delta", "usage": {"output_tokens": 40}})
+        return {"body": [{"chunk": {"bytes": json.dumps(e).encode()}} for e in events]}
+
+
+def _use_stub(monkeypatch, text):
+    stub = StubBedrock(text)
+    monkeypatch.setattr(ai_service, "USE_MOCK", False)
+    monkeypatch.setattr(ai_service, "get_client", lambda name: stub)
+    monkeypatch.setattr(ai_service, "prompt_schemes",
+                        lambda message, ids, farmer=None: [{"scheme_id": sid} for sid in ids])
+    ai_service._response_cache.clear()
+    return stub
+
+
+def test_static_persona_is_first_block_and_cacheable(monkeypatch):
+    stub = _use_stub(monkeypatch, "Namaste Ramesh ji। Kya aap jaanna chahte hain?")
+    monkeypatch.setattr(ai_service, "BEDROCK_PROMPT_CACHING", "true")
+    result = ai_service.generate_response("pm kisan", ["PM_KISAN"], FarmerProfile(name="Ramesh"), [], "Hindi")
+
+    system = stub.requests[0]["system"]
+    assert system[0]["text"] == ai_service.SAHAYA_STATIC_PROMPT
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in system[1]
+    assert "FARMER NAME (use it wherever the examples above show the name placeholder): Ramesh" in system[1]["text"]
+    assert result["usage"] == USAGE
+
+
+def test_cache_control_omitted_when_disabled(monkeypatch):
+    stub = _use_stub(monkeypatch, "Theek hai.")
+    monkeypatch.setattr(ai_service, "BEDROCK_PROMPT_CACHING", "false")
+    ai_service.generate_response("kcc", ["KCC"], FarmerProfile(), [])
+    assert all("cache_control" not in block for block in stub.requests[0]["system"])
+
+
+def test_stream_yields_sentences_then_done_with_usage(monkeypatch):
+    _use_stub(monkeypatch, "Ramesh ji, ₹6,000 milenge। Kya aap apply karna chahenge?")
+    events = list(ai_service.generate_response_stream("pm kisan", ["PM_KISAN"], FarmerProfile(name="Ramesh")))
+    assert [e["text"] for e in events if e["event"] == "sentence"] == [
+        "Ramesh ji, ₹6,000 milenge।", "Kya aap apply karna chahenge?"
+    ]
+    done = events[-1]
+    assert done["event"] == "done" and done["success"]
+    assert done["usage"] == USAGE
+
+
+def test_repeated_question_is_served_from_response_cache(monkeypatch):
+    stub = _use_stub(monkeypatch, "Ramesh ji, KCC se ₹3 lakh tak loan milta hai. Aur koi sawaal hai?")
+    first = ai_service.generate_response("KCC kya hai?", ["KCC"], FarmerProfile(name="Ramesh"), [], "Hindi")
+    second = ai_service.generate_response("kcc kya hai", ["KCC"], FarmerProfile(name="Sita"), [], "Hindi")
+
+    assert len(stub.requests) == 1
+    assert "cached" not in first and second["cached"] is True
+    assert second["response_text"].startswith("Sita ji, KCC")
+    assert ai_service.cache_stats()["responses"]["hits"] >= 1
+
+
+def test_response_cache_key_separates_language_stage_and_profile(monkeypatch):
+    stub = _use_stub(monkeypatch, "KCC se loan milta hai.")
+    farmer = FarmerProfile(name="Ramesh", land_acres=5, has_kcc=False)
+    ai_service.generate_response("KCC kya hai", ["KCC"], farmer, [], "Hindi")
+    ai_service.generate_response("KCC kya hai", ["KCC"], farmer, [], "Tamil")
+    ai_service.generate_response("KCC kya hai", ["KCC"], farmer, [{"role": "assistant", "content": "Namaste!"}], "Hindi")
+    ai_service.generate_response("KCC kya hai", ["KCC"], FarmerProfile(name="Ramesh", land_acres=5, has_kcc=True), [], "Hindi")
+    ai_service.generate_response("KCC kya hai", ["KCC"], FarmerProfile(name="Ramesh", land_acres=3, has_kcc=False), [], "Hindi")
+    ai_service.generate_response("KCC kya hai", ["KCC"],
+                                 FarmerProfile(name="Ramesh", land_acres=5, state="Kerala"), [], "Hindi")
+    assert len(stub.requests) == 6
+
+
+def test_followup_is_keyed_on_the_previous_reply(monkeypatch):
+    stub = _use_stub(monkeypatch, "Theek hai, main batati hoon.")
+    ramesh = FarmerProfile(name="Ramesh Kumar", land_acres=2, state="Bihar")
+    lakshmi = FarmerProfile(name="Lakshmi", land_acres=2, state="Bihar")
+    pm_kisan = [{"role": "assistant", "content": "Ramesh ji, kya aap PM-KISAN ke documents jaanna chahenge?"}]
+    ayushman = [{"role": "assistant", "content": "Lakshmi ji, kya aap Ayushman card banwana chahengi?"}]
+
+    ai_service.generate_response("haan", [], ramesh, pm_kisan, "Hindi")
+    ai_service.generate_response("haan", [], lakshmi, ayushman, "Hindi")
+    assert len(stub.requests) == 2  # same word, different question: not shared
+
+    # The same question asked of another farmer (name swapped) is the same context
+    same_question = [{"role": "assistant", "content": "Lakshmi ji, kya aap PM-KISAN ke documents jaanna chahenge?"}]
+    assert ai_service.generate_response("Haan!", [], lakshmi, same_question, "Hindi")["cached"] is True
+    assert len(stub.requests) == 2
+
+
+def test_reply_with_untranslatable_name_is_not_cached(monkeypatch):
+    stub = _use_stub(monkeypatch, "रमेश जी, KCC अच्छा है।")
+    for _ in range(2):
+        ai_service.generate_response("KCC kya hai", ["KCC"], FarmerProfile(name="Ramesh"), [], "Hindi")
+    assert len(stub.requests) == 2
+
+
+def test_stream_replays_cached_reply(monkeypatch):
+    stub = _use_stub(monkeypatch, "Ramesh ji, ₹6,000 milenge। Kya aap apply karna chahenge?")
+    list(ai_service.generate_response_stream("pm kisan", ["PM_KISAN"], FarmerProfile(name="Ramesh")))
+    events = list(ai_service.generate_response_stream("PM Kisan!", ["PM_KISAN"], FarmerProfile(name="Sita")))
+
+    assert len(stub.requests) == 1
+    assert [e["text"] for e in events if e["event"] == "sentence"][0] == "Sita ji, ₹6,000 milenge।"
+    assert events[-1]["cached"] is True
+
+
+def test_long_history_is_windowed_and_summarized(monkeypatch):
+    stub = _use_stub(monkeypatch, "Theek hai.")
+    monkeypatch.setattr(ai_service, "_history_manager", ai_service.HistoryManager(max_turns=2, token_budget=1500))
+    history = []
+    for i in range(6):
+        history += [{"role": "user", "content": f"Sawaal {i}?"}, {"role": "assistant", "content": f"Jawab {i}."}]
+    history.append({"role": "user", "content": "KCC kya hai"})  # web client includes the current message
+    ai_service.generate_response("KCC kya hai", ["KCC"], FarmerProfile(), history, "Hindi", "call-1")
+
+    request = stub.requests[0]
+    assert [m["content"] for m in request["messages"]] == ["Sawaal 4?", "Jawab 4.", "Sawaal 5?", "Jawab 5.", "KCC kya hai"]
+    assert "EARLIER IN THIS CALL" in request["system"][1]["text"]
+    assert "Farmer: Sawaal 0?" in request["system"][1]["text"]
+
+
+def test_generate_response_records_latency_tokens_and_throttles(monkeypatch):
+    _use_stub(monkeypatch, "Theek hai.")
+    labels = {"language": "tamil", "model": ai_service.BEDROCK_MODEL_ID, "scheme": "KCC", "mode": "sync"}
+    before = ai_service._llm_tokens.value(type="output", **labels)
+    count_before = ai_service._llm_latency.snapshot(**labels)["count"]
+    ai_service.generate_response("kcc metrics", ["KCC"], FarmerProfile(), [],
+                                 "Please respond ONLY in Tamil script.")
+    assert ai_service._llm_tokens.value(type="output", **labels) == before + USAGE["output_tokens"]
+    assert ai_service._llm_latency.snapshot(**labels)["count"] == count_before + 1
+
+    class Throttled(Exception):
+        response = {"Error": {"Code": "ThrottlingException"}}
+
+    def throttle(**kwargs):
+        raise Throttled("Rate exceeded")
+
+    stub = ai_service.get_client("bedrock-runtime")
+    monkeypatch.setattr(stub, "invoke_model", throttle)
+    throttled_before = ai_service._llm_requests.value(outcome="throttled", **labels)
+    result = ai_service.generate_response("kcc throttled", ["KCC"], FarmerProfile(), [],
+                                          "Please respond ONLY in Tamil script.")
+    assert result["success"] is False
+    assert ai_service._llm_requests.value(outcome="throttled", **labels) == throttled_before + 1
+
+
+def test_stream_records_time_to_first_token(monkeypatch):
+    _use_stub(monkeypatch, "Namaste. Aur koi sawaal?")
+    labels = {"language": "default", "model": ai_service.BEDROCK_MODEL_ID, "scheme": "none", "mode": "stream"}
+    before = ai_service._llm_ttft.snapshot(**labels)["count"]
+    list(ai_service.generate_response_stream("ttft check", [], FarmerProfile()))
+    assert ai_service._llm_ttft.snapshot(**labels)["count"] == before + 1
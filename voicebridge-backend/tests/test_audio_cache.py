@@ -0,0 +1,179 @@
+"""
+Tests for the content-addressed TTS audio cache.
+Run with: python -m pytest tests/test_audio_cache.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import audio_cache
+from services.audio_disk_cache import DiskAudioCache
+from services.audio_cache import AudioCache, audio_key, normalize_text
+
+
+class FakeS3:
+    def __init__(self, existing=()):
+        self.objects = {key: b"" for key in existing}
+        self.puts = []
+        self.presigns = 0
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.puts.append(Key)
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key):
+        body = self.objects[Key]
+
+        class Body:
+            def iter_chunks(self, chunk_size):
+                for i in range(0, len(body), chunk_size):
+                    yield body[i:i + chunk_size]
+        return {"Body": Body(), "ContentType": "audio/mpeg"}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.presigns += 1
+        return f"https://s3.example/{Params['Key']}?n={self.presigns}"
+
+    def get_paginator(self, name):
+        s3 = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {"Contents": [{"Key": key} for key in s3.objects if key.startswith(Prefix)]}
+        return Paginator()
+
+
+def _cache(monkeypatch, s3, tmp_path):
+    monkeypatch.setattr(audio_cache, "get_client", lambda name: s3)
+    monkeypatch.setattr(audio_cache, "disk_audio", DiskAudioCache(str(tmp_path), max_bytes=10 ** 6))
+    monkeypatch.setattr(audio_cache, "TTS_CACHE_ENABLED", True)
+    cache = AudioCache(bucket="test-bucket", prefix="tts-cache/", max_keys=100, url_expiry=3600)
+    cache._ensure_index()
+    cache.index_loader.join()
+    return cache
+
+
+def test_key_ignores_whitespace_but_not_voice_or_format():
+    assert normalize_text("  Namaste   Ramesh ji\n") == "Namaste Ramesh ji"
+    base = audio_key("polly", "Namaste Ramesh ji", "mp3", voice="Kajal", engine="neural")
+    assert audio_key("polly", " Namaste  Ramesh ji ", "mp3", engine="neural", voice="Kajal") == base
+    assert audio_key("polly", "Namaste Ramesh ji", "mp3", voice="Aditi", engine="neural") != base
+    assert audio_key("polly", "Namaste Ramesh ji", "wav", voice="Kajal", engine="neural") != base
+    assert audio_key("sarvam", "Namaste Ramesh ji", "mp3", voice="Kajal", engine="neural") != base
+
+
+def test_hit_skips_synthesis_and_upload(monkeypatch, tmp_path):
+    s3 = FakeS3()
+    cache = _cache(monkeypatch, s3, tmp_path)
+    calls = []
+    synthesize = lambda: calls.append(1) or b"audio"
+    key = audio_key("polly", "Namaste", "mp3", voice="Kajal")
+
+    url, hit = cache.fetch("polly", key, "mp3", synthesize, "audio/mpeg")
+    assert hit is False and len(calls) == 1
+    assert s3.puts == [f"tts-cache/polly/{key}.mp3"]
+
+    again, hit = cache.fetch("polly", key, "mp3", synthesize, "audio/mpeg")
+    assert hit is True and len(calls) == 1 and len(s3.puts) == 1
+    # The presigned URL is reused, not re-signed
+    assert again == url and s3.presigns == 1
+    # Uploads are not copied to the local disk tier; nothing serves them from there
+    assert audio_cache.disk_audio.get(f"tts-cache/polly/{key}.mp3") is None
+
+
+def test_disk_tier_fills_when_audio_is_read_back(monkeypatch, tmp_path):
+    s3 = FakeS3()
+    cache = _cache(monkeypatch, s3, tmp_path)
+    key = audio_key("polly", "Namaste", "mp3", voice="Kajal")
+    cache.store("polly", key, "mp3", b"audio" * 1000, "audio/mpeg")
+    object_key = f"tts-cache/polly/{key}.mp3"
+    assert audio_cache.disk_audio.get(object_key) is None
+
+    assert b"".join(cache.open("polly", key, "mp3")) == b"audio" * 1000
+    assert audio_cache.disk_audio.get(object_key)[1] == "audio/mpeg"
+
+
+def test_objects_already_in_s3_are_hits_without_head(monkeypatch, tmp_path):
+    key = audio_key("sarvam", "നമസ്കാരം", "wav", language="ml-IN")
+    s3 = FakeS3(existing=[f"tts-cache/sarvam/{key}.wav", "other/unrelated.wav"])
+    cache = _cache(monkeypatch, s3, tmp_path)
+    assert cache.stats()["known"] == 1
+
+    url, hit = cache.fetch("sarvam", key, "wav", lambda: 1 / 0, "audio/wav")
+    assert hit is True and s3.puts == []
+
+
+def test_failed_synthesis_is_not_cached(monkeypatch, tmp_path):
+    s3 = FakeS3()
+    cache = _cache(monkeypatch, s3, tmp_path)
+    key = audio_key("polly", "Namaste", "mp3")
+
+    def broken():
+        raise RuntimeError("Polly throttled")
+
+    try:
+        cache.fetch("polly", key, "mp3", broken, "audio/mpeg")
+        assert False, "expected the synthesis error to propagate"
+    except RuntimeError:
+        pass
+    assert s3.puts == [] and not cache.known(cache.object_key("polly", key, "mp3"))
+    url, hit = cache.fetch("polly", key, "mp3", lambda: b"audio", "audio/mpeg")
+    assert hit is False and len(s3.puts) == 1
+
+
+def test_concurrent_misses_synthesize_once(monkeypatch, tmp_path):
+    s3 = FakeS3()
+    cache = _cache(monkeypatch, s3, tmp_path)
+    key = audio_key("polly", "Dhanyavaad", "mp3")
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return b"audio"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch("polly", key, "mp3", slow, "audio/mpeg")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and len(s3.puts) == 1
+    assert sorted(hit for _, hit in results) == [False] + [True] * 7
+
+
+def test_disabled_cache_always_synthesizes(monkeypatch, tmp_path):
+    s3 = FakeS3()
+    cache = _cache(monkeypatch, s3, tmp_path)
+    monkeypatch.setattr(audio_cache, "TTS_CACHE_ENABLED", False)
+    key = audio_key("polly", "Namaste", "mp3")
+    for _ in range(2):
+        assert cache.fetch("polly", key, "mp3", lambda: b"audio", "audio/mpeg")[1] is False
+    assert len(s3.puts) == 2
+
+
+def test_urls_go_through_the_audio_route_with_a_base_url(monkeypatch, tmp_path):
+    from services import audio_disk_cache, voice_memory_service
+
+    s3 = FakeS3()
+    cache = _cache(monkeypatch, s3, tmp_path)
+    monkeypatch.setattr(audio_disk_cache, "AUDIO_BASE_URL", "https://api.example/dev")
+    key = audio_key("polly", "Namaste", "mp3", voice="Kajal")
+    object_key = f"tts-cache/polly/{key}.mp3"
+
+    url, hit = cache.fetch("polly", key, "mp3", lambda: b"audio", "audio/mpeg")
+    assert (url, hit) == (f"https://api.example/dev/audio/{object_key}", False)
+    # The client's first request is served from the local disk tier
+    assert audio_cache.disk_audio.get(object_key)[1] == "audio/mpeg"
+    assert cache.fetch("polly", key, "mp3", lambda: b"audio", "audio/mpeg") == (url, True)
+    assert s3.presigns == 0
+
+    monkeypatch.setattr(voice_memory_service, "USE_MOCK", False)
+    clip = voice_memory_service.get_clip("KCC", "en-IN")
+    assert clip["audio_url"].startswith("https://api.example/dev/audio/voice_memory/")
@@ -0,0 +1,104 @@
+"""
+Tests for the local audio disk tier.
+Run with: python -m pytest tests/test_audio_disk_cache.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import audio_disk_cache
+from services.audio_disk_cache import INDEX_FILE, DiskAudioCache, content_type_for, fetch_origin
+
+
+def test_put_then_get_counts_hits_and_bytes_saved(tmp_path):
+    cache = DiskAudioCache(str(tmp_path), max_bytes=1000)
+    assert cache.get("tts-cache/polly/a.mp3") is None
+    path = cache.put("tts-cache/polly/a.mp3", b"x" * 100, "audio/mpeg")
+    assert Path(path).read_bytes() == b"x" * 100
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    for _ in range(3):
+        assert cache.get("tts-cache/polly/a.mp3") == (path, "audio/mpeg")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bytes_saved"], stats["bytes"]) == (3, 1, 300, 100)
+
+
+def test_evicts_least_recently_used_by_bytes(tmp_path):
+    cache = DiskAudioCache(str(tmp_path), max_bytes=250)
+    paths = {key: cache.put(key, b"x" * 100) for key in ("a.mp3", "b.mp3")}
+    cache.get("a.mp3")  # b is now the least recently used
+    cache.put("c.mp3", b"x" * 100)
+
+    assert cache.get("b.mp3") is None and not os.path.exists(paths["b.mp3"])
+    assert cache.get("a.mp3") is not None and cache.get("c.mp3") is not None
+    assert cache.stats()["bytes"] == 200 and cache.stats()["evictions"] == 1
+    # Larger than the whole tier: not kept, nothing else evicted
+    assert cache.put("huge.wav", b"x" * 300) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_sidecar_index_survives_a_restart(tmp_path):
+    first = DiskAudioCache(str(tmp_path), max_bytes=1000)
+    first.put("voice_memory/voice_memory_KCC.mp3.mpeg", b"clip", "audio/mpeg")
+    first.put("gone.wav", b"wav")
+    os.remove(first.get("gone.wav")[0])
+    assert set(json.loads((tmp_path / INDEX_FILE).read_text())) == {
+        "voice_memory/voice_memory_KCC.mp3.mpeg", "gone.wav"}
+
+    second = DiskAudioCache(str(tmp_path), max_bytes=1000)
+    assert second.get("voice_memory/voice_memory_KCC.mp3.mpeg")[1] == "audio/mpeg"
+    assert second.get("gone.wav") is None
+    assert second.stats()["bytes"] == 4
+
+
+def test_disabled_when_size_is_zero(tmp_path):
+    cache = DiskAudioCache(str(tmp_path), max_bytes=0)
+    assert cache.put("a.mp3", b"x") is None and cache.get("a.mp3") is None
+
+
+def test_content_types():
+    assert content_type_for("voice_memory_KCC.mp3.mpeg") == "audio/mpeg"
+    assert content_type_for("tts-cache/sarvam/abc.wav") == "audio/wav"
+
+
+def test_mock_origin_is_voice_memory_dir_only(monkeypatch):
+    monkeypatch.setattr(audio_disk_cache, "USE_MOCK", True)
+    data, content_type = fetch_origin("voice_memory_KCC.mp3.mpeg")
+    assert data and content_type == "audio/mpeg"
+    assert fetch_origin("../schemes.json") is None
+    assert fetch_origin("missing.mp3") is None
+
+
+def test_aws_origin_only_reads_audio_prefixes(monkeypatch):
+    class FakeS3:
+        def get_object(self, Bucket, Key):
+            class Body:
+                def read(self):
+                    return b"audio"
+            return {"Body": Body(), "ContentType": "audio/mpeg"}
+
+    monkeypatch.setattr(audio_disk_cache, "USE_MOCK", False)
+    monkeypatch.setattr(audio_disk_cache, "get_client", lambda name: FakeS3())
+    assert fetch_origin("voice_memory/voice_memory_KCC.mp3") == (b"audio", "audio/mpeg")
+    assert fetch_origin("intros/abc.json") is None
+    assert fetch_origin("tts-cache/../intros/abc.json") is None
+
+
+def test_serve_audio_reads_through_the_tier(monkeypatch, tmp_path):
+    from app import app
+    tier = DiskAudioCache(str(tmp_path), max_bytes=10 ** 6)
+    monkeypatch.setattr(audio_disk_cache, "disk_audio", tier)
+    monkeypatch.setattr(audio_disk_cache, "USE_MOCK", True)
+    client = app.test_client()
+
+    first = client.get("/audio/voice_memory_PMFBY.mp3.mpeg")
+    second = client.get("/audio/voice_memory_PMFBY.mp3.mpeg")
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data and first.mimetype == "audio/mpeg"
+    second.close()
+    assert (tier.stats()["misses"], tier.stats()["hits"]) == (1, 1)
+    assert client.get("/audio/missing.mp3").status_code == 404
@@ -0,0 +1,178 @@
+"""
+Tests for regional audio format negotiation and transcoding.
+ffmpeg is replaced by a small script that records its arguments and upper-cases
+its input, so the subprocess plumbing runs without ffmpeg installed.
+Run with: python -m pytest tests/test_audio_transcoder.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import audio_cache, audio_transcoder, tts_service, turn_orchestrator
+from services.audio_cache import AudioCache
+from services.audio_disk_cache import DiskAudioCache
+from services.audio_transcoder import TranscodeError, negotiate, stream_transcode, transcode
+
+FAKE_FFMPEG = """#!{python}
+import sys
+open({args!r}, "w").write(" ".join(sys.argv[1:]))
+data = sys.stdin.buffer.read()
+if data.startswith(b"bad"):
+    sys.exit(1)
+sys.stdout.buffer.write(data.upper())
+"""
+
+
+def _fake_ffmpeg(monkeypatch, tmp_path) -> Path:
+    """Installs the fake encoder; returns the file its arguments are written to."""
+    args = tmp_path / "args.txt"
+    script = tmp_path / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable, args=str(args)))
+    script.chmod(0o755)
+    monkeypatch.setattr(audio_transcoder, "_ffmpeg", str(script))
+    return args
+
+
+def test_negotiation_order(monkeypatch, tmp_path):
+    _fake_ffmpeg(monkeypatch, tmp_path)
+    monkeypatch.setattr(audio_transcoder, "SARVAM_AUDIO_FORMAT", "mp3")
+    assert negotiate() == "mp3"
+    assert negotiate("OPUS", "audio/mpeg") == "opus"  # explicit parameter wins
+    assert negotiate(None, "audio/mpeg;q=0.5, audio/ogg; codecs=opus") == "opus"
+    assert negotiate(None, "audio/ogg;q=0.2, audio/mpeg;q=0.9") == "mp3"
+    assert negotiate(None, "application/json") == "mp3"  # JSON APIs send non-audio Accept
+    assert negotiate(None, "audio/*") == "mp3"
+    assert negotiate("flac", "audio/wav") == "wav"
+
+
+def test_everything_is_wav_without_ffmpeg(monkeypatch):
+    monkeypatch.setattr(audio_transcoder, "_ffmpeg", "")
+    assert negotiate() == negotiate("opus") == negotiate(None, "audio/mpeg") == "wav"
+    assert transcode(b"RIFF", "wav") == b"RIFF"
+    try:
+        transcode(b"RIFF", "mp3")
+        assert False, "expected TranscodeError"
+    except TranscodeError:
+        pass
+
+
+def test_transcode_uses_speech_settings(monkeypatch, tmp_path):
+    args = _fake_ffmpeg(monkeypatch, tmp_path)
+    assert transcode(b"riff", "opus") == b"RIFF"
+    recorded = args.read_text()
+    assert "-i pipe:0" in recorded and "libopus" in recorded and "-ac 1" in recorded
+    assert "-ar 24000" in recorded and "-application voip" in recorded
+    try:
+        transcode(b"bad wav", "mp3")
+        assert False, "expected TranscodeError"
+    except TranscodeError:
+        pass
+
+
+def test_stream_transcode_pipes_chunks_through(monkeypatch, tmp_path):
+    _fake_ffmpeg(monkeypatch, tmp_path)
+    assert b"".join(stream_transcode(iter([b"riff", b"data" * 5000]), "mp3")) == b"RIFF" + b"DATA" * 5000
+    assert list(stream_transcode(iter([b"riff"]), "wav")) == [b"riff"]
+    try:
+        list(stream_transcode(iter([b"bad", b"wav"]), "mp3"))
+        assert False, "expected TranscodeError"
+    except TranscodeError:
+        pass
+
+
+def _live_sarvam(monkeypatch, tmp_path, calls):
+    class FakeS3:
+        def __init__(self):
+            self.puts = {}
+
+        def put_object(self, Key, Body, ContentType, **kwargs):
+            self.puts[Key] = (Body, ContentType)
+
+        def get_object(self, Bucket, Key):
+            body, mime = self.puts[Key]
+
+            class Stream:
+                def iter_chunks(self, chunk_size):
+                    return iter([body])
+            return {"Body": Stream(), "ContentType": mime}
+
+        def generate_presigned_url(self, operation, Params, ExpiresIn):
+            return f"https://s3/{Params['Key']}"
+
+        def get_paginator(self, name):
+            class Paginator:
+                def paginate(self, **kwargs):
+                    return [{"Contents": []}]
+            return Paginator()
+
+    s3 = FakeS3()
+    monkeypatch.setattr(audio_cache, "get_client", lambda name: s3)
+    monkeypatch.setattr(audio_cache, "TTS_CACHE_ENABLED", True)
+    monkeypatch.setattr(audio_cache, "disk_audio", DiskAudioCache(str(tmp_path / "disk"), max_bytes=10 ** 6))
+    monkeypatch.setattr(tts_service, "tts_cache", AudioCache(bucket="b", prefix="tts-cache/", max_keys=100))
+    monkeypatch.setattr(tts_service, "USE_MOCK", False)
+    monkeypatch.setattr(tts_service, "_sarvam_audio", lambda text, language: calls.append(text) or b"riff wav")
+    return s3
+
+
+def _queue_background(monkeypatch) -> list:
+    """Holds work sent to the turn pool so a test can run it after the request."""
+    pending = []
+    monkeypatch.setattr(turn_orchestrator, "submit", lambda fn, *args: pending.append((fn, args)))
+    return pending
+
+
+def _run(pending):
+    while pending:
+        fn, args = pending.pop(0)
+        fn(*args)
+
+
+def test_regional_audio_is_encoded_off_the_request(monkeypatch, tmp_path):
+    args = _fake_ffmpeg(monkeypatch, tmp_path)
+    pending = _queue_background(monkeypatch)
+    calls = []
+    s3 = _live_sarvam(monkeypatch, tmp_path, calls)
+
+    # A miss answers with the WAV; ffmpeg has not run yet
+    result = tts_service.synthesize_regional("Namaskaram", "ml-IN", "opus")
+    assert result["success"] and result["format"] == "wav" and not result["cached"]
+    assert result["audio_url"].endswith(".wav") and not args.exists()
+    assert list(s3.puts.values()) == [(b"riff wav", "audio/wav")]
+
+    _run(pending)
+    opus_key = next(key for key in s3.puts if key.endswith(".opus"))
+    assert s3.puts[opus_key] == (b"RIFF WAV", "audio/ogg")
+    result = tts_service.synthesize_regional("Namaskaram", "ml-IN", "opus")
+    assert result["format"] == "opus" and result["content_type"] == "audio/ogg" and result["cached"]
+    assert not pending
+
+    # Each format is its own cache entry, encoded from the cached WAV
+    assert tts_service.synthesize_regional("Namaskaram", "ml-IN", "mp3")["format"] == "wav"
+    _run(pending)
+    assert tts_service.synthesize_regional("Namaskaram", "ml-IN", "mp3")["format"] == "mp3"
+    assert calls == ["Namaskaram"]
+
+
+def test_regional_stays_wav_when_encoding_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(audio_transcoder, "_ffmpeg", str(tmp_path / "missing-ffmpeg"))
+    pending = _queue_background(monkeypatch)
+    calls = []
+    s3 = _live_sarvam(monkeypatch, tmp_path, calls)
+
+    result = tts_service.synthesize_regional("Vanakkam", "ta-IN", "mp3")
+    assert result["success"] and result["format"] == "wav" and result["audio_url"].endswith(".wav")
+    _run(pending)
+    assert [body for body, _ in s3.puts.values()] == [b"riff wav"]
+    assert calls == ["Vanakkam"]  # Sarvam is not called twice
+
+
+def test_regional_stream_is_encoded_on_the_fly(monkeypatch, tmp_path):
+    _fake_ffmpeg(monkeypatch, tmp_path)
+    calls = []
+    _live_sarvam(monkeypatch, tmp_path, calls)
+    result = tts_service.stream_speech("Namaskaram", "ml-IN", "mp3")
+    assert result["content_type"] == "audio/mpeg"
+    assert b"".join(result["chunks"]) == b"RIFF WAV"
@@ -0,0 +1,31 @@
+"""
+Tests for the shared boto3 client registry.
+Run with: python -m pytest tests/test_aws_clients.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.aws_clients import get_client, reset_clients
+
+
+def test_client_is_created_once_per_service():
+    reset_clients()
+    s3 = get_client("s3")
+    assert get_client("s3") is s3
+    assert get_client("polly") is not s3
+    assert s3.meta.config.retries["mode"] == "adaptive"
+
+
+def test_concurrent_first_use_builds_one_client():
+    reset_clients()
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_client("sns"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in seen}) == 1
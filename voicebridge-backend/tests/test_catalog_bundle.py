@@ -0,0 +1,80 @@
+"""
+Tests for the deploy-time catalog bundle: round trip, validation against the
+live source, and the background version check in AWS mode (fake table).
+Run with: python -m pytest tests/test_catalog_bundle.py
+"""
+
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.scheme_service as scheme_service
+import services.scheme_store as scheme_store
+from services.catalog_bundle import file_sha1, read_bundle
+from services.scheme_service import CATALOG_META_ID, SCHEMES_PATH, SchemeCatalog, build_bundle
+from services.sms_composer import sms_parts
+from test_scheme_catalog import _Resource, _Table
+
+SCHEMES = json.loads(SCHEMES_PATH.read_text(encoding="utf-8"))
+
+
+def _bundled_catalog(tmp_path, schemes=SCHEMES):
+    path = tmp_path / "schemes.json"
+    path.write_text(json.dumps(schemes, ensure_ascii=False), encoding="utf-8")
+    bundle = tmp_path / "catalog.bundle"
+    build_bundle(bundle, schemes, "json", file_sha1(path))
+    return path, bundle
+
+
+def test_bundle_matches_compiled_catalog(tmp_path):
+    path, bundle = _bundled_catalog(tmp_path)
+    fresh = SchemeCatalog(path, check_interval=60, bundle_path="")
+    bundled = SchemeCatalog(path, check_interval=60, bundle_path=bundle)
+
+    assert bundled.all() == fresh.all()
+    assert bundled.from_bundle and not fresh.from_bundle
+    assert [rule for _, rule in bundled.rules()] == [rule for _, rule in fresh.rules()]
+    for message in ("kisan credit card chahiye", "फसल बीमा", "pm kisan ka paisa", "namaste"):
+        assert bundled.index().match_ids(message) == fresh.index().match_ids(message)
+    for scheme in SCHEMES:
+        assert bundled.sms_parts(scheme["scheme_id"]) == sms_parts(scheme)
+
+
+def test_stale_or_corrupt_bundle_is_ignored(tmp_path):
+    path, bundle = _bundled_catalog(tmp_path)
+    path.write_text(json.dumps(SCHEMES[:2]), encoding="utf-8")
+    stale = SchemeCatalog(path, check_interval=60, bundle_path=bundle)
+    assert len(stale.all()) == 2 and not stale.from_bundle
+
+    bundle.write_bytes(b"not a bundle")
+    assert read_bundle(bundle) is None
+    assert read_bundle(tmp_path / "missing.bundle") is None
+
+
+def test_dynamodb_bundle_verified_in_background(tmp_path, monkeypatch):
+    items = [dict(s) for s in SCHEMES] + [{"scheme_id": CATALOG_META_ID, "version": Decimal(3)}]
+    table = _Table(items)
+    monkeypatch.setattr(scheme_service, "USE_MOCK", False)
+    monkeypatch.setattr(scheme_service, "get_resource", lambda name: _Resource(table))
+    monkeypatch.setattr(scheme_store, "get_resource", lambda name: _Resource(table))
+    monkeypatch.setattr(scheme_store, "DYNAMODB_SCAN_SEGMENTS", 1)
+    bundle = tmp_path / "catalog.bundle"
+    build_bundle(bundle, SCHEMES, "dynamodb", 3)
+
+    catalog = SchemeCatalog(check_interval=60, bundle_path=bundle)
+    assert len(catalog.all()) == len(SCHEMES) and catalog.from_bundle
+    catalog.verifier.join(5)
+    catalog.all()
+    assert catalog.from_bundle and table.scans == 0
+
+    # Table moved on since the deploy: the verifier drops the bundle
+    items[-1]["version"] = Decimal(4)
+    catalog = SchemeCatalog(check_interval=60, bundle_path=bundle)
+    catalog.all()
+    assert catalog.from_bundle
+    catalog.verifier.join(5)
+    catalog.all()
+    assert not catalog.from_bundle and table.scans == 1 and catalog.version == 4
@@ -0,0 +1,100 @@
+"""
+Tests for the declarative eligibility rules and bulk (NumPy) evaluation.
+Run with: python -m pytest tests/test_eligibility_engine.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.farmer import FarmerProfile
+from services.eligibility_engine import (
+    FAIL_BANK, FAIL_INCOME, FAIL_KCC, FAIL_LAND,
+    FarmerTable, SchemeRule, compile_rules, describe_failures, evaluate,
+)
+from services.scheme_service import check_eligibility, check_eligibility_bulk
+
+SCHEMES = [
+    {"scheme_id": "OPEN", "min_land_acres": 0, "requires_kcc": False, "requires_bank_account": False, "income_limit": 0},
+    {"scheme_id": "BANK", "min_land_acres": 0, "requires_kcc": False, "requires_bank_account": True, "income_limit": 0},
+    {"scheme_id": "SMALL", "min_land_acres": 1, "requires_kcc": True, "requires_bank_account": True,
+     "income_limit": 200000},
+    {"scheme_id": "BANK_2", "min_land_acres": 0, "requires_kcc": False, "requires_bank_account": True, "income_limit": 0},
+]
+
+
+def _random_farmers(n, seed=7):
+    rng = random.Random(seed)
+    return [FarmerProfile(land_acres=rng.choice([0, 0.5, 1, 2.5, 6]), has_kcc=rng.random() < 0.4,
+                          has_bank_account=rng.random() < 0.8, annual_income=rng.choice([0, 150000, 250000]),
+                          age=rng.randint(18, 70)) for _ in range(n)]
+
+
+def test_rule_failures_for_one_farmer():
+    rule = SchemeRule.from_scheme(SCHEMES[2])
+    assert rule.failures(FarmerProfile(land_acres=2, has_kcc=True, annual_income=100000)) == 0
+    bits = rule.failures(FarmerProfile(land_acres=0.5, has_kcc=False, has_bank_account=False, annual_income=300000))
+    assert bits == FAIL_LAND | FAIL_KCC | FAIL_BANK | FAIL_INCOME
+    assert describe_failures(FAIL_LAND | FAIL_BANK) == ["land_below_minimum", "no_bank_account"]
+
+
+def test_bulk_evaluation_matches_scalar_rules():
+    farmers = _random_farmers(500)
+    rules = compile_rules(SCHEMES)
+    result = evaluate(FarmerTable.from_records([f.to_dict() for f in farmers]), rules)
+
+    assert result.eligible.shape == (500, 4)
+    for i, farmer in enumerate(farmers):
+        for j, rule in enumerate(rules):
+            assert result.failures[i, j] == rule.failures(farmer)
+    assert result.counts()["OPEN"] == 500
+    assert result.counts()["BANK"] == result.counts()["BANK_2"]
+
+
+def test_targets_reasons_and_failure_counts():
+    table = FarmerTable.from_records([
+        {"phone_number": "+911", "land_acres": 2, "has_kcc": True, "has_bank_account": True},
+        {"phone_number": "+912", "land_acres": 0.5, "has_kcc": "no", "has_bank_account": "yes"},
+    ], id_field="phone_number")
+    result = evaluate(table, compile_rules(SCHEMES))
+    assert list(result.targets("SMALL")) == ["+911"]
+    assert result.reasons(1, "SMALL") == ["land_below_minimum", "no_kcc"]
+    assert result.reasons(0, "SMALL") == []
+    assert result.failure_counts("SMALL")["no_kcc"] == 1
+
+
+def test_csv_registry_with_missing_cells_uses_profile_defaults(tmp_path):
+    path = tmp_path / "registry.csv"
+    path.write_text(
+        "farmer_id,land_acres,has_kcc,has_bank_account,district\n"
+        "F1,2.5,TRUE,yes,Mandya\n"
+        "F2,,0,,Mandya\n"
+        "F3,1,y,no,Hassan\n",
+        encoding="utf-8",
+    )
+    table = FarmerTable.from_csv(path, id_field="farmer_id")
+    assert len(table) == 3
+    assert list(table.columns["land_acres"]) == [2.5, 0.0, 1.0]
+    assert list(table.columns["has_kcc"]) == [True, False, True]
+    assert list(table.columns["has_bank_account"]) == [True, True, False]  # empty -> default True
+
+    result = evaluate(table, compile_rules(SCHEMES))
+    assert list(result.targets("SMALL")) == ["F1"]
+    assert result.reasons(2, "BANK") == ["no_bank_account"]
+
+
+def test_catalog_rules_agree_with_check_eligibility():
+    farmers = _random_farmers(50, seed=3)
+    result = check_eligibility_bulk(FarmerTable.from_records([f.to_dict() for f in farmers]))
+    for i, farmer in enumerate(farmers):
+        eligible_ids = {s["scheme_id"] for s in check_eligibility(farmer)}
+        assert eligible_ids == {sid for j, sid in enumerate(result.scheme_ids) if result.eligible[i, j]}
+
+
+def test_check_eligibility_honours_bank_requirement():
+    no_bank = FarmerProfile(land_acres=2, state="Karnataka", has_bank_account=False)
+    ids = {s["scheme_id"] for s in check_eligibility(no_bank)}
+    assert "PM_KISAN" not in ids and "ATAL_PENSION" not in ids
+    assert {"AYUSHMAN_BHARAT", "SOIL_HEALTH_CARD", "NFSA_RATION"} <= ids
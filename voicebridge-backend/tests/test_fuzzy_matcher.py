@@ -0,0 +1,86 @@
+"""
+Tests for phonetic/fuzzy scheme matching of noisy STT transcripts.
+Run with: python -m pytest tests/test_fuzzy_matcher.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.fuzzy_matcher import FuzzySchemeMatcher, phonetic_key, romanize
+from services.scheme_index import SCHEME_ALIASES
+from services.scheme_service import catalog, detect_schemes, match_schemes_fuzzy
+
+ALIASES = {sid: [k for keywords in by_language.values() for k in keywords]
+           for sid, by_language in SCHEME_ALIASES.items()}
+
+
+def test_romanization_is_shared_across_scripts():
+    devanagari_ki = "कि"
+    malayalam_ki = "കി"
+    tamil_ki = "கி"
+    assert romanize(devanagari_ki) == romanize(malayalam_ki) == romanize(tamil_ki) == "ki"
+    assert romanize("क") == "ka"  # inherent vowel
+
+
+def test_transcription_variants_share_a_key():
+    hindi_pm_kisan = SCHEME_ALIASES["PM_KISAN"]["hi"][0]
+    assert phonetic_key("pm kisan") == phonetic_key("pihem kisan") == phonetic_key(hindi_pm_kisan)
+    assert phonetic_key("pmfby") != phonetic_key("kcc")
+    assert phonetic_key("kcc") == phonetic_key("kay see see")
+
+
+def test_misheard_names_resolve_with_confidence():
+    matcher = FuzzySchemeMatcher(ALIASES)
+    misheard_hindi = SCHEME_ALIASES["PM_KISAN"]["hi"][0].replace("स", "श")  # sa -> sha
+    for message, scheme_id in [
+        ("mujhe pi em kisaan ke baare mein batao", "PM_KISAN"),
+        (misheard_hindi, "PM_KISAN"),
+        ("kay see see kya hota hai", "KCC"),
+        ("fasl beema kab milega", "PMFBY"),
+        ("ayushmaan card", "AYUSHMAN_BHARAT"),
+    ]:
+        top = matcher.match(message)[0]
+        assert top.scheme_id == scheme_id, message
+        assert top.confidence >= 0.85, message
+
+
+def test_small_talk_stays_below_acceptance():
+    i_am_a_farmer = "मैं {} हूँ".format(SCHEME_ALIASES["PM_KISAN"]["hi"][1].split()[0])
+    for message in ["namaste", "main theek hoon", "mausam kaisa hai aaj", "aap kaun ho",
+                    "main gaon mein rehta hoon", "mere paas do bigha zameen hai", "main kisan hoon",
+                    i_am_a_farmer, "ghar banana hai", "mujhe samaan chahiye", "kisi se baat karni hai"]:
+        schemes, confidence = detect_schemes(message)
+        assert schemes == [] and confidence < 0.85, message
+
+
+def test_fuzzy_confidence_stays_below_exact():
+    matcher = FuzzySchemeMatcher(ALIASES)
+    assert all(m.confidence < 1.0 for m in matcher.match("pi em kisaan aur kay see see"))
+    assert detect_schemes("kisaan credit") == (["KCC"], 1.0)  # not PM_KISAN's 'kisaan'
+    assert matcher.match("kisaan credit")[0].scheme_id == "KCC"
+
+
+def test_exact_matches_win_over_fuzzy():
+    assert detect_schemes("kcc aur fasal bima") == (["KCC", "PMFBY"], 1.0)
+    schemes, confidence = detect_schemes("pi em kisaan samman")
+    assert schemes == ["PM_KISAN"] and confidence == 1.0
+    schemes, confidence = detect_schemes("ayushmaan card")
+    assert schemes == ["AYUSHMAN_BHARAT"] and 0.85 <= confidence <= 1.0
+
+
+def test_per_message_latency_is_bounded():
+    # Full catalog matcher, window cache cleared before every message
+    matcher = catalog.fuzzy()
+    words = "namaste ji mujhe pichhle mahine ke baare mein jaankari chahiye khet paani beej".split()
+    timings = []
+    for i in range(41):
+        message = " ".join(f"{word}{i}" if n % 3 == 0 else word for n, word in enumerate(words * 2))
+        matcher._seen.clear()
+        started = time.perf_counter()
+        matcher.match(message)
+        timings.append(time.perf_counter() - started)
+    assert sorted(timings)[len(timings) // 2] < 0.001  # median, so a loaded runner does not flake
+    assert match_schemes_fuzzy("") == []
@@ -0,0 +1,74 @@
+"""
+Tests for conversation history windowing and summarization.
+Run with: python -m pytest tests/test_history_manager.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.history_manager import HistoryManager, estimate_tokens
+
+
+def _history(exchanges: int) -> list[dict]:
+    history = []
+    for i in range(exchanges):
+        history.append({"role": "user", "content": f"Question {i} about PM-KISAN?"})
+        history.append({"role": "assistant", "content": f"Answer {i}. Aur koi sawaal hai?"})
+    return history
+
+
+def test_estimate_tokens_weights_indic_scripts_higher():
+    english = "How do I apply for the scheme"
+    hindi = "मैं योजना के लिए कैसे आवेदन करूं"
+    malayalam = "ഞാൻ എങ്ങനെ അപേക്ഷിക്കും"
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(hindi) / len(hindi) > estimate_tokens(english) / len(english)
+    assert estimate_tokens(malayalam) / len(malayalam) > estimate_tokens(hindi) / len(hindi)
+
+
+def test_short_history_is_sent_verbatim():
+    manager = HistoryManager(max_turns=6, token_budget=1500)
+    recent, summary = manager.window(_history(3))
+    assert recent == _history(3)
+    assert summary == ""
+
+
+def test_older_turns_are_folded_into_summary():
+    manager = HistoryManager(max_turns=2, token_budget=1500)
+    recent, summary = manager.window(_history(5))
+    assert recent == _history(5)[-4:]
+    assert recent[0]["role"] == "user"
+    assert summary.splitlines()[0] == "Farmer: Question 0 about PM-KISAN?"
+    assert "Sahaya: Answer 2." in summary
+
+
+def test_window_respects_token_budget_and_starts_with_user():
+    long_turn = "किसान क्रेडिट कार्ड के बारे में विस्तार से बताइए। " * 20
+    history = [{"role": "assistant", "content": "Namaste!"}]
+    for _ in range(4):
+        history += [{"role": "user", "content": long_turn}, {"role": "assistant", "content": long_turn}]
+    manager = HistoryManager(max_turns=10, token_budget=800)
+    recent, summary = manager.window(history)
+
+    used = sum(estimate_tokens(m["content"]) + 4 for m in recent) + estimate_tokens(summary)
+    assert used <= 800
+    assert not recent or recent[0]["role"] == "user"
+    assert summary
+
+
+def test_summary_is_cached_and_extended_per_conversation():
+    manager = HistoryManager(max_turns=1, token_budget=1500)
+    manager.window(_history(3), "call-1")
+    recent, summary = manager.window(_history(4), "call-1")
+    assert manager.stats()["hits"] == 1
+    assert summary.count("Farmer:") == 3
+    assert recent == _history(4)[-2:]
+
+
+def test_malformed_items_are_dropped():
+    manager = HistoryManager()
+    recent, _ = manager.window([None, {"role": "system", "content": "x"}, {"role": "user", "content": "  "},
+                                {"role": "user", "content": "KCC?"}])
+    assert recent == [{"role": "user", "content": "KCC?"}]
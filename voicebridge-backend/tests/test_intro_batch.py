@@ -0,0 +1,179 @@
+"""
+Tests for campaign intro pre-generation (mock mode, no AWS calls).
+Run with: python -m pytest tests/test_intro_batch.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.intro_batch as intro_batch
+from services.intro_batch import TokenBucket, intro_key, normalize_items
+
+
+def test_intro_key_normalizes_name_and_land():
+    assert intro_key("  Ramesh   Kumar ", "pm_kisan", 2, True) == intro_key("ramesh kumar", "PM_KISAN", 2.0, 1)
+    assert intro_key("Ramesh", "KCC", 2.0, False) != intro_key("Ramesh", "KCC", 2.0, True)
+
+
+def test_token_bucket_limits_rate_after_burst():
+    bucket = TokenBucket(rate=20, burst=2)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # 2 from the burst, 4 more at 20/s
+    assert time.monotonic() - started >= 0.18
+
+
+def test_normalize_items_expands_farmers_and_schemes():
+    farmers = [
+        {"name": "Ramesh", "land_acres": 2, "has_kcc": False, "scheme_ids": ["KCC", "PMFBY"]},
+        {"name": "Sita", "land_acres": 1},
+        {"land_acres": 3},  # no name: skipped
+    ]
+    items = normalize_items(farmers, match_schemes=lambda land, kcc: ["PM_KISAN", "PMFBY"])
+    assert [(i["farmer_name"], i["scheme_id"]) for i in items] == [
+        ("Ramesh", "KCC"), ("Ramesh", "PMFBY"), ("Sita", "PM_KISAN")
+    ]
+
+
+def test_batch_generates_concurrently_and_webhook_only_looks_up(monkeypatch):
+    calls = []
+
+    def fake_generate(name, scheme_id, land, kcc):
+        calls.append((name, scheme_id))
+        time.sleep(0.05)
+        return f"{name} ji, {scheme_id} aapke liye hai।"
+
+    monkeypatch.setattr(intro_batch, "generate_intro", fake_generate)
+    monkeypatch.setattr(intro_batch, "_bucket", TokenBucket(rate=1000, burst=100))
+    items = normalize_items([{"name": f"Farmer {i}", "land_acres": 2} for i in range(16)], ["KCC"])
+
+    started = time.monotonic()
+    job = intro_batch.wait_for_job(intro_batch.start_batch(items)["job_id"], timeout=5)
+    assert job["status"] == "completed" and job["generated"] == 16
+    assert time.monotonic() - started < 16 * 0.05
+
+    assert intro_batch.get_intro("farmer 3", "KCC", 2, False) == "Farmer 3 ji, KCC aapke liye hai।"
+    rerun = intro_batch.wait_for_job(intro_batch.start_batch(items)["job_id"], timeout=5)
+    assert rerun["skipped"] == 16 and len(calls) == 16
+
+
+def test_throttled_generation_is_retried(monkeypatch):
+    attempts = []
+
+    def flaky_generate(name, scheme_id, land, kcc):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("ThrottlingException: Rate exceeded")
+        return "Ramesh ji, PMFBY se fasal surakshit hai।"
+
+    monkeypatch.setattr(intro_batch, "generate_intro", flaky_generate)
+    monkeypatch.setattr(intro_batch.time, "sleep", lambda s: None)
+    items = normalize_items([{"name": "Throttled Ramesh", "land_acres": 4}], ["PMFBY"])
+    job = intro_batch.start_batch(items)
+    deadline = time.monotonic() + 5
+    while intro_batch.get_job(job["job_id"])["status"] != "completed" and time.monotonic() < deadline:
+        pass
+    assert intro_batch.get_job(job["job_id"])["generated"] == 1
+    assert len(attempts) == 2
+
+
+class _S3Error(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+def test_transient_s3_errors_are_not_remembered(monkeypatch):
+    calls = []
+
+    class FlakyS3:
+        def get_object(self, Bucket, Key):
+            calls.append(Key)
+            raise _S3Error("SlowDown" if len(calls) == 1 else "NoSuchKey")
+
+    monkeypatch.setattr(intro_batch, "USE_MOCK", False)
+    monkeypatch.setattr(intro_batch, "get_client", lambda name: FlakyS3())
+    monkeypatch.setattr(intro_batch, "_missing", intro_batch.LRUCache(maxsize=10, ttl_seconds=0.05))
+    for _ in range(3):
+        assert intro_batch.get_intro("Flaky Farmer", "KCC", 1, False) is None
+    # SlowDown is retried on the next stage; NoSuchKey is then remembered
+    assert len(calls) == 2
+    time.sleep(0.06)  # the "not batched" entry expires, so a later batch is seen
+    intro_batch.get_intro("Flaky Farmer", "KCC", 1, False)
+    assert len(calls) == 3
+
+
+def test_finished_jobs_are_pruned(monkeypatch):
+    monkeypatch.setattr(intro_batch, "INTRO_JOB_TTL_SECONDS", 0.05)
+    old = intro_batch.start_batch([])
+    time.sleep(0.06)
+    new = intro_batch.start_batch([])
+    assert intro_batch.get_job(old["job_id"]) is None
+    assert intro_batch.get_job(new["job_id"])["status"] == "completed"
+
+
+def test_access_denied_counts_as_not_batched(monkeypatch):
+    calls = []
+
+    class NoListS3:
+        def get_object(self, Bucket, Key):
+            calls.append(Key)
+            raise _S3Error("AccessDenied")  # missing key, no s3:ListBucket
+
+    monkeypatch.setattr(intro_batch, "USE_MOCK", False)
+    monkeypatch.setattr(intro_batch, "get_client", lambda name: NoListS3())
+    monkeypatch.setattr(intro_batch, "_missing", intro_batch.LRUCache(maxsize=10, ttl_seconds=60))
+    for _ in range(3):
+        assert intro_batch.get_intro("Unbatched Farmer", "KCC", 1, False) is None
+    assert len(calls) == 1
+
+
+class _DictS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _S3Error("NoSuchKey")
+        body = self.objects[Key]
+
+        class Body:
+            def read(self):
+                return body
+        return {"Body": Body()}
+
+
+def test_lambda_runner_chains_chunks_and_keeps_progress_in_s3(monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(intro_batch, "USE_MOCK", False)
+    monkeypatch.setattr(intro_batch, "get_client", lambda name: s3)
+    monkeypatch.setattr(intro_batch, "INTRO_BATCH_RUNNER", "lambda")
+    monkeypatch.setattr(intro_batch, "INTRO_TASK_CHUNK", 2)
+    monkeypatch.setattr(intro_batch, "_dispatch_chunk", lambda job_id, start: dispatched.append((job_id, start)))
+    monkeypatch.setattr(intro_batch, "_bucket", TokenBucket(rate=1000, burst=100))
+    monkeypatch.setattr(intro_batch, "generate_intro", lambda name, sid, land, kcc: f"{name} ji, {sid}।")
+    s3 = _DictS3()
+    items = normalize_items([{"name": f"Lambda Farmer {i}", "land_acres": 1} for i in range(5)], ["KCC"])
+
+    job = intro_batch.start_batch(items)
+    # Nothing runs in the responding container; the poll is answered from S3
+    assert job["status"] == "running" and dispatched == [(job["job_id"], 0)]
+    assert job["job_id"] not in intro_batch._jobs
+    assert intro_batch.get_job(job["job_id"])["done"] == 0
+
+    starts = []
+    while dispatched:
+        job_id, start = dispatched.pop(0)
+        starts.append(start)
+        intro_batch.run_batch_chunk(job_id, start)
+    assert starts == [0, 2, 4]  # one chunk at a time, each invocation starting the next
+    status = intro_batch.get_job(job["job_id"])
+    assert status["status"] == "completed" and status["generated"] == 5
+    assert intro_batch.get_intro("lambda farmer 4", "KCC", 1, False) == "Lambda Farmer 4 ji, KCC।"
@@ -0,0 +1,64 @@
+"""
+Tests for the precomputed IVR plan behind the Twilio stage webhooks.
+Run with: python -m pytest tests/test_ivr_plan.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Flask
+
+import services.ivr_plan as ivr_plan
+from models.farmer import FarmerProfile
+from routes.call_routes import call_bp
+from services.ivr_plan import DEFAULT_LAND, FALLBACK_SCHEMES, LAND_ANSWERS, IvrPlan, get_plan
+from services.scheme_service import catalog, check_eligibility
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(call_bp)
+    return app.test_client()
+
+
+def test_every_dtmf_path_matches_check_eligibility():
+    plan = IvrPlan(catalog.rules(), catalog.loads)
+    for land in (*LAND_ANSWERS.values(), DEFAULT_LAND):
+        for has_kcc in (True, False):
+            farmer = FarmerProfile(name="Kisan", land_acres=land, state="Karnataka", has_kcc=has_kcc,
+                                   has_bank_account=True, age=40)
+            expected = [s["scheme_id"] for s in check_eligibility(farmer)[:2]]
+            assert plan.matched(land, has_kcc) == expected
+    assert len(plan._matched) == 8
+
+
+def test_scheme_details_are_prerendered():
+    details = IvrPlan(catalog.rules()).scheme("KCC")
+    assert details["docs_speech"].startswith("Number 1: ")
+    assert details["voice_memory_url"].endswith("voice_memory_KCC.mp3")
+    assert details["intro_tail"].startswith(" ji, ")
+
+
+def test_webhooks_do_not_touch_the_catalog_once_built(monkeypatch):
+    get_plan()
+
+    def unavailable(*args, **kwargs):
+        raise AssertionError("catalog touched from a webhook")
+
+    monkeypatch.setattr(catalog, "rules", unavailable)
+    monkeypatch.setattr(catalog, "get", unavailable)
+    monkeypatch.setattr(ivr_plan, "_checked_at", float("inf"))  # no background check due
+
+    response = _client().post("/api/call/stage4?farmer=Ramesh&schemes=PMFBY", data={"Digits": "1"})
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "Number 1: " in body and "Kisan bhai" not in body
+
+
+def test_fallback_plan_when_catalog_is_unavailable():
+    plan = IvrPlan()
+    assert plan.matched(1.0, False) == ["PM_KISAN", "PMFBY"]
+    assert plan.scheme("MGNREGS")["name_hi"] == FALLBACK_SCHEMES["MGNREGS"]["name_hi"]
+    assert plan.scheme("UNKNOWN")["name_hi"] == FALLBACK_SCHEMES["PM_KISAN"]["name_hi"]
@@ -0,0 +1,48 @@
+"""
+Tests for the in-process metrics registry and its Prometheus text output.
+Run with: python -m pytest tests/test_metrics.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.metrics import MetricsRegistry
+
+
+def test_counter_renders_labelled_samples():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests", ("language", "outcome"))
+    requests.inc(language="hindi", outcome="success")
+    requests.inc(2, language="tamil", outcome="error")
+    assert registry.counter("app_requests_total", "Requests", ("language", "outcome")) is requests
+
+    text = registry.render()
+    assert "# TYPE app_requests_total counter" in text
+    assert 'app_requests_total{language="hindi",outcome="success"} 1' in text
+    assert 'app_requests_total{language="tamil",outcome="error"} 2' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("app_latency_seconds", "Latency", ("model",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, model="haiku")
+
+    snap = latency.snapshot(model="haiku")
+    assert snap["count"] == 4 and abs(snap["sum"] - 4.25) < 1e-9
+    text = registry.render()
+    assert 'app_latency_seconds_bucket{model="haiku",le="0.1"} 1' in text
+    assert 'app_latency_seconds_bucket{model="haiku",le="1"} 3' in text
+    assert 'app_latency_seconds_bucket{model="haiku",le="+Inf"} 4' in text
+    assert 'app_latency_seconds_count{model="haiku"} 4' in text
+
+
+def test_label_values_are_escaped_and_collectors_included():
+    registry = MetricsRegistry()
+    registry.counter("app_errors_total", "Errors", ("error",)).inc(error='bad "quote"\n')
+    registry.register_collector(lambda: ["# TYPE app_up gauge", "app_up 1"])
+    text = registry.render()
+    assert 'app_errors_total{error="bad \\"quote\\"\\n"} 1' in text
+    assert text.endswith("app_up 1\n")
@@ -0,0 +1,39 @@
+"""
+Tests for the cached system prompt builder.
+Run with: python -m pytest tests/test_prompt_builder.py
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.prompt_builder import PromptTemplate, SystemPromptBuilder
+
+TEMPLATE = "Hi {name}.\nProfile: {farmer_profile}\nData: {scheme_data}\nKeep {farmer_profile.name} and {other}."
+
+
+def test_template_only_substitutes_known_placeholders():
+    t = PromptTemplate(TEMPLATE)
+    out = t.render({"name": "Ramesh", "farmer_profile": "P", "scheme_data": "S"})
+    assert out == "Hi Ramesh.\nProfile: P\nData: S\nKeep {farmer_profile.name} and {other}."
+
+
+def test_builder_renders_decimals_and_caches_by_content():
+    builder = SystemPromptBuilder("STATIC {name}", TEMPLATE, maxsize=4)
+    assert builder.static_prompt == "STATIC {name}"
+    schemes = [{"scheme_id": "KCC", "income_limit": Decimal("0"), "rate": Decimal("4.5")}]
+    profile = {"name": "Ramesh", "land_acres": 2.0}
+
+    first = builder.build(schemes, profile, "Hindi only")
+    assert first.startswith("LANGUAGE INSTRUCTION (HIGHEST PRIORITY):\nHindi only\n\nHi Ramesh.")
+    assert '"income_limit": 0' in first and '"rate": 4.5' in first
+
+    # Equal content in new objects is a cache hit
+    again = builder.build([dict(schemes[0])], dict(profile), "Hindi only")
+    assert again is first
+    assert builder.stats()["rendered"]["hits"] == 1
+
+    other = builder.build(schemes, {"name": "Sita", "land_acres": 2.0}, "Hindi only")
+    assert "Hi Sita." in other
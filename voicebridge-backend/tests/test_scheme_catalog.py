@@ -0,0 +1,113 @@
+"""
+Tests for the in-memory scheme catalog and its change detection.
+DynamoDB is replaced by a small in-memory table; no AWS calls are made.
+Run with: python -m pytest tests/test_scheme_catalog.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.scheme_service as scheme_service
+import services.scheme_store as scheme_store
+from services.scheme_service import CATALOG_META_ID, SchemeCatalog
+
+
+def _write(path: Path, schemes: list[dict], mtime_ns: int):
+    path.write_text(json.dumps(schemes), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class _Table:
+    def __init__(self, items):
+        self.items = items
+        self.scans = 0
+
+    def scan(self, **kwargs):
+        self.scans += 1
+        return {"Items": list(self.items)}
+
+    def get_item(self, Key):
+        item = next((i for i in self.items if i["scheme_id"] == Key["scheme_id"]), None)
+        return {"Item": item} if item else {}
+
+
+class _Resource:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):
+        return self.table
+
+
+def test_mock_catalog_loads_once_and_indexes_by_id(tmp_path):
+    path = tmp_path / "schemes.json"
+    _write(path, [{"scheme_id": "KCC"}, {"scheme_id": "PM_KISAN"}], 1_000_000_000)
+    catalog = SchemeCatalog(path, check_interval=0)
+
+    for _ in range(5):
+        assert catalog.get("KCC") == {"scheme_id": "KCC"}
+    assert catalog.get("NOPE") is None
+    assert [s["scheme_id"] for s in catalog.get_many(["PM_KISAN", "NOPE", "KCC"])] == ["PM_KISAN", "KCC"]
+    assert catalog.loads == 1
+
+
+def test_mock_catalog_reloads_when_mtime_changes(tmp_path):
+    path = tmp_path / "schemes.json"
+    _write(path, [{"scheme_id": "KCC"}], 1_000_000_000)
+    catalog = SchemeCatalog(path, check_interval=0)
+    assert len(catalog.all()) == 1
+
+    _write(path, [{"scheme_id": "KCC"}, {"scheme_id": "PMFBY"}], 2_000_000_000)
+    assert catalog.get("PMFBY") == {"scheme_id": "PMFBY"}
+    assert catalog.loads == 2
+
+
+def test_check_interval_defers_reload(tmp_path):
+    path = tmp_path / "schemes.json"
+    _write(path, [{"scheme_id": "KCC"}], 1_000_000_000)
+    catalog = SchemeCatalog(path, check_interval=3600)
+    catalog.all()
+    _write(path, [], 2_000_000_000)
+    assert len(catalog.all()) == 1
+
+    catalog.invalidate()
+    assert catalog.all() == []
+
+
+def test_dynamodb_catalog_reloads_on_version_change(monkeypatch):
+    table = _Table([{"scheme_id": CATALOG_META_ID, "version": 1}, {"scheme_id": "KCC"}])
+    monkeypatch.setattr(scheme_service, "USE_MOCK", False)
+    monkeypatch.setattr(scheme_service, "get_resource", lambda name: _Resource(table))
+    monkeypatch.setattr(scheme_store, "get_resource", lambda name: _Resource(table))
+    monkeypatch.setattr(scheme_store, "DYNAMODB_SCAN_SEGMENTS", 1)
+    catalog = SchemeCatalog(check_interval=0)
+
+    assert catalog.all() == [{"scheme_id": "KCC"}]  # meta item is not a scheme
+    catalog.get("KCC")
+    assert table.scans == 1
+
+    table.items = [{"scheme_id": CATALOG_META_ID, "version": 2}, {"scheme_id": "KCC"}, {"scheme_id": "PMFBY"}]
+    assert catalog.get("PMFBY") == {"scheme_id": "PMFBY"}
+    assert table.scans == 2
+
+
+def test_public_functions_return_copies():
+    scheme = scheme_service.get_scheme_by_id("PM_KISAN")
+    scheme["name_hi"] = "changed"
+    assert scheme_service.get_scheme_by_id("PM_KISAN")["name_hi"] != "changed"
+    assert len(scheme_service.get_all_schemes()) == len(scheme_service.catalog.all())
+
+
+def test_catalog_records_are_plain_and_read_only():
+    scheme = scheme_service.catalog.get("PM_KISAN")
+    try:
+        scheme["name_hi"] = "changed"
+        assert False, "catalog records should be read-only"
+    except TypeError:
+        pass
+    assert isinstance(scheme["documents"], tuple)
+    json.dumps(scheme_service.get_schemes_by_ids(["PM_KISAN", "KCC"], scheme_service.PROMPT_FIELDS))
@@ -0,0 +1,85 @@
+"""
+Tests for the multilingual scheme keyword index.
+Run with: python -m pytest tests/test_scheme_index.py
+"""
+
+import sys
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.scheme_index import ALIAS_WEIGHT, SCHEME_ALIASES, SchemeKeywordIndex
+from services.scheme_service import catalog, match_schemes_to_message
+
+
+def _naive_match(message: str) -> set[str]:
+    """Linear scan over every alias (no ranking), dropping ones inside another scheme's alias."""
+    text = unicodedata.normalize("NFC", message).lower()
+    spans = [(start, start + len(k), scheme_id)
+             for scheme_id, by_language in SCHEME_ALIASES.items()
+             for keywords in by_language.values() for k in keywords
+             for start in range(len(text)) if text.startswith(k, start)]
+    return {sid for start, end, sid in spans
+            if not any(s <= start and end <= e and (s, e) != (start, end) and other != sid
+                       for s, e, other in spans)}
+
+
+def test_every_alias_finds_its_scheme():
+    index = SchemeKeywordIndex()
+    for scheme_id, by_language in SCHEME_ALIASES.items():
+        for keywords in by_language.values():
+            for keyword in keywords:
+                assert scheme_id in index.match_ids(f"mujhe {keyword} ke baare mein batao"), keyword
+
+
+def test_alias_scan_agrees_with_linear_scan():
+    index = SchemeKeywordIndex()
+    messages = [f"{a} aur {b}" for by_language in SCHEME_ALIASES.values()
+                for keywords in by_language.values() for a, b in zip(keywords, reversed(keywords))]
+    for message in messages + ["namaste", "mausam kaisa hai", ""]:
+        assert set(index.match_ids(message)) == _naive_match(message), message
+
+
+def test_catalog_keywords_match_whole_words_only():
+    index = SchemeKeywordIndex(catalog.all())
+    assert index.match_ids("ration card kaise banega") == ["NFSA_RATION"]
+    assert index.match_ids("I am happy with the price") == []  # 'apy', 'rice'
+
+
+def test_longer_phrase_wins_and_ranks_by_weight_then_position():
+    index = SchemeKeywordIndex(catalog.all())
+    top = index.match("kisan credit card chahiye")
+    assert [m.scheme_id for m in top] == ["KCC"]  # 'kisan' (PM_KISAN) is inside 'kisan credit'
+    assert top[0].score == ALIAS_WEIGHT
+    assert index.match_ids("fasal bima aur pm kisan") == ["PMFBY", "PM_KISAN"]
+    assert index.match_ids("mujhe loan chahiye, kcc ke baare mein") == ["KCC"]
+
+
+def test_malayalam_transcription_of_kcc():
+    kcc = "".join(chr(c) for c in (0x0D15, 0x0D46, 0x0D38, 0x0D3F, 0x0D38, 0x0D3F))  # കെസിസി
+    assert match_schemes_to_message(kcc) == ["KCC"]
+
+
+def test_match_schemes_to_message_is_ranked_and_limited():
+    assert match_schemes_to_message("") == []
+    assert match_schemes_to_message("pm kisan, kcc aur fasal bima", limit=2) == ["PM_KISAN", "KCC"]
+
+
+def test_generic_catalog_words_do_not_select_a_scheme():
+    index = SchemeKeywordIndex(catalog.all())
+    for message in ("main kisan hoon", "mujhe loan chahiye", "ghar banana hai",
+                    "meri beti hai", "hospital jana hai", "pension milti hai"):
+        assert index.match_ids(message) == [], message
+    i_am = "मैं {} हूँ"
+    farmer = SCHEME_ALIASES["PM_KISAN"]["hi"][1].split()[0]  # किसान
+    assert index.match_ids(i_am.format(farmer)) == []
+    assert index.match_ids("kisan credit card chahiye") == ["KCC"]
+
+
+def test_clip_scheme_keeps_priority_over_earlier_mentions():
+    from app import _detect_scheme
+
+    scheme_ids, clip, confidence = _detect_scheme("job card hai aur pm kisan bhi")
+    assert (scheme_ids, clip, confidence) == (["PM_KISAN"], "PM_KISAN", 1.0)
+    assert _detect_scheme("job card kaise banega")[:2] == (["MGNREGS"], None)
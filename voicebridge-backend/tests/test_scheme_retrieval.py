@@ -0,0 +1,63 @@
+"""
+Tests for BM25 scheme retrieval and the prompt's top-k scheme payload.
+Run with: python -m pytest tests/test_scheme_retrieval.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.farmer import FarmerProfile
+from services.scheme_retrieval import SchemeRetriever, tokenize
+from services.scheme_service import catalog, prompt_schemes
+from services.scheme_store import PROMPT_FIELDS, SUMMARY_FIELDS
+
+FARMER = FarmerProfile(name="Ramesh", land_acres=2, has_kcc=False, has_bank_account=True, age=35)
+
+
+def _top(message, **kwargs):
+    return [hit.scheme_id for hit in catalog.retriever().search(message, 3, **kwargs)]
+
+
+def test_tokenize_keeps_indic_words_and_amounts_whole():
+    hindi = catalog.get("PMFBY")["name_hi"]
+    assert tokenize(hindi) == hindi.split()
+    assert "6000" in tokenize("₹6,000 kab milega?")
+
+
+def test_topic_queries_find_the_scheme():
+    assert _top("mujhe kheti ke liye loan chahiye")[0] == "KCC"
+    assert _top("ghar banane ke liye paisa")[0] == "PM_AWAS_GRAMIN"
+    assert _top("budhape mein pension")[0] == "ATAL_PENSION"
+    assert _top(catalog.get("PMFBY")["name_hi"])[0] == "PMFBY"
+    assert _top("namaste") == []
+
+
+def test_profile_reranks_and_fills_the_opening_menu():
+    never = set()
+    assert _top("namaste", eligible={"KCC", "PMFBY"}) == ["KCC", "PMFBY"]
+    assert _top("mujhe kheti ke liye loan chahiye", eligible=never)[0] == "KCC"
+    scores = {h.scheme_id: h.score for h in catalog.retriever().search("ration card", 3)}
+    halved = {h.scheme_id: h.score for h in catalog.retriever().search("ration card", 3, eligible=never)}
+    assert halved["NFSA_RATION"] == scores["NFSA_RATION"] / 2
+
+
+def test_prompt_schemes_named_in_full_then_compact_summaries():
+    data = prompt_schemes("kcc aur fasal ka nuksan", ["KCC"], FARMER, limit=3)
+    assert [s["scheme_id"] for s in data] == ["KCC", "PMFBY"]
+    assert set(data[0]) == {f for f in PROMPT_FIELDS if f in catalog.get("KCC")}
+    assert all(set(extra) <= set(SUMMARY_FIELDS) for extra in data[1:])
+
+    named = ["KCC", "PM_KISAN", "PMFBY", "MGNREGS"]
+    assert [s["scheme_id"] for s in prompt_schemes("hello", named, FARMER, limit=3)] == named
+
+
+def test_search_is_well_under_a_millisecond():
+    retriever = SchemeRetriever(catalog.all())
+    message = "mujhe kheti ke liye loan chahiye aur fasal bima ke baare mein bhi batao"
+    started = time.perf_counter()
+    for _ in range(200):
+        retriever.search(message, 3, eligible={"KCC"})
+    assert (time.perf_counter() - started) / 200 < 0.0005
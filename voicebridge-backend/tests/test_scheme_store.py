@@ -0,0 +1,140 @@
+"""
+Tests for the DynamoDB scheme access layer (pagination, segments, batch gets).
+DynamoDB is replaced by an in-memory fake; no AWS calls are made.
+Run with: python -m pytest tests/test_scheme_store.py
+"""
+
+import json
+import sys
+import threading
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.scheme_service as scheme_service
+import services.scheme_store as scheme_store
+from services.scheme_store import SMS_FIELDS, batch_get, normalize_item, projection, scan_all
+
+TABLE = "welfare_schemes"
+
+
+def _project(item, kwargs):
+    names = kwargs.get("ExpressionAttributeNames")
+    if not names:
+        return dict(item)
+    fields = [names[p.strip()] for p in kwargs["ProjectionExpression"].split(",")]
+    return {f: item[f] for f in fields if f in item}
+
+
+class FakeDynamo:
+    """Pages of page_size items; batch gets defer their first `unprocessed` keys, once per key
+    (or always, with sticky=True)."""
+
+    def __init__(self, count, page_size=7, unprocessed=0, sticky=False):
+        self.items = [{"scheme_id": f"S{i:03d}", "name_hi": f"योजना {i}", "documents": ["Aadhaar"],
+                       "keywords": ["x"]} for i in range(count)]
+        self.page_size = page_size
+        self.unprocessed = unprocessed
+        self.sticky = sticky
+        self._deferred = set()
+        self.scan_calls = []
+        self.batch_calls = []
+        self._lock = threading.Lock()
+
+    # resource API
+    def Table(self, name):
+        return self
+
+    def scan(self, **kwargs):
+        with self._lock:
+            self.scan_calls.append(kwargs)
+        segment, total = kwargs.get("Segment", 0), kwargs.get("TotalSegments", 1)
+        mine = [item for i, item in enumerate(self.items) if i % total == segment]
+        start = int(kwargs.get("ExclusiveStartKey", {}).get("offset", 0))
+        page = mine[start:start + self.page_size]
+        response = {"Items": [_project(item, kwargs) for item in page]}
+        if start + self.page_size < len(mine):
+            response["LastEvaluatedKey"] = {"offset": start + self.page_size}
+        return response
+
+    def batch_get_item(self, RequestItems):
+        request = RequestItems[TABLE]
+        keys = request["Keys"]
+        assert len(keys) <= 100
+        self.batch_calls.append(len(keys))
+        deferred = [k for k in keys[:self.unprocessed] if self.sticky or k["scheme_id"] not in self._deferred]
+        self._deferred.update(k["scheme_id"] for k in deferred)
+        served = [k for k in keys if k not in deferred]
+        by_id = {item["scheme_id"]: item for item in self.items}
+        response = {"Responses": {TABLE: [_project(by_id[k["scheme_id"]], request)
+                                          for k in served if k["scheme_id"] in by_id]}}
+        if deferred:
+            response["UnprocessedKeys"] = {TABLE: {**request, "Keys": deferred}}
+        return response
+
+
+def _use_fake(monkeypatch, fake):
+    monkeypatch.setattr(scheme_store, "get_resource", lambda name: fake)
+    monkeypatch.setattr(scheme_store, "_BACKOFF_BASE", 0)
+    return fake
+
+
+def test_normalize_item_removes_decimals_and_lists():
+    item = normalize_item({
+        "scheme_id": "KCC", "min_land_acres": Decimal("0"), "rate": Decimal("4.0"),
+        "tiny": Decimal("1E-7"), "documents": ["Aadhaar", "Land record"],
+        "meta": {"years": [Decimal("2019")]}, "tags": {"b", "a"},
+    })
+    assert item == {"scheme_id": "KCC", "min_land_acres": 0, "rate": 4.0, "tiny": 1e-7,
+                    "documents": ("Aadhaar", "Land record"), "meta": {"years": (2019,)},
+                    "tags": ("a", "b")}
+    assert type(item["min_land_acres"]) is int and type(item["rate"]) is float
+    # No default= hook needed any more
+    json.dumps(item)
+
+
+def test_projection_uses_placeholders_and_always_has_scheme_id():
+    kwargs = projection(("name_hi", "documents"))
+    assert kwargs["ProjectionExpression"] == "#f0, #f1, #f2"
+    assert kwargs["ExpressionAttributeNames"] == {"#f0": "scheme_id", "#f1": "name_hi", "#f2": "documents"}
+    assert projection(None) == {}
+
+
+def test_scan_follows_every_page_of_every_segment(monkeypatch):
+    fake = _use_fake(monkeypatch, FakeDynamo(50, page_size=4))
+    items = scan_all(segments=3)
+    assert sorted(item["scheme_id"] for item in items) == [f"S{i:03d}" for i in range(50)]
+    assert {call["Segment"] for call in fake.scan_calls} == {0, 1, 2}
+    assert len(fake.scan_calls) > 3
+
+
+def test_scan_with_projection(monkeypatch):
+    _use_fake(monkeypatch, FakeDynamo(5))
+    items = scan_all(fields=SMS_FIELDS, segments=1)
+    assert all(set(item) == {"scheme_id", "name_hi", "documents"} for item in items)
+
+
+def test_batch_get_chunks_and_retries_unprocessed_keys(monkeypatch):
+    fake = _use_fake(monkeypatch, FakeDynamo(250, unprocessed=10))
+    ids = [f"S{i:03d}" for i in range(250)] + ["MISSING", "S001"]
+    found = batch_get(ids, SMS_FIELDS)
+    assert len(found) == 250
+    assert "keywords" not in found["S100"]
+    assert fake.batch_calls == [100, 10, 100, 10, 51, 10]
+
+
+def test_batch_get_gives_up_after_retries(monkeypatch):
+    fake = _use_fake(monkeypatch, FakeDynamo(3, unprocessed=3, sticky=True))
+    assert batch_get(["S000", "S001"], retries=2) == {}
+    assert len(fake.batch_calls) == 3
+
+
+def test_catalog_misses_are_fetched_in_one_batch(monkeypatch):
+    fake = _use_fake(monkeypatch, FakeDynamo(3))
+    monkeypatch.setattr(scheme_service, "USE_MOCK", False)
+    monkeypatch.setattr(scheme_service.catalog, "get", lambda sid: {"scheme_id": "KCC"} if sid == "KCC" else None)
+
+    schemes = scheme_service.get_schemes_by_ids(["S002", "KCC", "NOPE", "S000"], SMS_FIELDS)
+    assert [s["scheme_id"] for s in schemes] == ["S002", "KCC", "S000"]
+    assert fake.batch_calls == [3]
@@ -0,0 +1,35 @@
+"""
+Tests for sentence splitting used by the streaming /api/chat/stream endpoint.
+Run with: python -m pytest tests/test_sentence_splitter.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.sentence_splitter import SentenceAccumulator, split_sentences
+
+
+def test_split_on_danda_full_stop_and_question():
+    text = "Namaste Ramesh ji। Aapko ₹6,000 milenge. Kya aap jaanna chahte hain?"
+    assert split_sentences(text) == [
+        "Namaste Ramesh ji।",
+        "Aapko ₹6,000 milenge.",
+        "Kya aap jaanna chahte hain?",
+    ]
+
+
+def test_decimals_and_urls_stay_together():
+    text = "Loan 4.5 lakh tak. pmkisan.gov.in par dekhein"
+    assert split_sentences(text) == ["Loan 4.5 lakh tak.", "pmkisan.gov.in par dekhein"]
+
+
+def test_accumulator_holds_trailing_terminator_until_next_delta():
+    acc = SentenceAccumulator()
+    out = []
+    for delta in ["Aapko ₹2", ".", "5 lakh milega", "। Kya aap", " taiyaar hain?"]:
+        out += acc.feed(delta)
+    assert out == ["Aapko ₹2.5 lakh milega।"]
+    assert acc.flush() == ["Kya aap taiyaar hain?"]
+    assert acc.flush() == []
@@ -0,0 +1,71 @@
+"""
+Tests for SMS segment counting and the checklist composer.
+Run with: python -m pytest tests/test_sms_composer.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import scheme_service
+from services.scheme_service import SAHAYA_NATIVE_NAME, catalog, compose_scheme_sms
+from services.sms_composer import compose, short_document, sms_parts, sms_segments
+
+
+def test_gsm7_segments():
+    assert sms_segments("a" * 160) == ("GSM-7", 1)
+    assert sms_segments("a" * 161) == ("GSM-7", 2)
+    assert sms_segments("a" * 306) == ("GSM-7", 2)
+    assert sms_segments("a" * 307) == ("GSM-7", 3)
+    # Extension characters take two septets and are never split
+    assert sms_segments("€" * 80) == ("GSM-7", 1)
+    assert sms_segments("a" * 152 + "€" + "a" * 10) == ("GSM-7", 2)
+    assert sms_segments("a" * 152 + "€" + "a" * 152) == ("GSM-7", 3)
+
+
+def test_one_non_gsm_character_switches_to_ucs2():
+    assert sms_segments("a" * 70) == ("GSM-7", 1)
+    assert sms_segments("✓" + "a" * 69) == ("UCS-2", 1)
+    assert sms_segments("✓" + "a" * 70) == ("UCS-2", 2)
+    assert sms_segments(SAHAYA_NATIVE_NAME * 20)[0] == "UCS-2"
+
+
+def test_short_document_drops_parenthetical_details():
+    assert short_document("Bank account details (IFSC code, account number)") == "Bank account details"
+    assert short_document("(only brackets)") == "(only brackets)"
+
+
+def test_compose_fits_budget_without_cutting_words():
+    parts = [sms_parts(scheme) for scheme in catalog.all()]
+    for budget in (1, 2, 3):
+        sms = compose(parts, "hi-IN", budget, SAHAYA_NATIVE_NAME)
+        assert sms.segments <= budget and not sms.complete
+        assert sms.scheme_ids[0] == parts[0]["scheme_id"]
+        words = {w for p in parts for form in ("latin", "short", "native") for w in p[form].split()}
+        words |= {w for p in parts for doc in p["docs"] + p["short_docs"] for w in doc.split()}
+        body = sms.text.splitlines()[1:-1]
+        for line in body:
+            text = line.split(". ", 1)[-1].rstrip(":")
+            assert all(word in words for word in text.split()), line
+
+
+def test_native_script_kept_when_it_costs_no_extra_segment():
+    native = catalog.get("KCC")["name_hi"].split()[0]
+    single = [{"scheme_id": "X", "native": native, "latin": "Kisan", "short": "X", "docs": (), "short_docs": ()}]
+    sms = compose(single, "hi-IN", 3, SAHAYA_NATIVE_NAME)
+    assert sms.encoding == "UCS-2" and sms.segments == 1 and native in sms.text
+    assert compose(single, "ta-IN", 3, SAHAYA_NATIVE_NAME).encoding == "GSM-7"
+
+
+def test_checklist_is_complete_and_cheaper_than_ucs2():
+    sms = compose_scheme_sms(["PM_KISAN", "KCC", "PMFBY"])
+    assert sms.complete and sms.scheme_ids == ("PM_KISAN", "KCC", "PMFBY")
+    assert sms.encoding == "GSM-7" and sms.segments <= 3
+
+
+def test_compose_is_memoized_per_sorted_ids_and_language():
+    first = compose_scheme_sms(["PMFBY", "KCC"], "hi-IN")
+    assert compose_scheme_sms(["KCC", "PMFBY", "KCC"], "hi-IN") is first
+    assert first.scheme_ids == ("KCC", "PMFBY")
+    assert scheme_service.format_scheme_for_sms(["KCC", "PMFBY"]) == first.text
@@ -0,0 +1,232 @@
+"""
+Tests for segmented (per-sentence, parallel) TTS.
+Run with: python -m pytest tests/test_tts.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import audio_cache, tts_service
+from services.audio_cache import AudioCache
+from services.audio_disk_cache import DiskAudioCache
+from services.tts_service import iter_speech_segments, stream_speech, synthesize_segments
+
+class FakeS3:
+    def __init__(self):
+        self.puts = []
+        self.objects = {}
+
+    def put_object(self, **kwargs):
+        self.puts.append(kwargs["Key"])
+        self.objects[kwargs["Key"]] = kwargs["Body"]
+
+    def get_object(self, Bucket, Key):
+        return {"Body": FakeAudioStream([self.objects[Key]], []), "ContentType": "audio/mpeg"}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://s3/{Params['Key']}"
+
+    def get_paginator(self, name):
+        class Paginator:
+            def paginate(self, **kwargs):
+                return [{"Contents": []}]
+        return Paginator()
+
+
+class FakeAudioStream:
+    def __init__(self, chunks, pulled):
+        self.chunks, self.pulled = chunks, pulled
+
+    def read(self):
+        return b"".join(self.chunks)
+
+    def iter_chunks(self, chunk_size):
+        for chunk in self.chunks:
+            self.pulled.append(chunk)
+            yield chunk
+
+
+class FakePolly:
+    def __init__(self):
+        self.calls = []
+        self.pulled = []
+
+    def synthesize_speech(self, Text, **kwargs):
+        self.calls.append(Text)
+        return {"AudioStream": FakeAudioStream([b"ID3", b"mp3", b"end"], self.pulled)}
+
+
+def _live_tts(monkeypatch, tmp_path):
+    """AWS-mode TTS against fake Polly/S3 and a fresh cache. Returns (polly, s3)."""
+    s3, polly = FakeS3(), FakePolly()
+    monkeypatch.setattr(audio_cache, "get_client", lambda name: s3)
+    monkeypatch.setattr(audio_cache, "TTS_CACHE_ENABLED", True)
+    monkeypatch.setattr(audio_cache, "disk_audio", DiskAudioCache(str(tmp_path), max_bytes=10 ** 6))
+    monkeypatch.setattr(tts_service, "get_client", lambda name: polly)
+    monkeypatch.setattr(tts_service, "tts_cache", AudioCache(bucket="b", prefix="tts-cache/", max_keys=100))
+    monkeypatch.setattr(tts_service, "USE_MOCK", False)
+    return polly, s3
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+REPLY = "Ramesh ji, PM-KISAN mein ₹6,000 milte hain। Aadhaar aur khata chahiye। Aur koi sawaal hai?"
+
+
+def _fake_synthesize(delays: dict, calls: list = None):
+    def synthesize(sentence):
+        if calls is not None:
+            calls.append(sentence)
+        time.sleep(delays.get(sentence[:6], 0))
+        return {"success": True, "audio_url": f"https://tts/{sentence[:6]}", "duration_seconds": 1.5}
+    return synthesize
+
+
+def test_segments_come_back_in_sentence_order():
+    # The last sentence finishes first; the playlist is still in reply order
+    result = synthesize_segments(REPLY, _fake_synthesize({"Ramesh": 0.06, "Aadhaa": 0.03}))
+    assert result["success"] and result["audio_url"] == "https://tts/Ramesh"
+    assert [segment["text"][:6] for segment in result["segments"]] == ["Ramesh", "Aadhaa", "Aur ko"]
+    assert [segment["index"] for segment in result["segments"]] == [0, 1, 2]
+    assert result["duration_seconds"] == 4.5
+
+
+def test_sentences_are_synthesized_in_parallel():
+    # Only passes if all three sentences are in flight at once
+    all_running = threading.Barrier(3, timeout=5)
+
+    def synthesize(sentence):
+        all_running.wait()
+        return {"success": True, "audio_url": sentence[:6]}
+
+    result = synthesize_segments(REPLY, synthesize)
+    assert [segment["success"] for segment in result["segments"]] == [True, True, True]
+
+
+def test_first_segment_is_yielded_before_the_rest_finish():
+    release = threading.Event()
+
+    def synthesize(sentence):
+        if not sentence.startswith("Ramesh"):
+            release.wait(2)
+        return {"success": True, "audio_url": sentence[:6]}
+
+    segments = iter_speech_segments(REPLY, synthesize)
+    assert next(segments)["audio_url"] == "Ramesh"
+    release.set()
+    assert [segment["audio_url"] for segment in segments] == ["Aadhaa", "Aur ko"]
+
+
+def test_deadline_returns_the_finished_prefix():
+    release = threading.Event()
+
+    def synthesize(sentence):
+        if sentence.startswith("Aadhaa"):
+            release.wait(2)
+        return {"success": True, "audio_url": sentence[:6]}
+
+    result = synthesize_segments(REPLY, synthesize, deadline=time.monotonic() + 0.1)
+    assert not release.is_set()  # returned while the late sentence was still blocked
+    release.set()
+    # 'Aur ko' finished too, but comes after the late sentence
+    assert result["success"] and [segment["audio_url"] for segment in result["segments"]] == ["Ramesh"]
+
+
+def test_failed_segment_does_not_fail_the_playlist():
+    def synthesize(sentence):
+        if sentence.startswith("Aadhaar"):
+            raise RuntimeError("Polly throttled")
+        return {"success": True, "audio_url": sentence[:6], "duration_seconds": 1.0}
+
+    result = synthesize_segments(REPLY, synthesize)
+    assert result["success"] and [segment["success"] for segment in result["segments"]] == [True, False, True]
+    assert result["segments"][1]["audio_url"] is None
+    assert not synthesize_segments("   ", synthesize)["success"]
+
+
+def test_shared_closing_sentence_is_a_cache_hit(monkeypatch, tmp_path):
+    polly, _ = _live_tts(monkeypatch, tmp_path)
+    first = synthesize_segments("KCC se ₹3 lakh tak loan milta hai। Aur koi sawaal hai?")
+    second = synthesize_segments("PM-KISAN mein ₹6,000 milte hain। Aur koi sawaal hai?")
+    assert [segment["cached"] for segment in first["segments"]] == [False, False]
+    assert [segment["cached"] for segment in second["segments"]] == [False, True]
+    assert second["cached_segments"] == 1
+    assert polly.calls.count("Aur koi sawaal hai?") == 1
+    assert first["segments"][1]["audio_url"] == second["segments"][1]["audio_url"]
+
+
+def test_stream_relays_polly_chunks_then_caches_in_background(monkeypatch, tmp_path):
+    polly, s3 = _live_tts(monkeypatch, tmp_path)
+    result = stream_speech("Namaste  Ramesh ji।")
+    assert result["success"] and not result["cached"] and result["content_type"] == "audio/mpeg"
+
+    chunks = result["chunks"]
+    assert next(chunks) == b"ID3" and polly.pulled == [b"ID3"]  # relayed as it arrives
+    assert list(chunks) == [b"mp3", b"end"]
+    assert _wait_for(lambda: len(s3.puts) == 1)
+
+    again = stream_speech("Namaste Ramesh ji।")
+    assert again["cached"] and b"".join(again["chunks"]) == b"ID3mp3end"
+    assert polly.calls == ["Namaste Ramesh ji।"]
+    assert audio_cache.disk_audio.stats()["entries"] == 1  # read back from S3, now on local disk
+
+
+def test_abandoned_stream_is_not_cached(monkeypatch, tmp_path):
+    polly, s3 = _live_tts(monkeypatch, tmp_path)
+    chunks = stream_speech("Namaste Ramesh ji।")["chunks"]
+    next(chunks)
+    chunks.close()  # client disconnected
+    time.sleep(0.05)
+    assert s3.puts == []
+    assert not stream_speech("Namaste Ramesh ji।")["cached"]
+
+
+def test_stream_route(monkeypatch):
+    from app import app
+    client = app.test_client()
+    monkeypatch.setattr(tts_service, "stream_speech", lambda text, language, fmt: {
+        "success": True, "chunks": iter([b"RIFF", language.encode()]), "content_type": "audio/wav", "cached": False})
+
+    response = client.get("/api/text-to-speech/stream?text=Namaskaram&language=ml-in")
+    assert response.status_code == 200 and response.mimetype == "audio/wav"
+    assert response.data == b"RIFFml-IN" and response.headers["X-TTS-Cache"] == "miss"
+    assert client.post("/api/text-to-speech/stream", json={"text": " "}).status_code == 400
+
+    monkeypatch.setattr(tts_service, "stream_speech",
+                        lambda text, language, fmt: {"success": False, "error": "Polly throttled", "mock": False})
+    assert client.post("/api/text-to-speech/stream", json={"text": "Namaste"}).status_code == 500
+
+
+def test_chat_stream_synthesizes_sentences_in_parallel(monkeypatch):
+    import json
+    from app import app
+    from services import ai_service
+
+    def generate_response_stream(message, scheme_ids, farmer, history, lang, conversation_id):
+        for index, sentence in enumerate(["KCC se loan milta hai।", "Aur koi sawaal hai?"]):
+            yield {"event": "sentence", "index": index, "text": sentence}
+        yield {"event": "done", "success": True, "response_text": "KCC se loan milta hai। Aur koi sawaal hai?"}
+
+    # Only passes if both sentences are being synthesized at once
+    both_running = threading.Barrier(2, timeout=5)
+
+    def synthesize_speech(text):
+        both_running.wait()
+        return {"success": True, "audio_url": f"https://tts/{text[:3]}"}
+
+    monkeypatch.setattr(ai_service, "generate_response_stream", generate_response_stream)
+    monkeypatch.setattr(tts_service, "synthesize_speech", synthesize_speech)
+    response = app.test_client().post("/api/chat/stream", json={"message": "kcc kya hai"})
+    frames = [frame.split("\n") for frame in response.get_data(as_text=True).strip().split("\n\n")]
+    assert [frame[0] for frame in frames] == ["event: sentence", "event: sentence", "event: done"]
+    sentences = [json.loads(frame[1][len("data: "):]) for frame in frames[:2]]
+    assert [(s["index"], s["audio_url"]) for s in sentences] == [(0, "https://tts/KCC"), (1, "https://tts/Aur")]
@@ -0,0 +1,117 @@
+"""
+Tests for concurrent per-turn I/O and stage deadlines.
+Slow AWS calls are simulated with sleeps; no AWS calls are made.
+Run with: python -m pytest tests/test_turn_orchestrator.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.ai_service as ai_service
+import services.tts_service as tts_service
+import services.turn_orchestrator as turn_orchestrator
+import services.voice_memory_service as voice_memory_service
+from models.farmer import FarmerProfile
+from services.turn_orchestrator import fetch_schemes, run_chat_turn
+
+
+def test_fetch_schemes_is_one_batched_lookup():
+    calls = []
+
+    def fetch_many(scheme_ids):
+        calls.append(list(scheme_ids))
+        return [{"scheme_id": sid} for sid in scheme_ids]
+
+    schemes = fetch_schemes(["KCC", "PM_KISAN", "PMFBY"], fetch_many)
+    assert [s["scheme_id"] for s in schemes] == ["KCC", "PM_KISAN", "PMFBY"]
+    assert calls == [["KCC", "PM_KISAN", "PMFBY"]]
+
+
+def test_fetch_schemes_degrades_on_late_or_failed_lookup():
+    release = threading.Event()
+
+    def slow(scheme_ids):
+        release.wait(5)
+        return [{"scheme_id": "KCC"}]
+
+    def broken(scheme_ids):
+        raise RuntimeError("ProvisionedThroughputExceededException")
+
+    # Returns at the deadline while the lookup is still blocked
+    assert fetch_schemes(["KCC"], slow, timeout=0.1) == []
+    assert not release.is_set()
+    release.set()
+    assert fetch_schemes(["KCC"], broken) == []
+
+
+def test_chat_turn_overlaps_presign_with_model_and_tts(monkeypatch):
+    # Both stages must be in flight at once to get past the barrier
+    both_running = threading.Barrier(2, timeout=5)
+
+    def generate_response(message, scheme_ids, farmer, history, lang, conversation_id, scheme_data=None):
+        both_running.wait()
+        return {"success": True, "response_text": "KCC se loan milta hai.", "voice_memory_clip": "KCC"}
+
+    def get_clip(scheme_id, language):
+        both_running.wait()
+        return {"success": True, "audio_url": f"https://clips/{scheme_id}/{language}"}
+
+    def synthesize_speech(text):
+        return {"success": True, "audio_url": "https://tts/reply.mp3"}
+
+    monkeypatch.setattr(ai_service, "generate_response", generate_response)
+    monkeypatch.setattr(voice_memory_service, "get_clip", get_clip)
+    monkeypatch.setattr(tts_service, "synthesize_speech", synthesize_speech)
+
+    result = run_chat_turn("kcc kya hai", ["KCC"], FarmerProfile(), [], "Hindi", "ta-IN")
+
+    assert result["audio_url"] == "https://tts/reply.mp3"
+    assert result["voice_memory_url"] == "https://clips/KCC/ta-IN"
+    assert set(result["timings_ms"]) == {"schemes", "model", "tts", "total"}
+
+
+def test_chat_turn_survives_failing_tts(monkeypatch):
+    def synthesize_speech(text):
+        raise RuntimeError("Polly throttled")
+
+    monkeypatch.setattr(tts_service, "synthesize_speech", synthesize_speech)
+    result = run_chat_turn("namaste", [], FarmerProfile(), [], "Hindi")
+    assert result["success"] and result["audio_url"] is None
+
+
+def test_chat_turn_returns_a_playlist_when_segmented(monkeypatch):
+    def generate_response(message, scheme_ids, farmer, history, lang, conversation_id, scheme_data=None):
+        return {"success": True, "response_text": "KCC se loan milta hai। Aur koi sawaal hai?"}
+
+    monkeypatch.setattr(ai_service, "generate_response", generate_response)
+    monkeypatch.setattr(tts_service, "synthesize_speech",
+                        lambda text: {"success": True, "audio_url": f"https://tts/{text[:3]}"})
+    result = run_chat_turn("kcc kya hai", ["KCC"], FarmerProfile(), [], "Hindi", tts_segments=True)
+    assert result["audio_url"] == "https://tts/KCC"
+    assert [segment["audio_url"] for segment in result["audio_segments"]] == ["https://tts/KCC", "https://tts/Aur"]
+    assert run_chat_turn("kcc kya hai", ["KCC"], FarmerProfile(), [], "Hindi")["audio_segments"] is None
+
+
+def test_late_sentence_keeps_the_finished_prefix(monkeypatch):
+    def generate_response(message, scheme_ids, farmer, history, lang, conversation_id, scheme_data=None):
+        return {"success": True, "response_text": "KCC se loan milta hai। Aur koi sawaal hai?"}
+
+    release = threading.Event()
+
+    def synthesize_speech(text):
+        if text.startswith("Aur"):
+            release.wait(5)
+        return {"success": True, "audio_url": f"https://tts/{text[:3]}"}
+
+    monkeypatch.setattr(ai_service, "generate_response", generate_response)
+    monkeypatch.setattr(tts_service, "synthesize_speech", synthesize_speech)
+    monkeypatch.setattr(turn_orchestrator, "TURN_TTS_TIMEOUT", 0.1)
+    result = run_chat_turn("kcc kya hai", ["KCC"], FarmerProfile(), [], "Hindi", tts_segments=True)
+    # The turn came back while the second sentence was still synthesizing
+    assert not release.is_set()
+    release.set()
+    assert result["audio_url"] == "https://tts/KCC"
+    assert [segment["audio_url"] for segment in result["audio_segments"]] == ["https://tts/KCC"]